@@ -1,12 +1,16 @@
 // auth.api.ts or product.api.ts
 import {http} from "../service/http"; // Assuming your axios instance is here
 
-export async function getAdminProductsApi() {
-    const res = await http.get("/v2/admin/products/");
+// List endpoints are keyset-paginated: { next, previous, results }
+export type Page<T> = { next: string | null; previous: string | null; results: T[] };
+
+// Pass the previous page's `next` URL to load the following page of that tab
+export async function getAdminProductsApi(status: 'pending' | 'approved' | 'rejected', cursor?: string | null) {
+    const res = await http.get<Page<any>>(cursor || `/v2/admin/products/?status=${status}`);
     return res.data;
 }
-export async function getrelatedsellerProductsApi() {
-    const res = await http.get("/v2/products/seller/");
+export async function getrelatedsellerProductsApi(cursor?: string | null) {
+    const res = await http.get<Page<any>>(cursor || "/v2/products/seller/");
     return res.data;
 }
 
@@ -26,9 +30,9 @@ export async function createProductApi(formData: FormData): Promise<any> {
     });
     return res.data;
 }
-export async function getSellerProductsApi(): Promise<any[]> {
-    const res = await http.get("/v2/products/");
-    return res.data as any[];
+export async function getSellerProductsApi(cursor?: string | null) {
+    const res = await http.get<Page<any>>(cursor || "/v2/products/");
+    return res.data;
 }
 export async function updateProductApi(productId: number, formData: FormData): Promise<any> {
     const res = await http.put(`/v2/products/${productId}/`, formData, {
@@ -46,8 +50,9 @@ export async function analyzeProductApi(productId: number): Promise<any> {
     return res.data;
 }
 
-export async function getModerationQueueApi() {
-    const res = await http.get('/v2/moderation/');
+// Riskiest first; pass the previous page's `next` URL to load the following page
+export async function getModerationQueueApi(cursor?: string | null) {
+    const res = await http.get<Page<any>>(cursor || '/v2/moderation/queue/');
     return res.data;
 }
 
@@ -61,8 +66,9 @@ export async function resolveModerationItemApi(id: number, action: 'approve' | '
     return res.data;
 }
 
-export async function getProductReviewsApi() {
-    const res = await http.get("/v2/reviews/");
+// Pass the previous page's `next` URL to load the following page
+export async function getProductReviewsApi(cursor?: string | null) {
+    const res = await http.get<Page<any>>(cursor || "/v2/reviews/");
     return res.data;
 }
 export async function replyToReviewApi(reviewId: number, replyText: string) {
@@ -53,6 +53,8 @@ export type OrderRowProps = {
   amount: string;
 };
 
+export type ImageVariants = Record<'thumb' | 'card' | 'zoom', { webp: string; jpeg: string }>;
+
 export interface Product {
   id?: number;
   name: string;
@@ -60,6 +62,7 @@ export interface Product {
   price: number;
   stock_quantity: number;
   img?: string | null;
+  img_variants?: ImageVariants | null;
   status?: string;  
   category?: string;
   seller_name?: string;
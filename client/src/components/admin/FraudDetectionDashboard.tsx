@@ -31,7 +31,9 @@ interface DashboardStats {
     pending_reviews: number;
     high_risk_content: number;
     auto_approved: number;
-    accuracy: string;
+    accuracy: string | null;
+    overridden: number;
+    verdict_cache_hit_rate: string | null;
 }
 
 export default function FraudDetectionDashboard() {
@@ -39,16 +41,19 @@ export default function FraudDetectionDashboard() {
     const [stats, setStats] = useState<DashboardStats | null>(null);
     const [loading, setLoading] = useState(true);
     const [processingId, setProcessingId] = useState<number | null>(null);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
 
     const loadData = async () => {
         setLoading(true);
         try {
             // USAGE: Calling the imported API functions
-            const [queueData, statsData] = await Promise.all([
+            const [queuePage, statsData] = await Promise.all([
                 getModerationQueueApi(),
                 getModerationStatsApi()
             ]);
-            setQueue(queueData);
+            setQueue(queuePage.results);
+            setNextCursor(queuePage.next);
             setStats(statsData);
         } catch (error) {
             console.error("Failed to load moderation data", error);
@@ -61,6 +66,24 @@ export default function FraudDetectionDashboard() {
         loadData();
     }, []);
 
+    const loadMore = async () => {
+        if (!nextCursor) return;
+        setLoadingMore(true);
+        try {
+            const queuePage = await getModerationQueueApi(nextCursor);
+            // Resolving items can shift the queue between pages; never show an item twice
+            setQueue(prev => {
+                const seen = new Set(prev.map(item => item.id));
+                return [...prev, ...queuePage.results.filter((item: ModerationItem) => !seen.has(item.id))];
+            });
+            setNextCursor(queuePage.next);
+        } catch (error) {
+            console.error("Failed to load more moderation items", error);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const handleAction = async (id: number, action: 'approve' | 'remove') => {
         if (!window.confirm(`Are you sure you want to ${action} this item?`)) return;
         
@@ -125,12 +148,12 @@ export default function FraudDetectionDashboard() {
                 />
                 <KpiCard 
                     title="Auto-Approved" 
-                    value={stats?.auto_approved.toString() || "540"} 
+                    value={stats?.auto_approved.toString() || "-"} 
                     icon={<CheckCircle className="text-green-500" />}
                 />
                 <KpiCard 
                     title="AI Accuracy" 
-                    value={stats?.accuracy || "96%"} 
+                    value={stats?.accuracy || "-"} 
                     icon={<Eye className="text-blue-500" />}
                 />
             </div>
@@ -140,7 +163,9 @@ export default function FraudDetectionDashboard() {
                 <div className="px-6 py-4 border-b border-gray-100 flex justify-between items-center bg-gray-50/50">
                     <h3 className="font-bold text-gray-700">Flagged Content Queue</h3>
                     <span className="text-xs font-medium text-gray-400">
-                        {queue.length} items requiring attention
+                        {stats && stats.pending_reviews > queue.length
+                            ? `Showing ${queue.length} of ${stats.pending_reviews} items requiring attention`
+                            : `${queue.length} items requiring attention`}
                     </span>
                 </div>
 
@@ -221,6 +246,17 @@ export default function FraudDetectionDashboard() {
                                 ))}
                             </tbody>
                         </table>
+                        {nextCursor && (
+                            <div className="px-6 py-4 border-t border-gray-100 flex justify-center">
+                                <button
+                                    onClick={loadMore}
+                                    disabled={loadingMore}
+                                    className="px-4 py-2 text-sm font-bold text-indigo-600 bg-indigo-50 rounded-lg hover:bg-indigo-100 transition disabled:opacity-50"
+                                >
+                                    {loadingMore ? "Loading..." : "Load more"}
+                                </button>
+                            </div>
+                        )}
                     </div>
                 )}
             </div>
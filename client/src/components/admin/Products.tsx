@@ -31,8 +31,10 @@ interface AIAnalysis {
 
 export default function ProductApproval() {
     // --- STATE ---
-    const [allProducts, setAllProducts] = useState<Product[]>([]);
+    const [products, setProducts] = useState<Product[]>([]);
     const [loading, setLoading] = useState(false);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [isLoadingMore, setIsLoadingMore] = useState(false);
     
     // UI State
     const [activeTab, setActiveTab] = useState<'pending' | 'approved' | 'rejected'>('pending');
@@ -44,11 +46,13 @@ export default function ProductApproval() {
     const [analysisData, setAnalysisData] = useState<AIAnalysis | null>(null);
 
     // --- FETCH DATA ---
+    // First page of the active tab; further pages are appended by "Load more"
     const fetchProducts = async () => {
         setLoading(true);
         try {
-            const data = await getAdminProductsApi(); 
-            setAllProducts(data);
+            const page = await getAdminProductsApi(activeTab);
+            setProducts(page?.results ?? []);
+            setNextCursor(page?.next ?? null);
         } catch (err) {
             console.error("Failed to fetch products", err);
         } finally {
@@ -56,9 +60,23 @@ export default function ProductApproval() {
         }
     };
 
+    const handleLoadMore = async () => {
+        if (!nextCursor) return;
+        setIsLoadingMore(true);
+        try {
+            const page = await getAdminProductsApi(activeTab, nextCursor);
+            setProducts(prev => [...prev, ...(page?.results ?? [])]);
+            setNextCursor(page?.next ?? null);
+        } catch (err) {
+            console.error("Failed to load more products", err);
+        } finally {
+            setIsLoadingMore(false);
+        }
+    };
+
     useEffect(() => { 
         fetchProducts();
-    }, []);
+    }, [activeTab]);
 
     // --- REAL API ANALYSIS LOGIC ---
     const runProductAnalysis = async (product: Product) => {
@@ -91,8 +109,6 @@ export default function ProductApproval() {
         }
     }, [selectedProduct]);
 
-    const filteredProducts = allProducts.filter(product => product.status === activeTab);
-
     // --- HELPER: Calculate Market Parity ---
     const getPriceParity = () => {
         if (!selectedProduct || !analysisData) return 0;
@@ -162,7 +178,7 @@ export default function ProductApproval() {
             <div className="bg-white rounded-xl shadow-sm border border-gray-200 overflow-visible min-h-[300px]">
                 {loading ? (
                     <div className="p-10 text-center text-gray-500 font-medium animate-pulse">Fetching inventory data...</div>
-                ) : filteredProducts.length === 0 ? (
+                ) : products.length === 0 ? (
                     <div className="p-10 text-center text-gray-400">No {activeTab} products found.</div>
                 ) : (
                     <table className="min-w-full divide-y divide-gray-200">
@@ -175,13 +191,13 @@ export default function ProductApproval() {
                             </tr>
                         </thead>
                         <tbody className="bg-white divide-y divide-gray-100">
-                            {filteredProducts.map((product) => (
+                            {products.map((product) => (
                                 <tr key={product.id} className="hover:bg-indigo-50/30 transition">
                                     <td className="px-6 py-4 whitespace-nowrap">
                                         <div className="flex items-center gap-4">
                                             <img 
                                                 className="h-12 w-12 rounded-lg object-cover border bg-white" 
-                                                src={product.img ? `http://127.0.0.1:8000${product.img}` : '/placeholder.png'} 
+                                                src={product.img_variants ? `http://127.0.0.1:8000${product.img_variants.thumb.webp}` : product.img ? `http://127.0.0.1:8000${product.img}` : '/placeholder.png'} 
                                                 alt="" 
                                             />
                                             <div>
@@ -225,6 +241,19 @@ export default function ProductApproval() {
                 )}
             </div>
 
+            {/* LOAD MORE */}
+            {!loading && nextCursor && (
+                <div className="flex justify-center mt-6">
+                    <button
+                        onClick={(e) => { e.stopPropagation(); handleLoadMore(); }}
+                        disabled={isLoadingMore}
+                        className="px-6 py-2 text-sm font-bold text-indigo-600 bg-white border border-gray-200 rounded-lg shadow-sm hover:bg-indigo-50 transition disabled:opacity-60"
+                    >
+                        {isLoadingMore ? "Loading..." : "Load more products"}
+                    </button>
+                </div>
+            )}
+
             {/* --- ADVANCED EVALUATION MODAL --- */}
             {selectedProduct && (
                 <div className="fixed inset-0 z-50 flex items-center justify-center bg-black/70 backdrop-blur-sm p-4" onClick={(e) => e.stopPropagation()}>
@@ -5,6 +5,7 @@ import {
   createProductApi, 
   updateProductApi 
 } from '../../auth/auth.Productapi';
+import type { ImageVariants } from '../../auth/auth.types';
 
 interface Product {
   id: number;
@@ -13,11 +14,14 @@ interface Product {
   price: string;
   stock_quantity: number;
   img: string | null;
+  img_variants: ImageVariants | null;
   status: string;
 }
 
 const Inventory: React.FC = () => {
   const [products, setProducts] = useState<Product[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [showModal, setShowModal] = useState(false);
   const [editingProduct, setEditingProduct] = useState<Product | null>(null);
 
@@ -25,15 +29,31 @@ const Inventory: React.FC = () => {
   const [formData, setFormData] = useState({ name: '', description: '', price: '', stock_quantity: '0' });
   const [image, setImage] = useState<File | null>(null);
 
+  // First page only; "Load more" appends the following pages
   const fetchProducts = async () => {
     try {
-      const data = await getSellerProductsApi();
-      setProducts(data);
+      const page = await getSellerProductsApi();
+      setProducts(page?.results ?? []);
+      setNextCursor(page?.next ?? null);
     } catch (error) {
       console.error("Failed to fetch products", error);
     }
   };
 
+  const handleLoadMore = async () => {
+    if (!nextCursor) return;
+    setIsLoadingMore(true);
+    try {
+      const page = await getSellerProductsApi(nextCursor);
+      setProducts(prev => [...prev, ...(page?.results ?? [])]);
+      setNextCursor(page?.next ?? null);
+    } catch (error) {
+      console.error("Failed to load more products", error);
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   useEffect(() => { fetchProducts(); }, []);
 
   const handleDelete = async (id: number) => {
@@ -114,7 +134,7 @@ const Inventory: React.FC = () => {
                 <td className="px-6 py-4 whitespace-nowrap">
                   <div className="flex items-center gap-3">
                     <img 
-                      src={product.img ? `http://127.0.0.1:8000${product.img}` : '/placeholder.png'} 
+                      src={product.img_variants ? `http://127.0.0.1:8000${product.img_variants.thumb.webp}` : product.img ? `http://127.0.0.1:8000${product.img}` : '/placeholder.png'} 
                       className="h-10 w-10 rounded border object-cover" 
                       alt="" 
                     />
@@ -143,6 +163,18 @@ const Inventory: React.FC = () => {
         </table>
       </div>
 
+      {nextCursor && (
+        <div className="flex justify-center mt-4">
+          <button
+            onClick={handleLoadMore}
+            disabled={isLoadingMore}
+            className="px-4 py-2 text-sm font-bold text-blue-600 border border-gray-200 rounded-lg hover:bg-blue-50 transition disabled:opacity-60"
+          >
+            {isLoadingMore ? 'Loading...' : 'Load more products'}
+          </button>
+        </div>
+      )}
+
       {/* ADD/EDIT MODAL */}
       {showModal && (
         <div className="fixed inset-0 z-50 flex items-center justify-center bg-black/50 backdrop-blur-sm p-4">
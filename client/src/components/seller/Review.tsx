@@ -48,6 +48,8 @@ export default function ReviewManagementDashboard() {
     // --- STATE ---
     const [reviews, setReviews] = useState<Review[]>([]);
     const [isLoading, setIsLoading] = useState(true);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [isLoadingMore, setIsLoadingMore] = useState(false);
     const [activeFilter, setActiveFilter] = useState<FilterStatus>('all');
     const [ratingFilter, setRatingFilter] = useState<number | 'all'>('all');
     
@@ -61,12 +63,13 @@ export default function ReviewManagementDashboard() {
         const fetchDashboardData = async () => {
             try {
                 setIsLoading(true);
-                const [reviewsData, settingsData] = await Promise.all([
+                const [reviewsPage, settingsData] = await Promise.all([
                     getProductReviewsApi(),
                     getStoreSettingsApi()
                 ]);
                 
-                setReviews(Array.isArray(reviewsData) ? reviewsData : []);
+                setReviews(Array.isArray(reviewsPage?.results) ? reviewsPage.results : []);
+                setNextCursor(reviewsPage?.next ?? null);
                 setAutoReplyEnabled(settingsData?.autoReplyEnabled || false);
             } catch (error) {
                 console.error("Failed to load dashboard data:", error);
@@ -78,6 +81,20 @@ export default function ReviewManagementDashboard() {
         fetchDashboardData();
     }, []);
 
+    const handleLoadMore = async () => {
+        if (!nextCursor) return;
+        try {
+            setIsLoadingMore(true);
+            const page = await getProductReviewsApi(nextCursor);
+            setReviews(prev => [...prev, ...(page?.results ?? [])]);
+            setNextCursor(page?.next ?? null);
+        } catch (error) {
+            console.error("Failed to load more reviews:", error);
+        } finally {
+            setIsLoadingMore(false);
+        }
+    };
+
     // --- TEMPLATES ---
     const responseTemplates = [
         { label: "Gratitude", text: "Thank you so much for your kind words! We're thrilled to hear you love it." },
@@ -390,6 +407,20 @@ export default function ReviewManagementDashboard() {
                         </div>
                     ))
                 )}
+
+                {/* --- LOAD MORE --- */}
+                {nextCursor && (
+                    <div className="flex justify-center">
+                        <button
+                            onClick={handleLoadMore}
+                            disabled={isLoadingMore}
+                            className="flex items-center gap-2 px-6 py-2 text-sm font-bold text-indigo-600 bg-white border border-gray-200 rounded-lg shadow-sm hover:bg-indigo-50 transition disabled:opacity-60"
+                        >
+                            {isLoadingMore && <Loader2 className="h-4 w-4 animate-spin" />}
+                            {isLoadingMore ? "Loading..." : "Load more reviews"}
+                        </button>
+                    </div>
+                )}
             </div>
         </div>
     );
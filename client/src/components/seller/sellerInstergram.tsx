@@ -45,6 +45,8 @@ export default function SalesInstergram() {
     const [searchCategory, setSearchCategory] = useState('');
     const [searchHashtag, setSearchHashtag] = useState('');
     const [products, setProducts] = useState<any[]>([]); // Added products state
+    const [productsCursor, setProductsCursor] = useState<string | null>(null);
+    const [isLoadingProducts, setIsLoadingProducts] = useState(false);
     const [isSearching, setIsSearching] = useState(false);
     const [influencers, setInfluencers] = useState<Influencer[]>([]);
 
@@ -63,9 +65,10 @@ export default function SalesInstergram() {
                 const promoData = await getSellerPromotionsApi();
                 setPromotions(promoData);
 
-                // Fetch seller products for the dropdown
-                const productsData = await getrelatedsellerProductsApi();
-                setProducts(productsData);
+                // Fetch the first page of seller products for the dropdown
+                const productsPage = await getrelatedsellerProductsApi();
+                setProducts(productsPage?.results ?? []);
+                setProductsCursor(productsPage?.next ?? null);
 
                 // Mocking metrics until you have a metrics API
                 setMetrics([
@@ -84,6 +87,20 @@ export default function SalesInstergram() {
         fetchDashboardData();
     }, []);
 
+    const handleLoadMoreProducts = async () => {
+        if (!productsCursor) return;
+        setIsLoadingProducts(true);
+        try {
+            const page = await getrelatedsellerProductsApi(productsCursor);
+            setProducts(prev => [...prev, ...(page?.results ?? [])]);
+            setProductsCursor(page?.next ?? null);
+        } catch (error) {
+            console.error("Failed to load more products", error);
+        } finally {
+            setIsLoadingProducts(false);
+        }
+    };
+
     // --- 2. CREATE PROMOTION (POST) ---
     const handleCreatePromotion = async (e: React.FormEvent) => {
         e.preventDefault();
@@ -271,6 +288,16 @@ export default function SalesInstergram() {
                                             </option>
                                         ))}
                                     </select>
+                                    {productsCursor && (
+                                        <button
+                                            type="button"
+                                            onClick={handleLoadMoreProducts}
+                                            disabled={isLoadingProducts}
+                                            className="mt-2 text-xs font-bold text-indigo-600 hover:text-indigo-800 disabled:opacity-60"
+                                        >
+                                            {isLoadingProducts ? "Loading..." : "Load more products"}
+                                        </button>
+                                    )}
                                 </div>
                                 <div>
                                     <label className="block text-xs font-bold text-gray-700 uppercase mb-2">Discount Amount</label>
@@ -147,6 +147,8 @@ class UserListView(generics.ListAPIView):
     queryset = UserProfile.objects.all().select_related('user').order_by('-user__date_joined')
     serializer_class = UserManagementSerializer
     permission_classes = [permissions.IsAdminUser]
+    # The admin screen expects a plain list
+    pagination_class = None
 
 class UserDeleteView(APIView):
     permission_classes = [permissions.IsAdminUser]
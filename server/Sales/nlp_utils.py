@@ -4,14 +4,11 @@ import time
 import random
 import logging
 from bs4 import BeautifulSoup
-from sentence_transformers import SentenceTransformer, util
+from products.model_registry import get_model
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Load the Hugging Face semantic model
-model = SentenceTransformer('all-MiniLM-L6-v2')
-
 # Create a session to reuse connections
 session = requests.Session()
 
@@ -167,6 +164,10 @@ def find_tiktok_ambassadors(search_query, target_usernames):
         scraped_data = FALLBACK_INFLUENCERS
 
     # 3. AI ANALYSIS (Works on both Live and Fallback data)
+    from sentence_transformers import util
+
+    # Shared Hugging Face semantic model, loaded on first use
+    model = get_model('sentence-encoder')
     db_texts = [item['nlp_text'] for item in scraped_data]
     
     # Encode data
@@ -14,3 +14,11 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
 application = get_asgi_application()
+
+# Load ML models before the first request instead of during it
+from django.conf import settings  # noqa: E402
+
+if settings.ML_WARM_ON_STARTUP:
+    from products.model_registry import warm_models
+
+    warm_models()
@@ -163,6 +163,9 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny', # Allow login/register by default
     ],
+    # Keyset-paginated listings by default (override the page size with ?page_size=)
+    'DEFAULT_PAGINATION_CLASS': 'products.pagination.KeysetPagination',
+    'PAGE_SIZE': env.int('API_PAGE_SIZE', default=50),
 }
 
 SIMPLE_JWT = {
@@ -172,6 +175,56 @@ SIMPLE_JWT = {
     'BLACKLIST_AFTER_ROTATION': True,
 }
 
+# Local memory by default; point CACHE_URL at a file/redis/memcached backend
+# so catalog version bumps are shared between worker processes.
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+CATALOG_CACHE_TIMEOUT = env.int('CATALOG_CACHE_TIMEOUT', default=300)
+
+# Load ML models when the WSGI/ASGI app starts rather than on first use
+ML_WARM_ON_STARTUP = env.bool('ML_WARM_ON_STARTUP', default=False)
+
+# Toxicity classifier backend: 'torch' (transformers pipeline) or 'onnx' (int8 ONNX Runtime
+# graph written to MODERATION_ONNX_DIR by `manage.py export_toxicity_onnx`)
+MODERATION_BACKEND = env('MODERATION_BACKEND', default='torch')
+MODERATION_ONNX_DIR = env('MODERATION_ONNX_DIR', default=str(BASE_DIR / 'ml_models' / 'toxic-bert-onnx'))
+# Hugging Face revision (branch, tag or commit sha) of toxic-bert for the torch backend. Cached
+# verdicts are keyed by the commit sha it resolved to when the model loaded.
+MODERATION_MODEL_REVISION = env('MODERATION_MODEL_REVISION', default='main')
+
+# Deadlines (seconds) for the external calls behind product market analysis
+MARKET_VISION_TIMEOUT = env.float('MARKET_VISION_TIMEOUT', default=8.0)
+MARKET_SEARCH_TIMEOUT = env.float('MARKET_SEARCH_TIMEOUT', default=5.0)
+MARKET_ANALYSIS_BUDGET = env.float('MARKET_ANALYSIS_BUDGET', default=10.0)
+
+# Upper bound (seconds) on how stale cached StoreSettings/PlatformSettings may be when
+# the cache backend is per-process; shared backends invalidate immediately
+SETTINGS_CACHE_TTL = env.int('SETTINGS_CACHE_TTL', default=30)
+
+# Seconds a checkout may hold stock before an unpaid reservation is released
+STOCK_RESERVATION_TTL = env.int('STOCK_RESERVATION_TTL', default=15 * 60)
+
+# Competitor price cache: serve fresh for TTL, then stale (refreshing in the background) for STALE more
+MARKET_PRICE_CACHE_TTL = env.int('MARKET_PRICE_CACHE_TTL', default=6 * 60 * 60)
+MARKET_PRICE_CACHE_STALE = env.int('MARKET_PRICE_CACHE_STALE', default=24 * 60 * 60)
+
+# Texts per forward pass when screening content in bulk
+MODERATION_BATCH_SIZE = env.int('MODERATION_BATCH_SIZE', default=32)
+
+# Concurrent single-item moderation requests are pooled into one forward pass: the
+# batcher waits at most WAIT_MS for company and never batches more than MAX_ITEMS
+MODERATION_MICROBATCH = env.bool('MODERATION_MICROBATCH', default=True)
+MODERATION_MICROBATCH_WAIT_MS = env.float('MODERATION_MICROBATCH_WAIT_MS', default=5.0)
+MODERATION_MICROBATCH_MAX_ITEMS = env.int('MODERATION_MICROBATCH_MAX_ITEMS', default=32)
+
+# Seconds a moderator's claim on priority-queue items lasts before they return to the queue
+MODERATION_CLAIM_TTL = env.int('MODERATION_CLAIM_TTL', default=10 * 60)
+
+# Resolve items the classifier recommends approving as soon as they are created,
+# instead of queueing them for a moderator
+MODERATION_AUTO_APPROVE = env.bool('MODERATION_AUTO_APPROVE', default=True)
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
@@ -14,3 +14,11 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
 application = get_wsgi_application()
+
+# Load ML models before the first request instead of during it
+from django.conf import settings  # noqa: E402
+
+if settings.ML_WARM_ON_STARTUP:
+    from products.model_registry import warm_models
+
+    warm_models()
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment', '0004_orders_items_promotionrequest_timelineevent'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='items',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='orders',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='timelineevent',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
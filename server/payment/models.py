@@ -2,6 +2,7 @@ from django.db import models
 from django.conf import settings
 from django.utils import timezone
 from products.models import Product
+from products.settings_cache import CachedSetting
 
 # --- ENUMS ---
 PAYMENT_TYPE = [('visa', 'Visa'), ('mastercard', 'Mastercard'), ('amex', 'Amex')]
@@ -145,6 +146,16 @@ class PlatformSettings(models.Model):
 
     def __str__(self):
         return f"{self.key}: {self.is_enabled}"
+
+    @classmethod
+    def enabled(cls, key, default=True):
+        """Cached lookup of a flag; falls back to ``default`` when the key was never set."""
+        return platform_settings_cache.get().get(key, default)
+
+
+platform_settings_cache = CachedSetting(
+    'platform', lambda: dict(PlatformSettings.objects.values_list('key', 'is_enabled'))
+)
     
 class PaymentMethod(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='payment_methods', on_delete=models.CASCADE)
@@ -195,6 +206,7 @@ class Orders(models.Model):
     date = models.DateField(auto_now_add=True)
     status = models.CharField(max_length=20, choices=SHIPPING_STATUS, default='pending')
     internal_notes = models.TextField(blank=True) 
+    updated_at = models.DateTimeField(auto_now=True)
 
 
 
@@ -202,12 +214,14 @@ class TimelineEvent(models.Model):
     order = models.ForeignKey(Orders, related_name='timeline_events', on_delete=models.CASCADE)
     event = models.CharField(max_length=255) 
     date = models.DateField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
 class Items(models.Model):
     order = models.ForeignKey(Orders, related_name='items', on_delete=models.CASCADE)
     product_name = models.CharField(max_length=100)
     quantity = models.IntegerField()
     price_per_unit = models.DecimalField(max_digits=10, decimal_places=2)
+    updated_at = models.DateTimeField(auto_now=True)
 
 
 
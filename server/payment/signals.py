@@ -0,0 +1,9 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import PlatformSettings, platform_settings_cache
+
+
+@receiver(post_save, sender=PlatformSettings)
+@receiver(post_delete, sender=PlatformSettings)
+def invalidate_platform_settings(sender, **kwargs):
+    platform_settings_cache.invalidate_on_commit()
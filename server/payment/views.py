@@ -4,7 +4,7 @@ from rest_framework import status, permissions
 from django.db.models import Sum, Q
 from django.shortcuts import get_object_or_404
 
-from .models import Orders, Wallet, Payout, RefundRequest, TaxProfile, Subscription,PaymentMethod,PromotionRequest
+from .models import Orders, Items, TimelineEvent, Wallet, Payout, RefundRequest, TaxProfile, Subscription,PaymentMethod,PromotionRequest
 from .serializers import (
     OrderSerializer,
     WalletDashboardSerializer, 
@@ -16,6 +16,7 @@ from .serializers import (
     ProductPromotionSerializer
 )
 from Profile.permission import IsSeller, IsAdminorSeller, IsBuyer
+from products.mixins import ConditionalGetMixin
 
 # --- WALLET HUB ---
 
@@ -191,12 +192,8 @@ class FinanceDashboardView(APIView):
         pending_clearance = Wallet.objects.aggregate(sum=Sum('pending_clearance'))['sum'] or 0
 
         # 2. Get Real Automation Status (New Logic)
-        try:
-            # Fetch from DB, default to True if not set
-            setting = PlatformSettings.objects.get(key='auto_payouts')
-            is_auto_enabled = setting.is_enabled
-        except PlatformSettings.DoesNotExist:
-            is_auto_enabled = True
+        # Cached in process, default to True if not set
+        is_auto_enabled = PlatformSettings.enabled('auto_payouts', default=True)
 
         # 3. Get Tax Profiles
         tax_profiles = TaxProfile.objects.all()
@@ -298,13 +295,18 @@ class ProductPromotionView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
 
-class OrdersView(APIView):
+class OrdersView(ConditionalGetMixin, APIView):
     permission_classes = [permissions.IsAuthenticated]
     def get(self, request):
         orders = Orders.objects.all().order_by('-date')
-        
-        serializer = OrderSerializer(orders, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        # Nested items and timeline events are part of each order's payload
+        etag, last_modified = self.queryset_validators(
+            request, Orders.objects.all(), Items.objects.all(), TimelineEvent.objects.all()
+        )
+        return self.conditional_response(
+            request, etag, last_modified,
+            lambda: Response(OrderSerializer(orders, many=True).data, status=status.HTTP_200_OK),
+        )
     
     def post (self, request):
         serializer = OrderSerializer(data=request.data)
@@ -1,5 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class ProductsConfig(AppConfig):
     name = 'products'
+
+    def ready(self):
+        # Receivers for the catalog cache, search embeddings, rating aggregates and
+        # settings cache; review auto-replies come from `manage.py process_auto_replies`.
+        from . import signals, tasks  # noqa: F401
+        from .search import repair_search_index
+        post_migrate.connect(repair_search_index, sender=self)
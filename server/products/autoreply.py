@@ -0,0 +1,75 @@
+# autoreply.py
+"""
+Batched review auto-replies.
+
+Reviews are saved with ``auto_reply_done=False`` and nothing else happens in
+the request. `manage.py process_auto_replies` drains that backlog in id order:
+each batch is claimed with SELECT ... FOR UPDATE SKIP LOCKED (so several
+processors can run), answered with one bulk_create and marked done with one
+UPDATE.
+"""
+from django.db import transaction
+
+from .models import ProductReview, StoreSettings
+
+BATCH_SIZE = 500
+
+
+def reply_text(rating):
+    # Determine template based on rating
+    if rating >= 4:
+        return "Thank you so much for your kind words! We're thrilled to hear you love it."
+    elif rating <= 2:
+        return "We're so sorry to hear this didn't meet your expectations. Please DM us so we can make it right."
+    return "Thanks for the feedback! We'll pass this along to our product team immediately."
+
+
+def pending_reviews():
+    return ProductReview.objects.filter(auto_reply_done=False, reply_to__isnull=True)
+
+
+def process_batch(batch_size=BATCH_SIZE):
+    """Handles one batch. Returns ``(reviews_processed, replies_created)``."""
+    with transaction.atomic():
+        batch = list(
+            pending_reviews()
+            .select_for_update(skip_locked=True, of=('self',))
+            .select_related('product')
+            .order_by('id')[:batch_size]
+        )
+        if not batch:
+            return 0, 0
+
+        replies = []
+        if StoreSettings.current().auto_reply_enabled:
+            # A seller may have answered by hand while the review waited
+            answered = set(
+                ProductReview.objects.filter(reply_to__in=batch).values_list('reply_to_id', flat=True)
+            )
+            replies = [
+                ProductReview(
+                    product=review.product,
+                    user=review.product.seller,  # The seller creates the reply
+                    rating=0, # Rating doesn't matter for a reply
+                    comment=reply_text(review.rating),
+                    reply_to=review, # Link it to the parent review
+                    status='approved'
+                )
+                for review in batch
+                if review.pk not in answered
+            ]
+            ProductReview.objects.bulk_create(replies)
+
+        ProductReview.objects.filter(pk__in=[review.pk for review in batch]).update(auto_reply_done=True)
+    return len(batch), len(replies)
+
+
+def process_auto_replies(batch_size=BATCH_SIZE):
+    """Drains the whole backlog. Returns ``(reviews_processed, replies_created)``."""
+    processed = created = 0
+    while True:
+        batch_processed, batch_created = process_batch(batch_size)
+        processed += batch_processed
+        created += batch_created
+        if batch_processed < batch_size:
+            return processed, created
@@ -0,0 +1,74 @@
+# bulk.py
+"""
+Set-based admin status changes.
+
+Approving or rejecting through ``save()`` costs one UPDATE per product plus a
+post_save round for each. Here the whole selection changes in one UPDATE, and
+the side effects post_save would have had (catalog cache version, semantic
+search embeddings) run once for the batch after commit. The full-text index
+needs nothing: it only tracks name and description.
+"""
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .cache import bump_catalog_version
+from .embeddings import forget_products
+from .models import Product
+
+# Filters accepted by bulk endpoints: {"filter": {"status": "pending", "seller": 3, ...}}
+FILTERS = {
+    'status': 'status',
+    'seller': 'seller_id',
+    'created_after': 'created_at__gte',
+    'created_before': 'created_at__lt',
+}
+
+
+def filtered_products(spec):
+    """Turns a filter spec into a Product queryset. Raises ValueError on bad input."""
+    if not isinstance(spec, dict) or not spec:
+        raise ValueError("'filter' must be a non-empty object.")
+    unknown = set(spec) - set(FILTERS)
+    if unknown:
+        raise ValueError(f"Unknown filter(s): {', '.join(sorted(unknown))}. Allowed: {', '.join(FILTERS)}.")
+
+    lookups = {}
+    for key, value in spec.items():
+        if key.startswith('created_'):
+            parsed = parse_datetime(str(value))
+            if parsed is None:
+                raise ValueError(f"'{key}' must be an ISO 8601 datetime.")
+            value = parsed
+        elif key == 'status' and value not in dict(Product.STATUS_CHOICES):
+            raise ValueError(f"Unknown status '{value}'.")
+        lookups[FILTERS[key]] = value
+    return Product.objects.filter(**lookups)
+
+
+def set_products_status(queryset, new_status):
+    """
+    Moves every product in ``queryset`` to ``new_status`` with one UPDATE.
+    Returns ``{"matched", "updated"}``; products already in that status are
+    matched but not updated.
+    """
+    with transaction.atomic():
+        matched = queryset.count()
+        ids = list(
+            queryset.exclude(status=new_status).select_for_update().values_list('pk', flat=True)
+        )
+        updated = Product.objects.filter(pk__in=ids).update(status=new_status, updated_at=timezone.now())
+        if updated:
+            transaction.on_commit(lambda: _after_status_change(ids, new_status))
+    return {'matched': matched, 'updated': updated}
+
+
+def _after_status_change(ids, new_status):
+    from .jobs import enqueue
+
+    bump_catalog_version()
+    if new_status == 'approved':
+        # Encoding thousands of products belongs in a worker, not the request
+        enqueue('refresh_embeddings', {'product_ids': ids})
+    else:
+        forget_products(ids)
@@ -0,0 +1,60 @@
+# cache.py
+"""
+Versioned read-through cache for the public catalog.
+
+Every cached catalog page is keyed by the current catalog version. Any write
+to a product bumps the version, which orphans all old pages at once (they
+simply expire) instead of hunting down individual keys. Reads need only the
+cache backend, never the database.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+CATALOG_VERSION_KEY = 'catalog:version'
+
+
+def get_catalog_version():
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        # Seed from the clock so a restarted/evicted counter never reuses an old version
+        cache.add(CATALOG_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    try:
+        return cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        # Key was evicted: any fresh seed is newer than what pages were built with
+        get_catalog_version()
+        return cache.incr(CATALOG_VERSION_KEY)
+
+
+def bump_catalog_version_on_commit():
+    # Bumping before commit would let a concurrent reader cache stale rows under the new version
+    transaction.on_commit(bump_catalog_version)
+
+
+def catalog_cache_key(request, version=None):
+    if version is None:
+        version = get_catalog_version()
+    url = request.build_absolute_uri()
+    return f"catalog:v{version}:{hashlib.md5(url.encode('utf-8')).hexdigest()}"
+
+
+def cached_catalog_page(request, build):
+    """
+    Returns the cached payload for this catalog URL, calling ``build()`` and
+    storing its result on a miss.
+    """
+    key = catalog_cache_key(request)
+    data = cache.get(key)
+    if data is None:
+        data = build()
+        cache.set(key, data, settings.CATALOG_CACHE_TIMEOUT)
+    return data
@@ -0,0 +1,292 @@
+# embeddings.py
+"""
+Semantic product search.
+
+Approved products are embedded once (re-encoded only when their text changes)
+with the shared MiniLM model from the model registry, and stored as float16 blobs in
+ProductEmbedding. Each process keeps an in-memory float32 matrix of all
+vectors; a query is a single matrix-vector product plus argpartition.
+"""
+import hashlib
+import logging
+import threading
+from datetime import timedelta
+
+import numpy as np
+from django.db import transaction
+
+from .model_registry import get_model
+from .models import Product, ProductEmbedding
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+EMBEDDING_DIM = 384
+STORAGE_DTYPE = np.float16
+# Re-read recent rows on each sync so transactions that committed late are not missed
+SYNC_OVERLAP = timedelta(seconds=30)
+
+
+def get_encoder():
+    # Same shared SentenceTransformer instance the Sales app uses
+    return get_model('sentence-encoder')
+
+
+def product_text(product):
+    return f"{product.name}. {product.description}".strip()
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def encode_texts(texts, batch_size=64):
+    """Returns an (n, dim) float32 matrix of L2-normalised embeddings."""
+    vectors = get_encoder().encode(
+        list(texts),
+        batch_size=batch_size,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+    )
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def to_blob(vector):
+    return np.asarray(vector, dtype=STORAGE_DTYPE).tobytes()
+
+
+def from_blobs(blobs):
+    """Decodes a list of stored blobs into one (n, dim) float32 matrix."""
+    if not blobs:
+        return np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+    raw = np.frombuffer(b''.join(bytes(b) for b in blobs), dtype=STORAGE_DTYPE)
+    return raw.reshape(len(blobs), -1).astype(np.float32)
+
+
+class VectorIndex:
+    """
+    Append-friendly in-memory cosine index. A delete masks its row out
+    rather than moving the rows after it; once masked rows make up more than
+    COMPACT_FRACTION of the matrix, the live rows are packed together again.
+    """
+    COMPACT_FRACTION = 0.25
+    COMPACT_MIN_ROWS = 1024
+
+    def __init__(self, dim=EMBEDDING_DIM):
+        self.dim = dim
+        self.ids = np.empty(0, dtype=np.int64)
+        self.matrix = np.empty((0, dim), dtype=np.float32)
+        self.alive = np.empty(0, dtype=bool)
+        self.size = 0
+        self.rows = {}
+        self.synced_at = None
+        self.lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _reserve(self, extra):
+        needed = self.size + extra
+        if needed <= len(self.ids):
+            return
+        capacity = max(needed, 2 * len(self.ids), 1024)
+        ids = np.empty(capacity, dtype=np.int64)
+        matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+        alive = np.zeros(capacity, dtype=bool)
+        ids[:self.size] = self.ids[:self.size]
+        matrix[:self.size] = self.matrix[:self.size]
+        alive[:self.size] = self.alive[:self.size]
+        self.ids, self.matrix, self.alive = ids, matrix, alive
+
+    def upsert(self, ids, vectors):
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        with self.lock:
+            new = [i for i, pk in enumerate(ids) if pk not in self.rows]
+            self._reserve(len(new))
+            for i, pk in enumerate(ids):
+                row = self.rows.get(pk)
+                if row is None:
+                    row = self.size
+                    self.size += 1
+                    self.rows[pk] = row
+                    self.ids[row] = pk
+                self.matrix[row] = vectors[i]
+                self.alive[row] = True
+
+    def remove(self, ids):
+        with self.lock:
+            for pk in ids:
+                row = self.rows.pop(pk, None)
+                if row is not None:
+                    self.alive[row] = False
+                    self.matrix[row] = 0.0
+            dead = self.size - len(self.rows)
+            if dead >= self.COMPACT_MIN_ROWS and dead > self.size * self.COMPACT_FRACTION:
+                self._compact()
+
+    def _compact(self):
+        live = np.flatnonzero(self.alive[:self.size])
+        n = len(live)
+        self.ids[:n] = self.ids[live]
+        self.matrix[:n] = self.matrix[live]
+        self.alive[:n] = True
+        self.alive[n:self.size] = False
+        self.matrix[n:self.size] = 0.0
+        self.size = n
+        self.rows = {int(pk): row for row, pk in enumerate(self.ids[:n])}
+
+    def search(self, query, k=10):
+        """Returns ``[(product_id, cosine_score), ...]`` best first."""
+        query = np.asarray(query, dtype=np.float32).reshape(self.dim)
+        with self.lock:
+            n = self.size
+            if not n or k <= 0:
+                return []
+            scores = self.matrix[:n] @ query
+            scores[~self.alive[:n]] = -np.inf
+            k = min(k, len(self.rows))
+            if k < n:
+                top = np.argpartition(scores, n - k)[n - k:]
+            else:
+                top = np.arange(n)
+            top = top[np.argsort(scores[top])[::-1]]
+            return [(int(self.ids[i]), float(scores[i])) for i in top if self.alive[i]]
+
+    def sync(self, chunk_size=5000):
+        """
+        Pulls embeddings written since the last sync (by any process) into
+        memory. The first call loads everything.
+        """
+        with self.lock:
+            rows = ProductEmbedding.objects.filter(model_name=EMBEDDING_MODEL)
+            if self.synced_at is not None:
+                rows = rows.filter(updated_at__gte=self.synced_at - SYNC_OVERLAP)
+            rows = rows.order_by('updated_at').values_list('product_id', 'vector', 'updated_at')
+
+            ids, blobs, latest = [], [], self.synced_at
+            for pk, blob, updated_at in rows.iterator(chunk_size=chunk_size):
+                ids.append(pk)
+                blobs.append(blob)
+                latest = updated_at
+                if len(ids) >= chunk_size:
+                    self.upsert(ids, from_blobs(blobs))
+                    ids, blobs = [], []
+            if ids:
+                self.upsert(ids, from_blobs(blobs))
+            self.synced_at = latest
+
+
+index = VectorIndex()
+
+
+def embed_products(products, batch_size=64):
+    """
+    Embeds approved products whose text changed since they were last embedded
+    and stores the vectors. Returns the number of products encoded.
+    """
+    products = [p for p in products if p.status == 'approved']
+    if not products:
+        return 0
+
+    known = dict(
+        ProductEmbedding.objects
+        .filter(product__in=products, model_name=EMBEDDING_MODEL)
+        .values_list('product_id', 'text_hash')
+    )
+    pending = []
+    for product in products:
+        text = product_text(product)
+        digest = text_hash(text)
+        if known.get(product.pk) != digest:
+            pending.append((product, text, digest))
+    if not pending:
+        return 0
+
+    vectors = encode_texts([text for _, text, _ in pending], batch_size=batch_size)
+    ProductEmbedding.objects.bulk_create(
+        [
+            ProductEmbedding(product=product, vector=to_blob(vector), text_hash=digest, model_name=EMBEDDING_MODEL)
+            for (product, _, digest), vector in zip(pending, vectors)
+        ],
+        update_conflicts=True,
+        unique_fields=['product'],
+        update_fields=['vector', 'text_hash', 'model_name', 'updated_at'],
+    )
+    index.upsert([product.pk for product, _, _ in pending], vectors)
+    return len(pending)
+
+
+def forget_products(product_ids):
+    product_ids = list(product_ids)
+    ProductEmbedding.objects.filter(product_id__in=product_ids).delete()
+    index.remove(product_ids)
+
+
+def refresh_embeddings(product_ids, batch_size=256):
+    """
+    Brings the stored embeddings of ``product_ids`` in step with each
+    product's status and text. Returns ``(encoded, forgotten)`` counts.
+    """
+    encoded = forgotten = 0
+    for start in range(0, len(product_ids), batch_size):
+        chunk = product_ids[start:start + batch_size]
+        products = list(Product.objects.filter(pk__in=chunk))
+        encoded += embed_products(products, batch_size=batch_size)
+        approved = {product.pk for product in products if product.status == 'approved'}
+        stale = [pk for pk in chunk if pk not in approved]
+        if stale and ProductEmbedding.objects.filter(product_id__in=stale).exists():
+            forget_products(stale)
+            forgotten += len(stale)
+    return encoded, forgotten
+
+
+# What an embedding depends on: the text, and whether the product is approved
+EMBEDDED_FIELDS = ('name', 'description', 'status')
+
+
+def embedding_state(product):
+    """The EMBEDDED_FIELDS values, or None for any the instance was loaded without."""
+    return tuple(product.__dict__.get(field) for field in EMBEDDED_FIELDS)
+
+
+def needs_embedding_refresh(old_state, product, created=False, update_fields=None):
+    if created:
+        return True
+    if update_fields is not None and not set(update_fields) & set(EMBEDDED_FIELDS):
+        return False
+    # A field that was deferred at load time may have changed; refresh to be safe
+    return None in old_state or old_state != embedding_state(product)
+
+
+def schedule_embedding_refresh(product):
+    """
+    Refreshes the product's embedding in a `run_jobs` worker after commit,
+    so saving a product never loads the encoder or runs it in the request.
+    """
+    from .jobs import enqueue
+
+    transaction.on_commit(lambda: enqueue('refresh_embeddings', {'product_ids': [product.pk]}))
+
+
+def semantic_search(query, k=10):
+    """
+    Returns ``[(product, score), ...]`` for the approved products closest to
+    ``query`` in embedding space.
+    """
+    index.sync()
+    query_vector = encode_texts([query])[0]
+    # The index can still hold products another process unapproved or deleted
+    # (sync only sees new rows), so widen the search until k approved ones are found
+    fetch = k * 2
+    while True:
+        hits = index.search(query_vector, k=fetch)
+        products = Product.objects.select_related('seller').in_bulk([pk for pk, _ in hits])
+        deleted = [pk for pk, _ in hits if pk not in products]
+        if deleted:
+            index.remove(deleted)
+        results = [
+            (products[pk], score) for pk, score in hits if pk in products and products[pk].status == 'approved'
+        ]
+        if len(results) >= k or len(hits) < fetch:
+            return results[:k]
+        fetch *= 2
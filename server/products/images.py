@@ -0,0 +1,302 @@
+# images.py
+"""
+Resized product image variants.
+
+Sellers upload one original; storefront pages need far smaller files. After
+an upload a background job (kind 'image_variants') renders each size in WebP
+and JPEG next to the original and records their storage names on
+``Product.img_variants``:
+
+    {"source": "products/shoe.png",
+     "thumb": {"webp": "products/variants/12/1a2b3c4d/thumb.webp", "jpeg": ...},
+     "card": {...}, "zoom": {...}}
+
+``source`` ties the variants to the upload they were built from, so a newer
+upload never serves the previous image's variants.
+
+The same job stores a 64-bit difference hash (dHash) of the upload. Near
+duplicates (a few bits apart) are found through four 16-bit bands: two hashes
+within MAX_DISTANCE bits must agree exactly on at least one band, so each
+lookup is an indexed equality query followed by an exact popcount check.
+"""
+import hashlib
+import io
+import logging
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .cache import bump_catalog_version
+from .models import Product
+
+logger = logging.getLogger(__name__)
+
+# Bounding boxes; images are scaled down to fit, never up
+VARIANT_SIZES = {
+    'thumb': (160, 160),
+    'card': (480, 480),
+    'zoom': (1600, 1600),
+}
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+VARIANT_DIR = 'products/variants'
+
+HASH_BANDS = 4
+BAND_BITS = 64 // HASH_BANDS
+# Pigeonhole: with 4 bands, any pair within 3 differing bits shares a band
+MAX_DISTANCE = HASH_BANDS - 1
+# duplicate_groups compares the distinct hashes in a band bucket pairwise;
+# buckets with more than this many (plain or blank images) are skipped
+MAX_BUCKET_HASHES = 500
+
+
+def variants_current(product):
+    variants = product.img_variants or {}
+    return bool(product.img) and variants.get('source') == product.img.name
+
+
+def _flatten(image):
+    """Upright RGB copy; transparency is composited onto white for JPEG."""
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def render_variants(source_file, name_prefix):
+    """
+    Writes every size/format of ``source_file`` to storage and returns the
+    ``{size: {format: storage_name}}`` map.
+    """
+    with Image.open(source_file) as original:
+        original.draft('RGB', VARIANT_SIZES['zoom'])  # JPEG sources decode at reduced size
+        base = _flatten(original)
+
+    variants = {}
+    # Largest first, so each smaller size is resampled from an already reduced image
+    for size_name, box in sorted(VARIANT_SIZES.items(), key=lambda item: -item[1][0]):
+        base.thumbnail(box, Image.LANCZOS)
+        variants[size_name] = {}
+        for fmt, (pil_format, options) in FORMATS.items():
+            buffer = io.BytesIO()
+            base.save(buffer, pil_format, **options)
+            name = default_storage.save(f"{name_prefix}/{size_name}.{fmt}", ContentFile(buffer.getvalue()))
+            variants[size_name][fmt] = name
+    return variants
+
+
+def delete_variants(variants):
+    for size_name in VARIANT_SIZES:
+        for name in (variants or {}).get(size_name, {}).values():
+            try:
+                default_storage.delete(name)
+            except Exception as e:
+                logger.warning(f"Could not delete image variant {name}: {e}")
+
+
+def build_image_variants(product):
+    """Renders the variants for the product's current upload. Returns the new map."""
+    if not product.img:
+        return {}
+    source = product.img.name
+    digest = hashlib.md5(source.encode('utf-8')).hexdigest()[:8]
+    with product.img.open('rb') as source_file:
+        variants = render_variants(source_file, f"{VARIANT_DIR}/{product.pk}/{digest}")
+    variants['source'] = source
+
+    # Only attach if the upload did not change while we were rendering
+    updated = Product.objects.filter(pk=product.pk, img=source).update(
+        img_variants=variants, updated_at=timezone.now(),
+    )
+    if not updated:
+        delete_variants(variants)
+        return {}
+
+    if product.img_variants and product.img_variants.get('source') != source:
+        delete_variants(product.img_variants)
+    product.img_variants = variants
+    bump_catalog_version()
+    return variants
+
+
+def schedule_image_variants(product):
+    """Queues variant generation once the upload is committed."""
+    from .jobs import enqueue
+
+    if product.img:
+        transaction.on_commit(
+            lambda: enqueue('image_variants', {'product_id': product.pk, 'source': product.img.name})
+        )
+
+
+def variant_urls(product):
+    """``{size: {format: url}}`` for the current upload, or None if not built yet."""
+    if not variants_current(product):
+        return None
+    return {
+        size_name: {fmt: default_storage.url(name) for fmt, name in product.img_variants[size_name].items()}
+        for size_name in VARIANT_SIZES
+        if size_name in product.img_variants
+    }
+
+
+# --- Perceptual hashing ---
+
+def dhash(image_file):
+    """64-bit difference hash: one bit per horizontally adjacent pixel pair of a 9x8 greyscale thumbnail."""
+    with Image.open(image_file) as image:
+        image.draft('L', (64, 64))
+        pixels = list(ImageOps.exif_transpose(image).convert('L').resize((9, 8), Image.LANCZOS).getdata())
+    value = 0
+    for row in range(8):
+        for col in range(8):
+            value = (value << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return value
+
+
+def to_signed(value):
+    """Stores an unsigned 64-bit hash in a signed BIGINT column."""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def hash_bands(value):
+    value &= (1 << 64) - 1
+    mask = (1 << BAND_BITS) - 1
+    return [(value >> (BAND_BITS * i)) & mask for i in range(HASH_BANDS)]
+
+
+def hamming(a, b):
+    return bin((a ^ b) & ((1 << 64) - 1)).count('1')
+
+
+def hash_fields(value):
+    fields = {'img_hash': to_signed(value)}
+    for i, band in enumerate(hash_bands(value)):
+        fields[f'img_hash_b{i}'] = band
+    return fields
+
+
+def index_image_hash(product):
+    """Computes and stores the dHash of the product's current upload."""
+    if not product.img:
+        return None
+    with product.img.open('rb') as image_file:
+        value = dhash(image_file)
+    fields = hash_fields(value)
+    Product.objects.filter(pk=product.pk, img=product.img.name).update(**fields)
+    for name, field_value in fields.items():
+        setattr(product, name, field_value)
+    return value
+
+
+def near_duplicates(value, max_distance=MAX_DISTANCE, queryset=None):
+    """
+    Returns ``[(product, distance), ...]`` for products whose image hash is
+    within ``max_distance`` bits of ``value``, closest first.
+    """
+    if queryset is None:
+        queryset = Product.objects.all()
+    band_match = Q()
+    for i, band in enumerate(hash_bands(value)):
+        band_match |= Q(**{f'img_hash_b{i}': band})
+    matches = []
+    for product in queryset.filter(band_match):
+        distance = hamming(value, product.img_hash)
+        if distance <= max_distance:
+            matches.append((product, distance))
+    matches.sort(key=lambda match: (match[1], match[0].pk))
+    return matches
+
+
+def duplicate_groups(max_distance=MAX_DISTANCE, queryset=None, max_bucket=MAX_BUCKET_HASHES):
+    """
+    Groups products whose images are near duplicates of each other. Returns a
+    list of product-id lists (largest group first); singletons are left out.
+
+    Products with identical hashes are always grouped. Beyond that, distinct
+    hashes sharing a band are compared pairwise, which is skipped for band
+    buckets holding more than ``max_bucket`` distinct hashes so the cost
+    stays bounded; pairs that only agree on such a band go unreported.
+    """
+    if queryset is None:
+        queryset = Product.objects.all()
+    rows = list(queryset.filter(img_hash__isnull=False).values_list('id', 'img_hash'))
+
+    parent = {pk: pk for pk, _ in rows}
+
+    def find(pk):
+        while parent[pk] != pk:
+            parent[pk] = parent[parent[pk]]
+            pk = parent[pk]
+        return pk
+
+    # One representative product per distinct hash; exact copies join it directly
+    representative = {}
+    for pk, value in rows:
+        if value in representative:
+            parent[find(pk)] = find(representative[value])
+        else:
+            representative[value] = pk
+
+    buckets = {}
+    for value, pk in representative.items():
+        for i, band in enumerate(hash_bands(value)):
+            buckets.setdefault((i, band), []).append((pk, value))
+    skipped = 0
+    for members in buckets.values():
+        if len(members) > max_bucket:
+            skipped += 1
+            continue
+        for a in range(len(members)):
+            for b in range(a + 1, len(members)):
+                (pk_a, hash_a), (pk_b, hash_b) = members[a], members[b]
+                if hamming(hash_a, hash_b) <= max_distance:
+                    parent[find(pk_a)] = find(pk_b)
+    if skipped:
+        logger.warning(f"duplicate_groups skipped {skipped} band buckets with more than {max_bucket} hashes")
+
+    groups = {}
+    for pk, _ in rows:
+        groups.setdefault(find(pk), []).append(pk)
+    return sorted((sorted(ids) for ids in groups.values() if len(ids) > 1), key=lambda ids: (-len(ids), ids[0]))
+
+
+def reusable_vision_result(product):
+    """
+    A stored Vision result for this upload or a near-duplicate of it, or
+    None if the image has to go to Cloud Vision.
+    """
+    if not product.img:
+        return None
+    source = product.img.name
+    if product.vision_result and product.vision_result.get('source') == source:
+        return product.vision_result['result']
+
+    try:
+        # Re-hash rather than trust img_hash: the upload may be newer than the last image job
+        index_image_hash(product)
+    except Exception as e:
+        logger.warning(f"Could not hash image of product {product.pk}: {e}")
+        return None
+
+    candidates = Product.objects.exclude(pk=product.pk).filter(vision_result__isnull=False)
+    for duplicate, _ in near_duplicates(product.img_hash, queryset=candidates):
+        stored = duplicate.vision_result or {}
+        if stored.get('source') == duplicate.img.name:
+            remember_vision_result(product, stored['result'])
+            return stored['result']
+    return None
+
+
+def remember_vision_result(product, result):
+    product.vision_result = {'source': product.img.name, 'result': result}
+    Product.objects.filter(pk=product.pk, img=product.img.name).update(vision_result=product.vision_result)
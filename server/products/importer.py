@@ -0,0 +1,108 @@
+# importer.py
+"""
+Streaming bulk product import for sellers.
+
+Rows are read one at a time from a CSV or JSON Lines file, validated with the
+same rules as ProductSerializer and inserted with bulk_create in fixed-size
+chunks, so memory use depends on the chunk size, not the file size. Imported
+products always start as 'pending' and go through normal admin approval.
+"""
+import codecs
+import csv
+import json
+
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from .models import Product
+from .serializers import ProductSerializer
+
+IMPORT_FIELDS = ('name', 'description', 'price', 'stock_quantity')
+FORMATS = ('csv', 'jsonl')
+CHUNK_SIZE = 500
+# Keep the report bounded even when every row of a huge file is bad
+MAX_REPORTED_ERRORS = 1000
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def detect_format(filename, explicit=None):
+    fmt = (explicit or '').lower() or filename.rsplit('.', 1)[-1].lower()
+    if fmt in ('ndjson', 'json'):
+        fmt = 'jsonl'
+    if fmt not in FORMATS:
+        raise ImportFormatError(f"Unsupported format '{fmt}'; use one of: {', '.join(FORMATS)}.")
+    return fmt
+
+
+def iter_rows(stream, fmt):
+    """
+    Yields ``(row_number, row)`` from a binary stream; ``row`` is a dict, or an
+    error string for a line that could not be parsed.
+    """
+    text = codecs.getreader('utf-8-sig')(stream)
+    if fmt == 'csv':
+        reader = csv.DictReader(text)
+        if not reader.fieldnames or 'name' not in reader.fieldnames:
+            raise ImportFormatError("CSV header must include at least a 'name' column.")
+        # Row numbers match the file's line numbers (header is line 1)
+        for number, row in enumerate(reader, start=2):
+            yield number, row
+        return
+
+    for number, line in enumerate(text, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, f"Invalid JSON: {e}"
+            continue
+        yield number, row if isinstance(row, dict) else "Each line must be a JSON object."
+
+
+def import_products(stream, fmt, seller, chunk_size=CHUNK_SIZE):
+    """
+    Imports every valid row for ``seller``. Returns a report:
+    ``{"created", "failed", "errors": [{"row", "errors"}], "errors_truncated"}``.
+    """
+    report = {'created': 0, 'failed': 0, 'errors': [], 'errors_truncated': False}
+    batch = []
+    # One serializer for every row: building a ModelSerializer's fields is the costly part
+    serializer = ProductSerializer()
+
+    def fail(number, errors):
+        report['failed'] += 1
+        if len(report['errors']) < MAX_REPORTED_ERRORS:
+            report['errors'].append({'row': number, 'errors': errors})
+        else:
+            report['errors_truncated'] = True
+
+    def flush():
+        with transaction.atomic():
+            Product.objects.bulk_create(batch)
+        report['created'] += len(batch)
+        batch.clear()
+
+    for number, row in iter_rows(stream, fmt):
+        if isinstance(row, str):
+            fail(number, {'non_field_errors': [row]})
+            continue
+
+        data = {field: row[field] for field in IMPORT_FIELDS if row.get(field) not in (None, '')}
+        try:
+            validated = serializer.run_validation(data)
+        except ValidationError as e:
+            fail(number, e.detail)
+            continue
+
+        batch.append(Product(seller=seller, status='pending', **validated))
+        if len(batch) >= chunk_size:
+            flush()
+
+    if batch:
+        flush()
+    return report
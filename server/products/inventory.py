@@ -0,0 +1,168 @@
+# inventory.py
+"""
+Contention-safe stock reservations.
+
+Stock is never read, changed in Python and saved back. Every decrement is a
+single conditional UPDATE:
+
+    UPDATE product SET stock_quantity = stock_quantity - n
+    WHERE id = %s AND stock_quantity >= n
+
+The database applies it atomically, so concurrent checkouts can never take a
+SKU below zero; the loser simply matches no row. A multi-SKU reservation
+decrements its lines in product-id order inside one transaction (consistent
+lock order, so two carts cannot deadlock) and rolls back entirely if any line
+is short.
+
+Status changes on a reservation are conditional too (``WHERE status='held'``),
+which makes commit, release and expiry race-safe and idempotent: stock is
+returned at most once.
+
+These UPDATEs bypass save() and its signals. Bumping the catalog cache
+version on every checkout would throw the whole cache away under exactly the
+load it exists for, so the version is bumped (on commit) only when a product
+goes out of stock or comes back: the transitions that change what a shopper
+can buy. Exact counts in cached catalog pages may lag by up to
+CATALOG_CACHE_TIMEOUT; reservations always check the live row.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .cache import bump_catalog_version_on_commit
+from .models import Product, StockReservation, StockReservationLine
+
+
+class InsufficientStock(Exception):
+    def __init__(self, product_id, requested):
+        self.product_id = product_id
+        self.requested = requested
+        super().__init__(f"Not enough stock for product {product_id} (requested {requested}).")
+
+
+class ReservationError(Exception):
+    pass
+
+
+def _normalize_items(items):
+    """``[(product_id, quantity), ...]`` -> ``{product_id: quantity}`` with duplicates merged."""
+    totals = {}
+    for product_id, quantity in items:
+        if quantity <= 0:
+            raise ValueError("Quantities must be positive.")
+        totals[product_id] = totals.get(product_id, 0) + quantity
+    if not totals:
+        raise ValueError("A reservation needs at least one item.")
+    return totals
+
+
+def take_stock(product_id, quantity):
+    """Atomically removes ``quantity`` units if available. Returns True on success."""
+    return Product.objects.filter(
+        pk=product_id, status='approved', stock_quantity__gte=quantity,
+    ).update(
+        stock_quantity=F('stock_quantity') - quantity, updated_at=timezone.now(),
+    ) == 1
+
+
+def return_stock(product_id, quantity):
+    Product.objects.filter(pk=product_id).update(
+        stock_quantity=F('stock_quantity') + quantity, updated_at=timezone.now(),
+    )
+
+
+def _take_all(totals):
+    for product_id in sorted(totals):
+        if not take_stock(product_id, totals[product_id]):
+            raise InsufficientStock(product_id, totals[product_id])
+    # The rows are locked by this transaction, so zero here means this reservation emptied them
+    if Product.objects.filter(pk__in=list(totals), stock_quantity=0).exists():
+        bump_catalog_version_on_commit()
+
+
+def reserve(items, user=None, ttl=None):
+    """
+    Holds stock for every ``(product_id, quantity)`` in ``items`` or for none
+    of them. Raises InsufficientStock naming the first short product.
+    """
+    totals = _normalize_items(items)
+    ttl = settings.STOCK_RESERVATION_TTL if ttl is None else ttl
+
+    try:
+        with transaction.atomic():
+            _take_all(totals)
+            return _create_reservation(totals, user, ttl)
+    except InsufficientStock:
+        # Abandoned carts may be sitting on the stock; reclaim it and try once more
+        if not expire_reservations(product_ids=list(totals)):
+            raise
+    with transaction.atomic():
+        _take_all(totals)
+        return _create_reservation(totals, user, ttl)
+
+
+def _create_reservation(totals, user, ttl):
+    reservation = StockReservation.objects.create(
+        user=user, expires_at=timezone.now() + timedelta(seconds=ttl),
+    )
+    StockReservationLine.objects.bulk_create([
+        StockReservationLine(reservation=reservation, product_id=product_id, quantity=quantity)
+        for product_id, quantity in totals.items()
+    ])
+    return reservation
+
+
+def _transition(reservation, new_status):
+    """Moves a held reservation to ``new_status``. Returns False if it was no longer held."""
+    changed = StockReservation.objects.filter(pk=reservation.pk, status='held').update(
+        status=new_status, updated_at=timezone.now(),
+    )
+    if changed:
+        reservation.status = new_status
+    return changed == 1
+
+
+def release(reservation, new_status='released'):
+    """Gives a held reservation's stock back. Returns False if it was not held."""
+    with transaction.atomic():
+        if not _transition(reservation, new_status):
+            return False
+        lines = list(reservation.lines.order_by('product_id').values_list('product_id', 'quantity'))
+        for product_id, quantity in lines:
+            return_stock(product_id, quantity)
+        # Back in stock: the product now holds exactly what was returned
+        restocked = Q()
+        for product_id, quantity in lines:
+            restocked |= Q(pk=product_id, stock_quantity=quantity)
+        if lines and Product.objects.filter(restocked).exists():
+            bump_catalog_version_on_commit()
+    return True
+
+
+def commit(reservation):
+    """
+    Turns held stock into a sale. An expired hold is released instead and
+    ReservationError is raised, as is committing anything not held.
+    """
+    if reservation.expires_at <= timezone.now():
+        release(reservation, new_status='expired')
+        raise ReservationError("Reservation has expired.")
+    if not _transition(reservation, 'committed'):
+        reservation.refresh_from_db(fields=['status'])
+        raise ReservationError(f"Reservation is {reservation.status}, not held.")
+    return reservation
+
+
+def expire_reservations(product_ids=None, limit=1000):
+    """Releases held reservations past their expiry. Returns how many were expired."""
+    overdue = StockReservation.objects.filter(status='held', expires_at__lte=timezone.now())
+    if product_ids is not None:
+        overdue = overdue.filter(lines__product_id__in=product_ids).distinct()
+    expired = 0
+    for reservation in overdue.order_by('expires_at')[:limit]:
+        if release(reservation, new_status='expired'):
+            expired += 1
+    return expired
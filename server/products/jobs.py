@@ -0,0 +1,123 @@
+# jobs.py
+"""
+A small DB-backed job queue.
+
+Web requests enqueue BackgroundJob rows and return immediately; one or more
+`manage.py run_jobs` processes claim queued jobs with
+SELECT ... FOR UPDATE SKIP LOCKED, so workers never pick the same job, and
+run the handler registered for the job's kind.
+"""
+import logging
+import os
+import socket
+import time
+import traceback
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+# A job still 'running' after this long is assumed orphaned by a dead worker
+STALE_AFTER = timedelta(minutes=15)
+MAX_ATTEMPTS = 3
+
+HANDLERS = {}
+
+
+def register_handler(kind):
+    """Decorator: ``@register_handler('product_analysis') def run(payload): ...``"""
+    def decorator(func):
+        HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+def enqueue(kind, payload, user=None):
+    if kind not in HANDLERS:
+        raise ValueError(f"No handler registered for job kind '{kind}'")
+    return BackgroundJob.objects.create(kind=kind, payload=payload, created_by=user)
+
+
+def enqueue_many(kind, payloads, user=None):
+    if kind not in HANDLERS:
+        raise ValueError(f"No handler registered for job kind '{kind}'")
+    return BackgroundJob.objects.bulk_create(
+        [BackgroundJob(kind=kind, payload=payload, created_by=user) for payload in payloads]
+    )
+
+
+def fail_exhausted(stale):
+    """Marks orphaned jobs that already used every attempt as failed. Returns how many."""
+    return BackgroundJob.objects.filter(
+        status='running', started_at__lt=stale, attempts__gte=MAX_ATTEMPTS,
+    ).update(
+        status='failed',
+        error=f"Worker stopped responding; gave up after {MAX_ATTEMPTS} attempts.",
+        finished_at=timezone.now(),
+    )
+
+
+def claim_next():
+    """Atomically takes the oldest runnable job, or returns None."""
+    stale = timezone.now() - STALE_AFTER
+    # Otherwise they would stay 'running' forever and their status never settle
+    fail_exhausted(stale)
+    with transaction.atomic():
+        job = (
+            BackgroundJob.objects
+            .select_for_update(skip_locked=True)
+            .filter(
+                Q(status='queued') |
+                Q(status='running', started_at__lt=stale, attempts__lt=MAX_ATTEMPTS)
+            )
+            .order_by('id')
+            .first()
+        )
+        if job is None:
+            return None
+        BackgroundJob.objects.filter(pk=job.pk).update(
+            status='running', started_at=timezone.now(), attempts=F('attempts') + 1,
+        )
+    job.refresh_from_db()
+    return job
+
+
+def run_job(job):
+    handler = HANDLERS.get(job.kind)
+    try:
+        if handler is None:
+            raise ValueError(f"No handler registered for job kind '{job.kind}'")
+        result = handler(job.payload)
+    except Exception as e:
+        logger.error(f"Job {job.pk} ({job.kind}) failed: {e}")
+        job.status = 'failed'
+        job.error = traceback.format_exc()
+    else:
+        job.status = 'done'
+        job.result = result
+        job.error = ''
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'result', 'error', 'finished_at'])
+    return job
+
+
+def run_worker(poll_interval=1.0, max_jobs=None, stop_when_empty=False):
+    """Claims and runs jobs until stopped. Returns the number of jobs run."""
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    logger.info(f"Job worker {worker} started")
+    done = 0
+    while max_jobs is None or done < max_jobs:
+        job = claim_next()
+        if job is None:
+            if stop_when_empty:
+                break
+            time.sleep(poll_interval)
+            continue
+        run_job(job)
+        done += 1
+    return done
@@ -0,0 +1,104 @@
+import threading
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection
+
+from products.inventory import InsufficientStock, commit, reserve
+from products.models import Product
+
+
+class Command(BaseCommand):
+    help = (
+        'Hammers one hot SKU with concurrent single-unit checkouts and checks that '
+        'nothing is oversold. --naive runs the old read-modify-write save() for comparison.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stock', type=int, default=500)
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--attempts', type=int, default=1000, help='Checkouts attempted in total')
+        parser.add_argument('--naive', action='store_true')
+
+    def handle(self, *args, **options):
+        stock, threads, attempts = options['stock'], options['threads'], options['attempts']
+        seller = get_user_model().objects.create(username=f"bench-{uuid.uuid4().hex[:8]}")
+        product = Product.objects.create(
+            seller=seller, name='Bench hot SKU', price=1, stock_quantity=stock, status='approved',
+        )
+        checkout = self.naive_checkout if options['naive'] else self.reserved_checkout
+
+        counts = {'sold': 0, 'sold_out': 0, 'errors': 0}
+        latencies = []
+        lock = threading.Lock()
+        remaining = [attempts]
+
+        def worker():
+            try:
+                while True:
+                    with lock:
+                        if remaining[0] <= 0:
+                            return
+                        remaining[0] -= 1
+                    started = time.perf_counter()
+                    try:
+                        outcome = 'sold' if checkout(product.pk) else 'sold_out'
+                    except OperationalError:
+                        outcome = 'errors'  # e.g. SQLite "database is locked"
+                    elapsed = time.perf_counter() - started
+                    with lock:
+                        counts[outcome] += 1
+                        latencies.append(elapsed)
+            finally:
+                connection.close()
+
+        try:
+            started = time.perf_counter()
+            pool = [threading.Thread(target=worker) for _ in range(threads)]
+            for thread in pool:
+                thread.start()
+            for thread in pool:
+                thread.join()
+            wall = time.perf_counter() - started
+
+            product.refresh_from_db()
+            latencies.sort()
+            p50 = latencies[len(latencies) // 2] * 1000
+            p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+            self.stdout.write(
+                f"{'naive save()' if options['naive'] else 'reservations'}: {threads} threads, {attempts} attempts "
+                f"on {stock} units in {wall:.2f}s ({attempts / wall:.0f} checkouts/s, p50 {p50:.1f} ms, p99 {p99:.1f} ms)"
+            )
+            self.stdout.write(
+                f"sold {counts['sold']}, sold out {counts['sold_out']}, errors {counts['errors']}, "
+                f"stock left {product.stock_quantity}"
+            )
+
+            oversold = counts['sold'] - stock
+            if oversold > 0 or counts['sold'] + product.stock_quantity != stock:
+                self.stdout.write(self.style.ERROR(
+                    f"INCONSISTENT: {counts['sold']} sold + {product.stock_quantity} left != {stock} stocked"
+                ))
+            else:
+                self.stdout.write(self.style.SUCCESS("No oversell: units sold + units left == units stocked."))
+        finally:
+            product.delete()
+            seller.delete()
+
+    def reserved_checkout(self, product_id):
+        try:
+            reservation = reserve([(product_id, 1)], ttl=60)
+        except InsufficientStock:
+            return False
+        commit(reservation)
+        return True
+
+    def naive_checkout(self, product_id):
+        product = Product.objects.get(pk=product_id)
+        if product.stock_quantity < 1:
+            return False
+        product.stock_quantity -= 1
+        product.save(update_fields=['stock_quantity'])
+        return True
@@ -0,0 +1,70 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from products.utilty import (
+    analyze_content_risk, analyze_content_risk_batch, get_classifier, moderation_batcher, screen_content,
+)
+
+SAMPLE_TEXTS = [
+    "Great keyboard, the switches feel amazing.",
+    "This seller is a scammer, avoid at all costs!",
+    "Arrived late but works fine.",
+    "Message me outside the platform for a discount, pay by wire transfer.",
+    "Absolute garbage, I hope your warehouse burns down.",
+    "Decent value for the price, would buy again.",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares moderation throughput (items/sec) of the single-item and batched classifier paths, '
+        'and of concurrent requests with and without the micro-batcher.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=256)
+        parser.add_argument('--batch-size', type=int, nargs='+', default=[8, 32, 64])
+        parser.add_argument('--concurrency', type=int, default=16, help='Simulated concurrent requests')
+
+    def handle(self, *args, **options):
+        if get_classifier() is None:
+            self.stdout.write(self.style.WARNING("Classifier not loaded; timings reflect the random fallback."))
+
+        rng = random.Random(0)
+        base = [rng.choice(SAMPLE_TEXTS) * rng.randint(1, 4) for _ in range(options['items'])]
+        run_id = time.time_ns()
+
+        def texts_for(run):
+            # Unique per run so the verdict cache cannot answer for the classifier
+            return [f"{text} [{run_id}-{run}-{i}]" for i, text in enumerate(base)]
+
+        # Warm up so the first forward pass does not skew the single-item numbers
+        analyze_content_risk(texts_for('warmup')[0])
+
+        texts = texts_for('single')
+        started = time.perf_counter()
+        for text in texts:
+            analyze_content_risk(text)
+        single = len(texts) / (time.perf_counter() - started)
+        self.stdout.write(f"single-item:        {single:8.1f} items/s")
+
+        for batch_size in options['batch_size']:
+            texts = texts_for(f'batch{batch_size}')
+            started = time.perf_counter()
+            analyze_content_risk_batch(texts, batch_size=batch_size)
+            batched = len(texts) / (time.perf_counter() - started)
+            self.stdout.write(f"batch_size={batch_size:<4}      {batched:8.1f} items/s  ({batched / single:.1f}x)")
+
+        # Concurrent single-item requests, as threaded workers would issue them
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            for label, fn in (('concurrent inline:', analyze_content_risk), ('concurrent batched:', screen_content)):
+                texts = texts_for(label)
+                started = time.perf_counter()
+                list(pool.map(fn, texts))
+                rate = len(texts) / (time.perf_counter() - started)
+                self.stdout.write(f"{label:<20}{rate:8.1f} items/s  ({rate / single:.1f}x)")
+        batcher = moderation_batcher.stats()
+        self.stdout.write(f"micro-batcher: {batcher['batches']} batches, avg {batcher['avg_batch_size']} items")
@@ -0,0 +1,53 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from products.embeddings import EMBEDDING_DIM, VectorIndex, from_blobs, to_blob
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks the in-memory vector index on synthetic embeddings (no model or DB needed).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=100_000)
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('-k', type=int, default=10)
+        parser.add_argument('--loop-sample', type=int, default=5_000,
+                            help='Rows scored with a per-row Python loop for comparison.')
+
+    def handle(self, *args, **options):
+        n, k = options['products'], options['k']
+        rng = np.random.default_rng(0)
+
+        vectors = rng.standard_normal((n, EMBEDDING_DIM), dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        # Round-trip through the float16 storage format, as sync() does
+        vectors = from_blobs([to_blob(v) for v in vectors])
+
+        index = VectorIndex()
+        started = time.perf_counter()
+        index.upsert(list(range(1, n + 1)), vectors)
+        build_s = time.perf_counter() - started
+
+        queries = rng.standard_normal((options['queries'], EMBEDDING_DIM), dtype=np.float32)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+        latencies = []
+        for query in queries:
+            started = time.perf_counter()
+            index.search(query, k=k)
+            latencies.append(time.perf_counter() - started)
+        latencies = np.array(latencies) * 1000
+
+        sample = min(options['loop_sample'], n)
+        started = time.perf_counter()
+        scores = [float(sum(a * b for a, b in zip(row, queries[0]))) for row in vectors[:sample].tolist()]
+        sorted(range(sample), key=scores.__getitem__, reverse=True)[:k]
+        loop_ms = (time.perf_counter() - started) * 1000 * (n / sample)
+
+        self.stdout.write(f"products:            {n}")
+        self.stdout.write(f"stored size:         {n * EMBEDDING_DIM * 2 / 2**20:.1f} MiB (float16)")
+        self.stdout.write(f"index size:          {index.matrix.nbytes / 2**20:.1f} MiB (float32)")
+        self.stdout.write(f"index build:         {build_s * 1000:.1f} ms")
+        self.stdout.write(f"query p50 / p95:     {np.percentile(latencies, 50):.2f} / {np.percentile(latencies, 95):.2f} ms")
+        self.stdout.write(f"python loop (est.):  {loop_ms:.0f} ms per query")
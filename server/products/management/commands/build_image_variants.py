@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from products.images import build_image_variants, variants_current
+from products.jobs import enqueue_many
+from products.models import Product
+
+
+class Command(BaseCommand):
+    help = 'Builds resized image variants for products whose current upload has none (backfill).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--inline', action='store_true', help='Render here instead of queueing image_variants jobs')
+
+    def handle(self, *args, **options):
+        products = Product.objects.exclude(img='').exclude(img__isnull=True).only('id', 'img', 'img_variants')
+        pending = [product for product in products.iterator(chunk_size=2000) if not variants_current(product)]
+
+        if not options['inline']:
+            enqueue_many('image_variants', [{'product_id': p.pk, 'source': p.img.name} for p in pending])
+            self.stdout.write(self.style.SUCCESS(f"Queued {len(pending)} image_variants jobs."))
+            return
+
+        built = 0
+        for product in pending:
+            try:
+                if build_image_variants(product):
+                    built += 1
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"Product {product.pk}: {e}"))
+        self.stdout.write(self.style.SUCCESS(f"Built variants for {built} of {len(pending)} products."))
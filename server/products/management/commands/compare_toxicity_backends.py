@@ -0,0 +1,79 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from products.management.commands.bench_moderation import SAMPLE_TEXTS
+from products.model_registry import _rss_bytes, load_toxicity_classifier
+from products.models import ModerationItem
+from products.utilty import _decide, _risk_confidence
+
+
+class Command(BaseCommand):
+    help = (
+        'Checks that the int8 ONNX toxicity backend gives the same risk levels as PyTorch, '
+        'then compares load memory, single-item latency and batched throughput.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=256, help='Texts to score (moderation items first)')
+        parser.add_argument('--batch-size', type=int, default=32)
+        parser.add_argument(
+            '--tolerance', type=int, default=5,
+            help='Largest allowed per-text difference in risk confidence (0-100 points)',
+        )
+
+    def handle(self, *args, **options):
+        texts = list(
+            ModerationItem.objects.order_by('-id').values_list('content', flat=True)[:options['items']]
+        )
+        rng = random.Random(0)
+        while len(texts) < options['items']:
+            texts.append(rng.choice(SAMPLE_TEXTS) * rng.randint(1, 4))
+
+        # ONNX first: loading torch afterwards would otherwise hide the tokenizer's share of memory
+        results = {}
+        for backend in ('onnx', 'torch'):
+            rss_before = _rss_bytes()
+            started = time.perf_counter()
+            try:
+                classifier = load_toxicity_classifier(backend)
+            except Exception as e:
+                raise CommandError(f"Could not load the {backend} backend: {e}")
+            load_seconds = time.perf_counter() - started
+            rss_mb = (_rss_bytes() - rss_before) / 2**20
+
+            classifier(texts[0])  # warm-up
+            latencies = []
+            for text in texts[:64]:
+                started = time.perf_counter()
+                classifier(text)
+                latencies.append((time.perf_counter() - started) * 1000)
+            latencies.sort()
+
+            started = time.perf_counter()
+            outputs = classifier(texts, batch_size=options['batch_size'], truncation=True)
+            throughput = len(texts) / (time.perf_counter() - started)
+
+            results[backend] = [_risk_confidence(output) for output in outputs]
+            self.stdout.write(
+                f"{backend:<6} load {load_seconds:5.1f}s  +{rss_mb:5.0f} MB RSS  "
+                f"p50 {latencies[len(latencies) // 2]:6.1f} ms  p95 {latencies[int(len(latencies) * 0.95)]:6.1f} ms  "
+                f"{throughput:7.1f} items/s (batch {options['batch_size']})"
+            )
+
+        # Within the tolerance a risk level can only flip for a text sitting on a threshold
+        tolerance = options['tolerance']
+        pairs = list(zip(texts, results['torch'], results['onnx']))
+        drift = [abs(torch_conf - onnx_conf) for _, torch_conf, onnx_conf in pairs]
+        agree = sum(_decide(torch_conf)[0] == _decide(onnx_conf)[0] for _, torch_conf, onnx_conf in pairs)
+        self.stdout.write(
+            f"parity: {agree}/{len(pairs)} risk levels identical, "
+            f"confidence drift max {max(drift)} / mean {sum(drift) / len(drift):.2f} points"
+        )
+        outliers = [pair for pair, d in zip(pairs, drift) if d > tolerance]
+        for text, torch_conf, onnx_conf in outliers[:10]:
+            self.stdout.write(self.style.ERROR(f"  torch {torch_conf} vs onnx {onnx_conf}: {text[:80]!r}"))
+        if outliers:
+            raise CommandError(f"{len(outliers)} texts differ by more than {tolerance} confidence points.")
+        self.stdout.write(self.style.SUCCESS("ONNX backend matches PyTorch within tolerance."))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from products.embeddings import embed_products
+from products.models import Product
+
+
+class Command(BaseCommand):
+    help = 'Embeds every approved product whose text changed since it was last embedded.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=256)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        products = Product.objects.filter(status='approved').order_by('id')
+
+        encoded = seen = 0
+        batch = []
+        for product in products.iterator(chunk_size=batch_size):
+            batch.append(product)
+            if len(batch) >= batch_size:
+                encoded += embed_products(batch, batch_size=batch_size)
+                seen += len(batch)
+                batch = []
+        if batch:
+            encoded += embed_products(batch, batch_size=batch_size)
+            seen += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"Checked {seen} approved products, encoded {encoded}."))
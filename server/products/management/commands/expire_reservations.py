@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from products.inventory import expire_reservations
+
+BATCH = 1000
+
+
+class Command(BaseCommand):
+    help = 'Returns the stock of held reservations past their expiry. Run from cron, or with --loop.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep sweeping every --interval seconds')
+        parser.add_argument('--interval', type=float, default=60.0)
+
+    def handle(self, *args, **options):
+        while True:
+            expired = 0
+            while True:
+                batch = expire_reservations(limit=BATCH)
+                expired += batch
+                if batch < BATCH:
+                    break
+            if expired or not options['loop']:
+                self.stdout.write(f"Expired {expired} reservations.")
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
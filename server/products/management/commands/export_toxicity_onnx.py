@@ -0,0 +1,24 @@
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from products.model_registry import TOXICITY_MODEL
+from products.onnx_classifier import export_quantized
+
+
+class Command(BaseCommand):
+    help = (
+        'Exports the toxicity classifier to an int8-quantized ONNX graph for '
+        'MODERATION_BACKEND=onnx (needs torch, transformers and onnxruntime).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=settings.MODERATION_ONNX_DIR, help='Default: MODERATION_ONNX_DIR')
+        parser.add_argument('--opset', type=int, default=14)
+
+    def handle(self, *args, **options):
+        path = export_quantized(TOXICITY_MODEL, options['output'], opset=options['opset'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {path} ({os.path.getsize(path) / 2**20:.0f} MB). Set MODERATION_BACKEND=onnx to use it."
+        ))
@@ -0,0 +1,20 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from products.verdict_cache import flush_lookups
+
+
+class Command(BaseCommand):
+    help = 'Adds buffered verdict-cache hit/miss counts to the moderation stats. Run from cron, or with --loop.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep flushing every --interval seconds')
+        parser.add_argument('--interval', type=float, default=60.0)
+
+    def handle(self, *args, **options):
+        while True:
+            flush_lookups()
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
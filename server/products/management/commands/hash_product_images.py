@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from products.images import index_image_hash
+from products.models import Product
+
+
+class Command(BaseCommand):
+    help = 'Computes the perceptual hash of every product image that has none yet (backfill).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Re-hash every product image')
+
+    def handle(self, *args, **options):
+        products = Product.objects.exclude(img='').exclude(img__isnull=True).only('id', 'img')
+        if not options['all']:
+            products = products.filter(img_hash__isnull=True)
+
+        hashed = failed = 0
+        for product in products.iterator(chunk_size=2000):
+            try:
+                index_image_hash(product)
+                hashed += 1
+            except Exception as e:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f"Product {product.pk}: {e}"))
+        self.stdout.write(self.style.SUCCESS(f"Hashed {hashed} product images ({failed} failed)."))
@@ -0,0 +1,40 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from products.importer import CHUNK_SIZE, ImportFormatError, detect_format, import_products
+
+
+class Command(BaseCommand):
+    help = 'Imports products for a seller from a CSV or JSON Lines file. Products are created as pending.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--seller', required=True, help='Username of the owning seller')
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help='Default: from the file extension')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+        parser.add_argument('--report', help='Write the full JSON error report to this path')
+
+    def handle(self, *args, **options):
+        try:
+            seller = get_user_model().objects.get(username=options['seller'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"No user named '{options['seller']}'.")
+
+        try:
+            fmt = detect_format(options['path'], options['format'])
+            with open(options['path'], 'rb') as stream:
+                report = import_products(stream, fmt, seller, chunk_size=options['chunk_size'])
+        except (ImportFormatError, OSError) as e:
+            raise CommandError(str(e))
+
+        for error in report['errors'][:20]:
+            self.stdout.write(self.style.ERROR(f"Row {error['row']}: {json.dumps(error['errors'])}"))
+        if report['failed'] > 20:
+            self.stdout.write(f"... and {report['failed'] - 20} more failed rows.")
+        if options['report']:
+            with open(options['report'], 'w') as out:
+                json.dump(report, out, indent=2)
+
+        self.stdout.write(self.style.SUCCESS(f"Created {report['created']} products, {report['failed']} rows failed."))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from products.verdict_cache import cache_stats, purge_stale
+
+
+class Command(BaseCommand):
+    help = 'Reports moderation verdict cache hit/miss counters; --purge drops verdicts from other model versions.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--purge', action='store_true', help='Delete verdicts cached under an older model version')
+
+    def handle(self, *args, **options):
+        if options['purge']:
+            self.stdout.write(f"Purged {purge_stale()} stale verdicts.")
+
+        stats = cache_stats()
+        hit_rate = f"{stats['hit_rate']:.1%}" if stats['hit_rate'] is not None else 'n/a'
+        self.stdout.write(
+            f"{stats['model_version'] or 'classifier not loaded'}: {stats['entries']} verdicts ({stats['stale_entries']} stale), "
+            f"{stats['hits']} hits, {stats['misses']} misses (hit rate {hit_rate})"
+        )
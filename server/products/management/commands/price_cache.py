@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from products.price_cache import cache_stats, purge_expired
+
+
+class Command(BaseCommand):
+    help = 'Reports competitor price cache hit/miss counters; --purge drops entries past their stale window.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--purge', action='store_true', help='Delete entries too old to be served')
+
+    def handle(self, *args, **options):
+        if options['purge']:
+            self.stdout.write(f"Purged {purge_expired()} expired entries.")
+
+        stats = cache_stats()
+        hit_rate = f"{stats['hit_rate']:.1%}" if stats['hit_rate'] is not None else 'n/a'
+        self.stdout.write(
+            f"{stats['entries']} entries, {stats['hits']} hits, {stats['misses']} misses (hit rate {hit_rate})"
+        )
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from products.autoreply import BATCH_SIZE, process_auto_replies
+
+
+class Command(BaseCommand):
+    help = 'Posts the store auto-reply to new reviews in batches. Run from cron, or with --loop.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--loop', action='store_true', help='Keep draining every --interval seconds')
+        parser.add_argument('--interval', type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        while True:
+            processed, created = process_auto_replies(options['batch_size'])
+            if processed or not options['loop']:
+                self.stdout.write(f"Processed {processed} reviews, posted {created} auto-replies.")
+            if not options['loop']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from products.moderation import rebuild_moderation_stats
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the moderation dashboard counters from all moderation items.'
+
+    def handle(self, *args, **options):
+        totals = rebuild_moderation_stats()
+        self.stdout.write(self.style.SUCCESS(
+            "Rebuilt moderation stats: " + ", ".join(f"{name}={value}" for name, value in totals.items())
+        ))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from products.ratings import rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = 'Recomputes every product\'s rating average, count and star histogram from its reviews.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('product_ids', nargs='*', type=int, help='Default: all products')
+
+    def handle(self, *args, **options):
+        changed = rebuild_ratings(options['product_ids'] or None)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt ratings; {changed} products were out of date."))
@@ -0,0 +1,23 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from products.jobs import run_worker
+
+
+class Command(BaseCommand):
+    help = 'Runs queued background jobs (product analysis, ...). Start as many as you need.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=1.0, help='Seconds to sleep when the queue is empty.')
+        parser.add_argument('--max-jobs', type=int, default=None, help='Exit after running this many jobs.')
+        parser.add_argument('--once', action='store_true', help='Drain the queue, then exit.')
+
+    def handle(self, *args, **options):
+        logging.basicConfig(level=logging.INFO)
+        done = run_worker(
+            poll_interval=options['interval'],
+            max_jobs=options['max_jobs'],
+            stop_when_empty=options['once'],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Ran {done} job(s)."))
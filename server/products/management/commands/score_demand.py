@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from products.demand import score_catalog
+
+
+class Command(BaseCommand):
+    help = 'Recomputes demand_score, demand_trend and market_avg for every approved product. Run nightly from cron.'
+
+    def handle(self, *args, **options):
+        result = score_catalog()
+        timings = result['timings']
+        self.stdout.write(self.style.SUCCESS(
+            f"Scored {result['scored']} products, updated {result['changed']} "
+            f"(load {timings['load']:.2f}s, score {timings['score']:.2f}s, write {timings['write']:.2f}s)."
+        ))
@@ -5,6 +5,7 @@ from django.contrib.auth import get_user_model
 
 # IMPORTANT: Change 'your_app_name' to the actual name of your Django app
 from products.models import Product, ModerationItem, StoreSettings, ProductReview
+from products.moderation import create_items
 
 User = get_user_model()
 
@@ -90,29 +91,29 @@ class Command(BaseCommand):
             }
         )
 
-        # 5. Create Moderation Items (Flagged Content)
-        ModerationItem.objects.get_or_create(
-            content_type="Product Review",
-            content="This product is absolute garbage and the seller is a scammer! Avoid at all costs!",
-            defaults={
-                "reported_by": "AI System",
-                "risk_level": "High",
-                "ml_confidence": 95,
-                "recommended_action": "Remove Content",
-                "is_resolved": False
-            }
-        )
-
-        ModerationItem.objects.get_or_create(
-            content_type="Seller Comment",
-            content="Hey, we offer a 10% discount if you message us outside the platform and pay via wire transfer.",
-            defaults={
-                "reported_by": "User Report",
-                "risk_level": "Medium",
-                "ml_confidence": 78,
-                "recommended_action": "Manual Review",
-                "is_resolved": False
-            }
+        # 5. Create Moderation Items (Flagged Content), counted on the dashboard like any other
+        seed_items = [
+            ModerationItem(
+                content_type="Product Review",
+                content="This product is absolute garbage and the seller is a scammer! Avoid at all costs!",
+                reported_by="AI System",
+                risk_level="High",
+                ml_confidence=95,
+                recommended_action="Remove Content",
+            ),
+            ModerationItem(
+                content_type="Seller Comment",
+                content="Hey, we offer a 10% discount if you message us outside the platform and pay via wire transfer.",
+                reported_by="User Report",
+                risk_level="Medium",
+                ml_confidence=78,
+                recommended_action="Manual Review",
+            ),
+        ]
+        existing = set(
+            ModerationItem.objects.filter(content__in=[item.content for item in seed_items])
+            .values_list('content_type', 'content')
         )
+        create_items([item for item in seed_items if (item.content_type, item.content) not in existing])
 
         self.stdout.write(self.style.SUCCESS("Database seeded successfully with Products, Reviews, and Moderation Items!"))
\ No newline at end of file
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from products.model_registry import registry
+
+
+class Command(BaseCommand):
+    help = (
+        'Loads ML models (downloading weights on first run) and reports load time '
+        'and resident memory per model.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('models', nargs='*', help=f"Default: all ({', '.join(registry.names())})")
+
+    def handle(self, *args, **options):
+        names = options['models'] or registry.names()
+        unknown = [name for name in names if name not in registry.names()]
+        if unknown:
+            raise CommandError(f"Unknown model(s): {', '.join(unknown)}")
+
+        results = registry.warm(names)
+        stats = registry.stats()
+        for name in names:
+            info = stats[name]
+            if results[name] is None:
+                self.stdout.write(
+                    f"{name:<22} loaded in {info['load_seconds']:.2f}s, +{info['rss_delta_mb']:.0f} MB RSS"
+                )
+            else:
+                self.stdout.write(self.style.ERROR(f"{name:<22} failed: {results[name]}"))
+
+        if any(error is not None for error in results.values()):
+            raise CommandError("Some models failed to load.")
+        self.stdout.write(self.style.SUCCESS("All models warm."))
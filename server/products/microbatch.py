@@ -0,0 +1,110 @@
+# microbatch.py
+"""
+Dynamic micro-batching for per-request model calls.
+
+Concurrent requests each hand their input to a MicroBatcher and wait on a
+future. One background thread per process takes the first waiting input,
+keeps collecting for at most ``max_wait`` seconds or until ``max_items``
+are queued, runs the batch function once, and resolves every caller's
+future with its own result. While a batch runs, new arrivals queue up and
+form the next batch, so batches grow with load and a lone request waits no
+more than ``max_wait``.
+
+Threaded WSGI workers block on the future (``batcher(item)``); async code
+awaits it without blocking the event loop (``await batcher.acall(item)``).
+"""
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+
+    def __init__(self, fn, max_items=32, max_wait=0.005, name='microbatch'):
+        """``fn`` takes a list of inputs and returns a list of results in the same order."""
+        self.fn = fn
+        self.max_items = max_items
+        self.max_wait = max_wait
+        self.name = name
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+
+    def submit(self, item):
+        """Queues ``item`` and returns a Future for its result."""
+        future = Future()
+        self._ensure_worker().put((item, future))
+        return future
+
+    def __call__(self, item, timeout=None):
+        return self.submit(item).result(timeout)
+
+    async def acall(self, item):
+        return await asyncio.wrap_future(self.submit(item))
+
+    def stats(self):
+        return {
+            'batches': self._batches,
+            'items': self._items,
+            'avg_batch_size': round(self._items / self._batches, 2) if self._batches else None,
+        }
+
+    def _alive(self):
+        # A forked worker process inherits the object but not the thread
+        return self._pid == os.getpid() and self._thread is not None and self._thread.is_alive()
+
+    def _ensure_worker(self):
+        if self._alive():
+            return self._queue
+        with self._lock:
+            if not self._alive():
+                if self._pid != os.getpid():
+                    self._queue = queue.SimpleQueue()
+                    self._pid = os.getpid()
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._queue,), name=f'{self.name}-batcher', daemon=True,
+                )
+                self._thread.start()
+            return self._queue
+
+    def _run(self, pending):
+        while True:
+            batch = [pending.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_items:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(pending.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._process(batch)
+
+    def _process(self, batch):
+        # Callers that gave up (cancelled futures) are dropped before the model sees them
+        batch = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        try:
+            results = self.fn([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"{self.name}: got {len(results)} results for {len(batch)} inputs")
+        except Exception as e:
+            logger.exception("%s batch of %d failed", self.name, len(batch))
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        self._batches += 1
+        self._items += len(batch)
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
@@ -0,0 +1,89 @@
+from django.db import migrations
+
+# Self-contained copy of the DDL in products.search (migrations must not import
+# app code). SearchIndexMigrationTests fails if the two drift apart: a change
+# to the live index needs a new migration, not an edit here.
+FTS_CONFIG = 'english'
+
+
+def _names(apps, connection):
+    qn = connection.ops.quote_name
+    table = apps.get_model('products', 'Product')._meta.db_table
+    return {
+        'table': qn(table),
+        'fts': qn(f'{table}_fts'),
+        'index': qn('product_search_vector_idx'),
+        'trigger_prefix': f'{table}_fts',
+    }
+
+
+def install(apps, schema_editor):
+    connection = schema_editor.connection
+    n = _names(apps, connection)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f"""
+                ALTER TABLE {n['table']} ADD COLUMN IF NOT EXISTS search_vector tsvector
+                GENERATED ALWAYS AS (
+                    setweight(to_tsvector('{FTS_CONFIG}', coalesce(name, '')), 'A') ||
+                    setweight(to_tsvector('{FTS_CONFIG}', coalesce(description, '')), 'B')
+                ) STORED
+            """)
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {n['index']} ON {n['table']} USING gin (search_vector)"
+            )
+
+        elif connection.vendor == 'sqlite':
+            cursor.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {n['fts']} USING fts5(
+                    name, description,
+                    content={n['table']}, content_rowid='id',
+                    tokenize='porter unicode61'
+                )
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {n['trigger_prefix']}_ai AFTER INSERT ON {n['table']} BEGIN
+                    INSERT INTO {n['fts']}(rowid, name, description)
+                    VALUES (new.id, new.name, new.description);
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {n['trigger_prefix']}_ad AFTER DELETE ON {n['table']} BEGIN
+                    INSERT INTO {n['fts']}({n['fts']}, rowid, name, description)
+                    VALUES ('delete', old.id, old.name, old.description);
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {n['trigger_prefix']}_au AFTER UPDATE OF name, description ON {n['table']} BEGIN
+                    INSERT INTO {n['fts']}({n['fts']}, rowid, name, description)
+                    VALUES ('delete', old.id, old.name, old.description);
+                    INSERT INTO {n['fts']}(rowid, name, description)
+                    VALUES (new.id, new.name, new.description);
+                END
+            """)
+            # Index the rows that existed before the triggers
+            cursor.execute(f"INSERT INTO {n['fts']}({n['fts']}) VALUES ('rebuild')")
+
+
+def uninstall(apps, schema_editor):
+    connection = schema_editor.connection
+    n = _names(apps, connection)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f"DROP INDEX IF EXISTS {n['index']}")
+            cursor.execute(f"ALTER TABLE {n['table']} DROP COLUMN IF EXISTS search_vector")
+        elif connection.vendor == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {n['trigger_prefix']}_{suffix}")
+            cursor.execute(f"DROP TABLE IF EXISTS {n['fts']}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0006_product_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductEmbedding',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='embedding', serialize=False, to='products.product')),
+                ('vector', models.BinaryField()),
+                ('text_hash', models.CharField(max_length=64)),
+                ('model_name', models.CharField(max_length=100)),
+                ('updated_at', models.DateTimeField(auto_now=True, db_index=True)),
+            ],
+        ),
+    ]
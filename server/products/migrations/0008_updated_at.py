@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0007_productembedding'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='productreview',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0009_backgroundjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompetitorPriceCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('query', models.CharField(max_length=255, unique=True)),
+                ('competitors', models.JSONField(default=list)),
+                ('fetched_at', models.DateTimeField()),
+                ('hits', models.PositiveIntegerField(default=0)),
+                ('misses', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0010_competitorpricecache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='img_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0011_product_img_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='img_hash',
+            field=models.BigIntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='img_hash_b0',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='img_hash_b1',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='img_hash_b2',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='img_hash_b3',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='vision_result',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
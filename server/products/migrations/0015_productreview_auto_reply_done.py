@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def mark_existing_reviews(apps, schema_editor):
+    # Auto-replies are for reviews posted from now on; replying to the whole
+    # history on the processor's first run would surface stale answers.
+    ProductReview = apps.get_model('products', 'ProductReview')
+    ProductReview.objects.filter(reply_to__isnull=True).update(auto_reply_done=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0014_product_ratings'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='productreview',
+            name='auto_reply_done',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(mark_existing_reviews, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='productreview',
+            index=models.Index(condition=models.Q(('auto_reply_done', False), ('reply_to__isnull', True)), fields=['id'], name='review_auto_reply_queue_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:36
+
+from django.db import migrations, models
+
+
+def backfill_stats(apps, schema_editor):
+    # Inlined from products.moderation as of this migration, so later changes there
+    # cannot alter what this backfill computes
+    from django.db.models import Count, Q
+
+    ModerationItem = apps.get_model('products', 'ModerationItem')
+    ModerationStats = apps.get_model('products', 'ModerationStats')
+    predictions = {'Approve': 'approve', 'Remove Content': 'remove'}
+    confirms = Q()
+    overrides = Q()
+    for recommendation, expected in predictions.items():
+        confirms |= Q(recommended_action=recommendation, resolution=expected)
+        overrides |= Q(recommended_action=recommendation) & ~Q(resolution=expected) & ~Q(resolution='')
+    totals = ModerationItem.objects.aggregate(
+        total_items=Count('id'),
+        pending=Count('id', filter=Q(is_resolved=False)),
+        high_risk_pending=Count('id', filter=Q(is_resolved=False, risk_level='High')),
+        auto_approved=Count('id', filter=Q(recommended_action='Approve')),
+        confirmed=Count('id', filter=Q(is_resolved=True) & confirms),
+        overridden=Count('id', filter=Q(is_resolved=True) & overrides),
+    )
+    ModerationStats.objects.update_or_create(pk=1, defaults=totals)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0015_productreview_auto_reply_done'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModerationStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_items', models.IntegerField(default=0)),
+                ('pending', models.IntegerField(default=0)),
+                ('high_risk_pending', models.IntegerField(default=0)),
+                ('auto_approved', models.IntegerField(default=0)),
+                ('confirmed', models.IntegerField(default=0)),
+                ('overridden', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='moderationitem',
+            name='resolution',
+            field=models.CharField(blank=True, choices=[('approve', 'Approve'), ('remove', 'Remove')], max_length=10),
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
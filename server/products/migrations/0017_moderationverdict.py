@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0016_moderationstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='moderationstats',
+            name='verdict_cache_hits',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='moderationstats',
+            name='verdict_cache_misses',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='ModerationVerdict',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text_hash', models.CharField(max_length=64)),
+                ('model_version', models.CharField(max_length=100)),
+                ('risk_level', models.CharField(max_length=10)),
+                ('confidence', models.IntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('text_hash', 'model_version'), name='unique_verdict_per_model')],
+            },
+        ),
+    ]
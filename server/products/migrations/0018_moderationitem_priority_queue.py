@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0017_moderationverdict'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='moderationitem',
+            name='claimed_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='moderationitem',
+            name='claimed_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='moderationitem',
+            name='risk_rank',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(risk_level='High', then=3), models.When(risk_level='Medium', then=2), models.When(risk_level='Low', then=1), default=0), output_field=models.SmallIntegerField()),
+        ),
+        migrations.AddIndex(
+            model_name='moderationitem',
+            index=models.Index(condition=models.Q(('is_resolved', False)), fields=['-risk_rank', '-ml_confidence', 'created_at', 'id'], include=('claimed_until',), name='moderation_priority_idx'),
+        ),
+    ]
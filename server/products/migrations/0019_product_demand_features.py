@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0018_moderationitem_priority_queue'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='demand_trend',
+            field=models.CharField(blank=True, max_length=10),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='market_avg',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
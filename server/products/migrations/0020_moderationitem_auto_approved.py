@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+def reset_auto_approved_count(apps, schema_editor):
+    # The counter used to hold items the model recommended approving; none of
+    # them was actually auto-approved, so the real count starts at zero.
+    ModerationStats = apps.get_model('products', 'ModerationStats')
+    ModerationStats.objects.update(auto_approved=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0019_product_demand_features'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='moderationitem',
+            name='auto_approved',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(reset_auto_approved_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,112 @@
+# mixins.py
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Max
+from django.views.decorators.csrf import csrf_exempt
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified support for APIView GETs.
+
+    Validators come from ``max(updated_at)`` and the row count of the querysets
+    behind a response, so checking freshness costs one aggregate query instead
+    of serializing and hashing the body. Count catches deletes, max(updated_at)
+    catches inserts and edits.
+    """
+
+    def queryset_validators(self, request, *querysets, per_user=True):
+        counts, last_modified = [], None
+        for queryset in querysets:
+            stats = queryset.aggregate(last_modified=Max('updated_at'), count=Count('pk'))
+            counts.append(stats['count'])
+            if stats['last_modified'] and (last_modified is None or stats['last_modified'] > last_modified):
+                last_modified = stats['last_modified']
+        return self.make_validators(request, counts, last_modified, per_user=per_user)
+
+    def make_validators(self, request, counts, last_modified, per_user=True):
+        # Same rows can render differently per URL (cursor, page size) and per user
+        user_id = getattr(request.user, 'pk', None) if per_user else None
+        stamp = last_modified.isoformat() if last_modified else ''
+        raw = f"{request.get_full_path()}|{user_id}|{counts}|{stamp}"
+        etag = 'W/' + quote_etag(hashlib.md5(raw.encode('utf-8')).hexdigest())
+        return etag, last_modified
+
+    def is_not_modified(self, request, etag, last_modified):
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            # If-None-Match wins over If-Modified-Since; weak comparison ignores W/
+            etags = {tag.removeprefix('W/') for tag in parse_etags(if_none_match)}
+            return '*' in etags or etag.removeprefix('W/') in etags
+
+        if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+        if if_modified_since is not None and last_modified is not None:
+            return int(last_modified.timestamp()) <= if_modified_since
+        return False
+
+    def conditional_response(self, request, etag, last_modified, build_response):
+        """
+        Returns 304 when the client's copy is current, otherwise calls
+        ``build_response()``. Either way the validators are attached.
+        """
+        if self.is_not_modified(request, etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = build_response()
+
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        # Let clients keep a copy but always revalidate it
+        patch_cache_control(response, no_cache=True)
+        return response
+
+
+class AsyncPostMixin:
+    """
+    Serves POST through ``async def apost(request)`` on an APIView.
+
+    DRF dispatches synchronously, and under ASGI Django runs every sync view
+    on one shared thread, so a handler that waits on something slow (a model
+    batch) holds up every other request. Here POST gets a coroutine: DRF's
+    request setup, authentication and permission checks run through
+    sync_to_async, and ``apost`` awaits its slow part without holding the
+    sync thread, doing its own ORM work with sync_to_async. Other methods
+    keep the normal sync dispatch. Under WSGI the coroutine runs in the
+    request thread, so the same code serves both.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        sync_view = super().as_view(**initkwargs)
+
+        async def view(request, *args, **kwargs):
+            if request.method != 'POST':
+                return await sync_to_async(sync_view)(request, *args, **kwargs)
+            self = cls(**initkwargs)
+            self.setup(request, *args, **kwargs)
+            return await self.dispatch_post(request, *args, **kwargs)
+
+        view.cls = cls
+        view.initkwargs = initkwargs
+        return csrf_exempt(view)
+
+    async def dispatch_post(self, request, *args, **kwargs):
+        # Mirrors APIView.dispatch for a single async handler
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            response = await self.apost(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
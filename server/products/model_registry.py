@@ -0,0 +1,203 @@
+# model_registry.py
+"""
+Process-wide registry for the ML models used across apps.
+
+Models load lazily on first use (never at import time), exactly once per
+process even under concurrent requests, and the registry records how long
+each load took and how much resident memory it added.
+"""
+import hashlib
+import os
+import resource
+import sys
+import threading
+import time
+
+from django.conf import settings
+
+
+def _rss_bytes():
+    """Current resident set size of this process."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        # Peak RSS is the best we get off Linux (bytes on macOS, KiB elsewhere)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class ModelRegistry:
+
+    def __init__(self):
+        self._loaders = {}
+        self._versions = {}
+        self._models = {}
+        self._errors = {}
+        self._stats = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, loader, version=None):
+        """
+        ``version`` identifies the weights the loader produces (defaults to
+        ``name``). It may be a callable taking the loaded model, resolved once
+        right after the load, when only the loaded weights can say what they are.
+        """
+        with self._lock:
+            self._loaders[name] = loader
+            self._versions[name] = version or name
+            self._locks.setdefault(name, threading.Lock())
+
+    def names(self):
+        return list(self._loaders)
+
+    def version(self, name):
+        """
+        Identifies the weights ``name`` serves, for keying cached outputs.
+        Versions pinned at load time load the model first (and raise if it fails).
+        """
+        if callable(self._versions[name]):
+            self.get(name)
+        return self._versions[name]
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def get(self, name):
+        """
+        Returns the shared instance, loading it on first call. A failed load
+        is remembered and re-raised rather than retried on every request.
+        """
+        if name in self._models:
+            return self._models[name]
+        if name not in self._loaders:
+            raise KeyError(f"Unknown model '{name}'")
+
+        with self._locks[name]:
+            if name in self._models:
+                return self._models[name]
+            if name in self._errors:
+                raise self._errors[name]
+
+            rss_before = _rss_bytes()
+            started = time.perf_counter()
+            try:
+                model = self._loaders[name]()
+                if callable(self._versions[name]):
+                    self._versions[name] = self._versions[name](model)
+            except Exception as e:
+                self._errors[name] = e
+                print(f"Warning: ML model '{name}' not loaded. Using fallback logic. Error: {e}")
+                raise
+            self._stats[name] = {
+                'load_seconds': round(time.perf_counter() - started, 3),
+                'rss_delta_mb': round((_rss_bytes() - rss_before) / 2**20, 1),
+            }
+            self._models[name] = model
+            return model
+
+    def get_or_none(self, name):
+        try:
+            return self.get(name)
+        except Exception:
+            return None
+
+    def warm(self, names=None):
+        """Loads the given (default: all) models; returns {name: error or None}."""
+        results = {}
+        for name in names or self.names():
+            try:
+                self.get(name)
+                results[name] = None
+            except Exception as e:
+                results[name] = e
+        return results
+
+    def stats(self):
+        report = {}
+        for name in self.names():
+            if name in self._models:
+                report[name] = {'status': 'loaded', **self._stats[name]}
+            elif name in self._errors:
+                report[name] = {'status': 'failed', 'error': str(self._errors[name])}
+            else:
+                report[name] = {'status': 'not_loaded'}
+        return report
+
+    def ready(self):
+        return all(name in self._models for name in self.names())
+
+
+# --- Model loaders (heavy imports stay inside so importing this module is cheap) ---
+
+TOXICITY_MODEL = "unitary/toxic-bert"
+
+
+TOXICITY_BACKENDS = ('torch', 'onnx')
+
+
+def load_toxicity_classifier(backend):
+    """Builds the classifier for ``backend`` ('torch' or 'onnx'); both are called the same way."""
+    if backend == 'onnx':
+        from .onnx_classifier import OnnxToxicityClassifier
+        return OnnxToxicityClassifier(settings.MODERATION_ONNX_DIR)
+    if backend != 'torch':
+        raise ValueError(f"Unknown toxicity backend '{backend}'; expected one of {TOXICITY_BACKENDS}")
+    from transformers import pipeline
+    # 'text-classification' with top_k=None returns every toxicity label's score
+    return pipeline(
+        "text-classification", model=TOXICITY_MODEL, revision=settings.MODERATION_MODEL_REVISION, top_k=None,
+    )
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    except OSError:
+        return 'missing'
+    return digest.hexdigest()[:12]
+
+
+def toxicity_version(backend, classifier):
+    """
+    Names the exact weights ``classifier`` was loaded with: the commit sha the
+    configured Hugging Face revision resolved to for torch (so a branch such as
+    'main' moving on changes the key), a hash of the exported graph for onnx
+    (re-exporting changes it). Quantized scores drift slightly, so each
+    backend keeps its own cached verdicts.
+    """
+    if backend == 'torch':
+        config = getattr(getattr(classifier, 'model', None), 'config', None)
+        commit = getattr(config, '_commit_hash', None) or settings.MODERATION_MODEL_REVISION
+        return f"{TOXICITY_MODEL}@{commit}"
+    from .onnx_classifier import MODEL_FILE
+    return f"{TOXICITY_MODEL}:{backend}-int8@{_file_digest(os.path.join(settings.MODERATION_ONNX_DIR, MODEL_FILE))}"
+
+
+def _load_toxicity_classifier():
+    return load_toxicity_classifier(settings.MODERATION_BACKEND)
+
+
+def _load_sentence_encoder():
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer('all-MiniLM-L6-v2')
+
+
+registry = ModelRegistry()
+registry.register(
+    'toxicity-classifier', _load_toxicity_classifier,
+    version=lambda classifier: toxicity_version(settings.MODERATION_BACKEND, classifier),
+)
+registry.register('sentence-encoder', _load_sentence_encoder, version='all-MiniLM-L6-v2')
+
+
+def get_model(name):
+    return registry.get(name)
+
+
+def warm_models(names=None):
+    return registry.warm(names)
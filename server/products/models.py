@@ -2,6 +2,8 @@ from django.db import models
 from django.conf import settings
 from django.utils import timezone
 
+from .settings_cache import CachedSetting
+
 
 REVIEW_STATUS_CHOICES = [
     ('pending', 'Pending'),
@@ -23,16 +25,69 @@ class Product(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2)
     stock_quantity = models.IntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     img = models.ImageField(upload_to="products/", blank=True, null=True)
+    # Resized WebP/JPEG copies of img, built in the background (see products/images.py)
+    img_variants = models.JSONField(default=dict, blank=True)
+    # 64-bit dHash of img (signed), split into four 16-bit bands for near-duplicate lookup
+    img_hash = models.BigIntegerField(null=True, blank=True, db_index=True)
+    img_hash_b0 = models.IntegerField(null=True, blank=True, db_index=True)
+    img_hash_b1 = models.IntegerField(null=True, blank=True, db_index=True)
+    img_hash_b2 = models.IntegerField(null=True, blank=True, db_index=True)
+    img_hash_b3 = models.IntegerField(null=True, blank=True, db_index=True)
+    # Last Cloud Vision result for img, reused by near-duplicate uploads
+    vision_result = models.JSONField(null=True, blank=True)
 
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     internal_interest = models.IntegerField(default=0) # Percentage (0-100)
     external_interest = models.CharField(max_length=100, default="Analyzing...")
     demand_score = models.IntegerField(default=0)
+    # Set by the catalog-wide demand scorer (products/demand.py)
+    market_avg = models.FloatField(null=True, blank=True)
+    demand_trend = models.CharField(max_length=10, blank=True)
+
+    # Approved top-level review aggregates, kept current by products/ratings.py
+    rating_avg = models.FloatField(default=0)
+    rating_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    rating_1 = models.IntegerField(default=0)
+    rating_2 = models.IntegerField(default=0)
+    rating_3 = models.IntegerField(default=0)
+    rating_4 = models.IntegerField(default=0)
+    rating_5 = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Keyset pagination walks (created_at, id) inside each listing filter
+            models.Index(fields=['status', '-created_at', '-id'], name='product_status_created_idx'),
+            models.Index(fields=['seller', '-created_at', '-id'], name='product_seller_created_idx'),
+            models.Index(fields=['-created_at', '-id'], name='product_created_idx'),
+            # Catalog sorted by rating
+            models.Index(fields=['status', '-rating_avg', '-rating_count', '-id'], name='product_status_rating_idx'),
+        ]
 
     def __str__(self):
         return self.name + self.status
 
+class ProductEmbedding(models.Model):
+    """
+    Sentence embedding of a product's name + description, stored as a
+    L2-normalised float16 blob (768 bytes for a 384-d model).
+    """
+    product = models.OneToOneField(Product, related_name='embedding', on_delete=models.CASCADE, primary_key=True)
+    vector = models.BinaryField()
+    text_hash = models.CharField(max_length=64)  # sha256 of the embedded text, skips re-encoding
+    model_name = models.CharField(max_length=100)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    def __str__(self):
+        return f"Embedding: {self.product_id}"
+
+RESOLUTION_CHOICES = [
+    ('approve', 'Approve'),
+    ('remove', 'Remove'),
+]
+
 class ModerationItem(models.Model):
     RISK_CHOICES = [
         ('High', 'High'),
@@ -56,11 +111,92 @@ class ModerationItem(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
     is_resolved = models.BooleanField(default=False)
+    # The admin's decision when resolving: 'approve' or 'remove' (blank if not given)
+    resolution = models.CharField(max_length=10, choices=RESOLUTION_CHOICES, blank=True)
+    # Approved on creation on the classifier's recommendation, never seen by a moderator
+    auto_approved = models.BooleanField(default=False)
+
+    # Sortable risk for the priority queue: High 3, Medium 2, Low 1, unscored 0.
+    # Computed by the database, so bulk_create and update() keep it in step too.
+    risk_rank = models.GeneratedField(
+        expression=models.Case(
+            models.When(risk_level='High', then=3),
+            models.When(risk_level='Medium', then=2),
+            models.When(risk_level='Low', then=1),
+            default=0,
+        ),
+        output_field=models.SmallIntegerField(),
+        db_persist=True,
+    )
+    # A moderator's hold on the item from the priority queue; lapses at claimed_until
+    claimed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL, related_name='+',
+    )
+    claimed_until = models.DateTimeField(null=True, blank=True)
+
+    # Priority queue order: riskiest first, then most confident, then oldest
+    PRIORITY_ORDERING = ('-risk_rank', '-ml_confidence', 'created_at', 'id')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_resolved', '-created_at', '-id'], name='moderation_queue_idx'),
+            # Only open items, in queue order; the claim column rides along (PostgreSQL
+            # INCLUDE) so skipping claimed rows needs no heap lookup
+            models.Index(
+                fields=['-risk_rank', '-ml_confidence', 'created_at', 'id'],
+                include=['claimed_until'],
+                condition=models.Q(is_resolved=False),
+                name='moderation_priority_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.content_type} - {self.risk_level} Risk"
+
+
+class ModerationStats(models.Model):
+    """
+    Single-row running totals for the moderation dashboard, moved with F()
+    updates as items are created and resolved (see products/moderation.py).
+    """
+    total_items = models.IntegerField(default=0)
+    pending = models.IntegerField(default=0)
+    high_risk_pending = models.IntegerField(default=0)
+    auto_approved = models.IntegerField(default=0)
+    # Resolved items with a definite recommendation, by whether the admin agreed
+    confirmed = models.IntegerField(default=0)
+    overridden = models.IntegerField(default=0)
+    # Classifier verdict cache lookups (ModerationVerdict)
+    verdict_cache_hits = models.IntegerField(default=0)
+    verdict_cache_misses = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def load(cls):
+        obj, _ = cls.objects.get_or_create(pk=1)
+        return obj
     
 
+class ModerationVerdict(models.Model):
+    """
+    Toxicity classifier result for one normalized text under one model
+    version, so repeated copies of the same content skip inference.
+    """
+    text_hash = models.CharField(max_length=64)  # sha256 of the normalized text
+    model_version = models.CharField(max_length=100)
+    risk_level = models.CharField(max_length=10)
+    confidence = models.IntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['text_hash', 'model_version'], name='unique_verdict_per_model'),
+        ]
+
+    def __str__(self):
+        return f"{self.text_hash[:12]} @ {self.model_version}: {self.risk_level}"
+
+
 class StoreSettings(models.Model):
     auto_reply_enabled =models.BooleanField(default=False)   
 
@@ -72,7 +208,14 @@ class StoreSettings(models.Model):
     def load(cls):
         obj, _ = cls.objects.get_or_create(pk=1)
         return obj
+
+    @classmethod
+    def current(cls):
+        """Cached, read-only copy for hot paths; use load() to change settings."""
+        return store_settings_cache.get()
                       
+store_settings_cache = CachedSetting('store', lambda: StoreSettings.load())
+
 class ProductReview(models.Model):
     product = models.ForeignKey(Product, related_name='reviews', on_delete=models.CASCADE)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -81,7 +224,104 @@ class ProductReview(models.Model):
     likes = models.IntegerField(default=0)
     reply_to = models.ForeignKey('self', null=True, blank=True, related_name='replies', on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     status = models.CharField(max_length=20, choices=REVIEW_STATUS_CHOICES, default='pending')
+    # Set once the auto-reply processor has looked at this review (products/autoreply.py)
+    auto_reply_done = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            # Only the small backlog of unprocessed top-level reviews is indexed
+            models.Index(
+                fields=['id'],
+                condition=models.Q(auto_reply_done=False, reply_to__isnull=True),
+                name='review_auto_reply_queue_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.product.name} - {self.rating} Stars"
+
+
+JOB_STATUS_CHOICES = [
+    ('queued', 'Queued'),
+    ('running', 'Running'),
+    ('done', 'Done'),
+    ('failed', 'Failed'),
+]
+
+class BackgroundJob(models.Model):
+    """
+    A unit of work for the DB-backed job queue (see products/jobs.py),
+    executed by `manage.py run_jobs` outside the web workers.
+    """
+    kind = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=JOB_STATUS_CHOICES, default='queued')
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    attempts = models.IntegerField(default=0)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'id'], name='job_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+
+class CompetitorPriceCache(models.Model):
+    """
+    Competitor prices from Custom Search, keyed by the normalized query so
+    products sharing a detected label share one lookup (see products/price_cache.py).
+    """
+    query = models.CharField(max_length=255, unique=True)
+    competitors = models.JSONField(default=list)
+    fetched_at = models.DateTimeField()
+    hits = models.PositiveIntegerField(default=0)
+    misses = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return self.query
+
+
+RESERVATION_STATUS_CHOICES = [
+    ('held', 'Held'),
+    ('committed', 'Committed'),
+    ('released', 'Released'),
+    ('expired', 'Expired'),
+]
+
+class StockReservation(models.Model):
+    """
+    Stock set aside for a checkout (see products/inventory.py). Held units are
+    already subtracted from Product.stock_quantity; releasing or expiring the
+    reservation gives them back, committing keeps them sold.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
+    status = models.CharField(max_length=10, choices=RESERVATION_STATUS_CHOICES, default='held')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'expires_at'], name='reservation_expiry_idx'),
+        ]
+
+    def __str__(self):
+        return f"Reservation #{self.pk} ({self.status})"
+
+
+class StockReservationLine(models.Model):
+    reservation = models.ForeignKey(StockReservation, related_name='lines', on_delete=models.CASCADE)
+    product = models.ForeignKey(Product, related_name='reservation_lines', on_delete=models.CASCADE)
+    quantity = models.PositiveIntegerField()
 
     def __str__(self):
-        return f"{self.product.name} - {self.rating} Stars"
\ No newline at end of file
+        return f"{self.quantity} x {self.product_id}"
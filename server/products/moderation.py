@@ -0,0 +1,169 @@
+# moderation.py
+"""
+Materialized moderation counters.
+
+The dashboard reads one ModerationStats row instead of counting
+ModerationItem. Items are only created through create_items() and resolved
+through resolve_item(), which move the counters in the same transaction
+with F() updates. `manage.py rebuild_moderation_stats` recomputes them from
+the items after writes that bypassed these helpers.
+
+With MODERATION_AUTO_APPROVE on, create_items() resolves items the model
+recommends approving straight away; those are what 'auto_approved' counts.
+
+Accuracy compares the model's recommendation with the admin's decision on
+resolved items: 'Approve' should be approved and 'Remove Content' removed.
+'Manual Review' makes no prediction and is left out, and so are
+auto-approved items, which no admin decided.
+
+The priority queue serves open items riskiest-first. Moderators claim the
+next N with SELECT ... FOR UPDATE SKIP LOCKED: rows another moderator is
+claiming at that moment are skipped rather than waited on, so parallel
+claims never block each other or hand out the same item. A claim lapses
+after MODERATION_CLAIM_TTL seconds so abandoned work returns to the queue.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import ModerationItem, ModerationStats
+
+# Recommendation -> the resolution that confirms it
+PREDICTIONS = {
+    'Approve': 'approve',
+    'Remove Content': 'remove',
+}
+
+
+def _bump(**deltas):
+    deltas = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    if not ModerationStats.objects.filter(pk=1).update(**deltas):
+        # No row yet: build it from the items, which already include this change
+        rebuild_moderation_stats()
+
+
+def create_items(items):
+    """
+    Saves new (unsaved) items, auto-approving those the model recommends
+    approving, and counts them. Returns the created items.
+    """
+    items = list(items)
+    for item in items:
+        if settings.MODERATION_AUTO_APPROVE and item.recommended_action == 'Approve' and not item.is_resolved:
+            item.is_resolved, item.resolution, item.auto_approved = True, 'approve', True
+    with transaction.atomic():
+        created = ModerationItem.objects.bulk_create(items)
+        _record_created(created)
+    return created
+
+
+def _record_created(items):
+    """Counts newly created items; create_items() calls it for you."""
+    items = list(items)
+    open_items = [item for item in items if not item.is_resolved]
+    _bump(
+        total_items=len(items),
+        pending=len(open_items),
+        high_risk_pending=sum(item.risk_level == 'High' for item in open_items),
+        auto_approved=sum(item.auto_approved for item in items),
+    )
+
+
+def resolve_item(item, resolution=''):
+    """
+    Resolves an open item and updates the counters. Returns False if it was
+    already resolved (counters are not touched twice).
+    """
+    with transaction.atomic():
+        if not ModerationItem.objects.filter(pk=item.pk, is_resolved=False).update(
+            is_resolved=True, resolution=resolution, claimed_by=None, claimed_until=None,
+        ):
+            return False
+        item.is_resolved, item.resolution = True, resolution
+
+        expected = PREDICTIONS.get(item.recommended_action)
+        _bump(
+            pending=-1,
+            high_risk_pending=-(item.risk_level == 'High'),
+            confirmed=int(bool(resolution and expected) and resolution == expected),
+            overridden=int(bool(resolution and expected) and resolution != expected),
+        )
+    return True
+
+
+def moderation_totals():
+    """Counter values computed from scratch."""
+    confirms = Q()
+    overrides = Q()
+    for recommendation, expected in PREDICTIONS.items():
+        confirms |= Q(recommended_action=recommendation, resolution=expected)
+        overrides |= Q(recommended_action=recommendation) & ~Q(resolution=expected) & ~Q(resolution='')
+    decided = Q(is_resolved=True, auto_approved=False)
+    totals = ModerationItem.objects.aggregate(
+        total_items=Count('id'),
+        pending=Count('id', filter=Q(is_resolved=False)),
+        high_risk_pending=Count('id', filter=Q(is_resolved=False, risk_level='High')),
+        # Aliased: an aggregate may not share the auto_approved field's name
+        auto_approved_items=Count('id', filter=Q(auto_approved=True)),
+        confirmed=Count('id', filter=decided & confirms),
+        overridden=Count('id', filter=decided & overrides),
+    )
+    totals['auto_approved'] = totals.pop('auto_approved_items')
+    return totals
+
+
+def rebuild_moderation_stats():
+    with transaction.atomic():
+        totals = moderation_totals()
+        ModerationStats.objects.update_or_create(pk=1, defaults=totals)
+    return totals
+
+
+def accuracy(stats):
+    """Share of decided recommendations the admins agreed with, or None before any."""
+    decided = stats.confirmed + stats.overridden
+    return stats.confirmed / decided if decided else None
+
+
+def priority_queue(user=None):
+    """
+    Open items in priority order. With ``user``, items another moderator
+    holds an active claim on are left out.
+    """
+    items = ModerationItem.objects.filter(is_resolved=False)
+    if user is not None:
+        items = items.filter(
+            Q(claimed_until__isnull=True) | Q(claimed_until__lte=timezone.now()) | Q(claimed_by=user)
+        )
+    return items.order_by(*ModerationItem.PRIORITY_ORDERING)
+
+
+def claim_next(user, count, ttl=None):
+    """Claims up to ``count`` of the highest-priority unclaimed items for ``user``."""
+    ttl = settings.MODERATION_CLAIM_TTL if ttl is None else ttl
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            ModerationItem.objects.filter(is_resolved=False)
+            .filter(Q(claimed_until__isnull=True) | Q(claimed_until__lte=now))
+            .order_by(*ModerationItem.PRIORITY_ORDERING)
+            .select_for_update(skip_locked=True)
+            .values_list('pk', flat=True)[:count]
+        )
+        ModerationItem.objects.filter(pk__in=ids).update(
+            claimed_by=user, claimed_until=now + timedelta(seconds=ttl),
+        )
+    return list(ModerationItem.objects.filter(pk__in=ids).order_by(*ModerationItem.PRIORITY_ORDERING))
+
+
+def release_claims(user, ids=None):
+    """Returns ``user``'s claimed items (all, or just ``ids``) to the queue."""
+    claimed = ModerationItem.objects.filter(claimed_by=user, is_resolved=False)
+    if ids is not None:
+        claimed = claimed.filter(pk__in=ids)
+    return claimed.update(claimed_by=None, claimed_until=None)
@@ -0,0 +1,109 @@
+# onnx_classifier.py
+"""
+int8 ONNX Runtime backend for the toxicity classifier.
+
+`manage.py export_toxicity_onnx` traces toxic-bert to ONNX once, applies
+dynamic int8 quantization to its weights (activations are quantized on the
+fly, so no calibration data is needed) and saves the graph next to the
+tokenizer and config. With MODERATION_BACKEND=onnx the model registry loads
+OnnxToxicityClassifier from that directory instead of the PyTorch pipeline:
+no torch import, a fraction of the memory, and faster CPU inference.
+
+`manage.py compare_toxicity_backends` checks that both backends give the
+same risk levels and reports latency, throughput and memory for each.
+"""
+import json
+import os
+
+import numpy as np
+
+MODEL_FILE = 'model-int8.onnx'
+
+
+def export_quantized(model_name, output_dir, opset=14):
+    """Exports ``model_name`` to ``output_dir`` as an int8 ONNX graph plus tokenizer and config."""
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+
+    sample = tokenizer(["Sample text for tracing."], return_tensors='pt')
+    fp32_path = os.path.join(output_dir, 'model-fp32.onnx')
+    dynamic = {0: 'batch', 1: 'sequence'}
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample['input_ids'], sample['attention_mask']),
+            fp32_path,
+            input_names=['input_ids', 'attention_mask'],
+            output_names=['logits'],
+            dynamic_axes={'input_ids': dynamic, 'attention_mask': dynamic, 'logits': {0: 'batch'}},
+            opset_version=opset,
+        )
+    try:
+        quantize_dynamic(fp32_path, os.path.join(output_dir, MODEL_FILE), weight_type=QuantType.QInt8)
+    finally:
+        os.remove(fp32_path)
+
+    tokenizer.save_pretrained(output_dir)
+    model.config.save_pretrained(output_dir)
+    return os.path.join(output_dir, MODEL_FILE)
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def _softmax(x):
+    e = np.exp(x - x.max(axis=-1, keepdims=True))
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+class OnnxToxicityClassifier:
+    """
+    Drop-in for ``pipeline("text-classification", top_k=None)``: called with
+    one text or a list, it returns one list of ``{'label', 'score'}`` dicts
+    per text, highest score first.
+    """
+
+    def __init__(self, model_dir, threads=0):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        path = os.path.join(model_dir, MODEL_FILE)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} not found; run 'manage.py export_toxicity_onnx' first.")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = threads  # 0: one per physical core
+        self.session = ort.InferenceSession(path, options, providers=['CPUExecutionProvider'])
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+
+        with open(os.path.join(model_dir, 'config.json')) as f:
+            config = json.load(f)
+        id2label = config['id2label']
+        self.labels = [id2label[str(i)] for i in range(len(id2label))]
+        # toxic-bert is multi-label: each label gets an independent sigmoid, as in the pipeline
+        multi_label = config.get('problem_type') == 'multi_label_classification' or len(self.labels) == 1
+        self._activation = _sigmoid if multi_label else _softmax
+
+    def __call__(self, texts, batch_size=32, truncation=True):
+        if isinstance(texts, str):
+            texts = [texts]
+        outputs = []
+        for start in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(
+                texts[start:start + batch_size], padding=True, truncation=truncation, return_tensors='np',
+            )
+            logits = self.session.run(['logits'], {
+                'input_ids': encoded['input_ids'].astype(np.int64),
+                'attention_mask': encoded['attention_mask'].astype(np.int64),
+            })[0]
+            for scores in self._activation(logits):
+                ranked = sorted(zip(self.labels, scores.tolist()), key=lambda pair: pair[1], reverse=True)
+                outputs.append([{'label': label, 'score': score} for label, score in ranked])
+        return outputs
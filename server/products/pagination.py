@@ -0,0 +1,160 @@
+# pagination.py
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor (keyset) pagination over a stable, unique ordering.
+
+    Instead of OFFSET, every page is fetched with a WHERE clause that starts
+    right after the last row of the previous page, so page 1000 costs the same
+    as page 1. The cursor is an opaque base64 token holding the ordering values
+    of the boundary row.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = api_settings.PAGE_SIZE or 50
+    max_page_size = 200
+
+    # The last field must be unique (the primary key) so the ordering is total.
+    ordering = ('-created_at', '-id')
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = tuple(ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+
+        position, reverse = self.decode_cursor(request, queryset.model)
+        fields = [self._field_name(f) for f in self.ordering]
+        ordering = [self._flip(f) for f in self.ordering] if reverse else list(self.ordering)
+
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._after(ordering, position))
+
+        # Fetch one extra row to know whether another page exists.
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+
+        self.next_position = self.previous_position = None
+        if results:
+            first = [getattr(results[0], f) for f in fields]
+            last = [getattr(results[-1], f) for f in fields]
+            if reverse:
+                # We walked backwards, so rows after this page always exist.
+                self.next_position = last
+                self.previous_position = first if has_more else None
+            else:
+                self.next_position = last if has_more else None
+                self.previous_position = first if position is not None else None
+
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self._link(self.next_position, reverse=False)
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return self._link(self.previous_position, reverse=True)
+
+    # --- cursor encoding ---
+
+    def encode_cursor(self, position, reverse):
+        payload = {'p': [None if v is None else str(v) for v in position]}
+        if reverse:
+            payload['r'] = 1
+        raw = json.dumps(payload, separators=(',', ':')).encode()
+        return urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            raw = urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4))
+            payload = json.loads(raw)
+            values = payload['p']
+            if len(values) != len(self.ordering):
+                raise ValueError
+            position = [
+                model._meta.get_field(self._field_name(f)).to_python(v)
+                for f, v in zip(self.ordering, values)
+            ]
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound('Invalid cursor')
+        return position, bool(payload.get('r'))
+
+    def _link(self, position, reverse):
+        url = remove_query_param(self.base_url, self.cursor_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(position, reverse))
+
+    # --- keyset filter ---
+
+    @staticmethod
+    def _field_name(field):
+        return field.lstrip('-')
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith('-') else '-' + field
+
+    def _after(self, ordering, position):
+        """
+        Builds the lexicographic "row comes after position" condition:
+        (a > x) OR (a = x AND b > y) OR ..., honouring each field's direction.
+        """
+        condition = Q()
+        for i, field in enumerate(ordering):
+            name = self._field_name(field)
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            term = Q(**{f'{name}__{lookup}': position[i]})
+            for prev_field, value in zip(ordering[:i], position[:i]):
+                term &= Q(**{self._field_name(prev_field): value})
+            condition |= term
+        return condition
@@ -0,0 +1,136 @@
+# price_cache.py
+"""
+Persistent cache for competitor price lookups.
+
+Entries are keyed by the normalized search query, so a burst of analyses over
+products with the same detected label makes one outbound search:
+
+- fresh (younger than MARKET_PRICE_CACHE_TTL): served as-is.
+- stale (within MARKET_PRICE_CACHE_STALE after that): served as-is while one
+  background refresh runs.
+- older or missing: fetched inline. Concurrent callers for the same query in
+  a process wait for the first one instead of fetching too. Waiting uses a
+  fixed array of striped locks, so memory stays flat however many distinct
+  queries a process sees; unrelated queries rarely share a stripe.
+
+Only real search results are stored; a failed lookup is never cached.
+"""
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from .models import CompetitorPriceCache
+
+logger = logging.getLogger(__name__)
+
+_NON_WORD_RE = re.compile(r'[^\w]+', re.UNICODE)
+
+LOCK_STRIPES = 64
+
+_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+_locks_guard = threading.Lock()
+_refreshing = set()
+_refresh_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='price-refresh')
+
+
+def normalize_query(query):
+    """'  Apple iPhone-15, Pro ' -> 'apple iphone 15 pro'"""
+    return ' '.join(_NON_WORD_RE.sub(' ', query or '').lower().split())[:255]
+
+
+def _lock_for(key):
+    return _locks[hash(key) % LOCK_STRIPES]
+
+
+def _store(key, competitors):
+    now = timezone.now()
+    updated = CompetitorPriceCache.objects.filter(query=key).update(
+        competitors=competitors, fetched_at=now, misses=F('misses') + 1,
+    )
+    if not updated:
+        CompetitorPriceCache.objects.update_or_create(
+            query=key, defaults={'competitors': competitors, 'fetched_at': now, 'misses': 1},
+        )
+
+
+def _refresh(key, fetch):
+    try:
+        _store(key, fetch(key))
+    except Exception as e:
+        # Keep serving the stale prices; the next caller past the window refetches
+        logger.warning(f"Background price refresh for '{key}' failed: {e}")
+    finally:
+        with _locks_guard:
+            _refreshing.discard(key)
+        close_old_connections()
+
+
+def _schedule_refresh(key, fetch):
+    with _locks_guard:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+    _refresh_executor.submit(_refresh, key, fetch)
+
+
+def _lookup(key):
+    entry = CompetitorPriceCache.objects.filter(query=key).only('competitors', 'fetched_at').first()
+    if entry is None:
+        return None, None
+    age = timezone.now() - entry.fetched_at
+    return entry, age
+
+
+def cached_prices(query, fetch):
+    """
+    Returns competitor prices for ``query``. ``fetch(normalized_query)`` does
+    the real lookup and must raise when it has no genuine results.
+    """
+    key = normalize_query(query)
+    ttl = timedelta(seconds=settings.MARKET_PRICE_CACHE_TTL)
+    stale_window = ttl + timedelta(seconds=settings.MARKET_PRICE_CACHE_STALE)
+
+    entry, age = _lookup(key)
+    if entry is not None and age < stale_window:
+        CompetitorPriceCache.objects.filter(pk=entry.pk).update(hits=F('hits') + 1)
+        if age >= ttl:
+            _schedule_refresh(key, fetch)
+        return entry.competitors
+
+    with _lock_for(key):
+        # Another thread may have fetched while we waited
+        entry, age = _lookup(key)
+        if entry is not None and age < ttl:
+            CompetitorPriceCache.objects.filter(pk=entry.pk).update(hits=F('hits') + 1)
+            return entry.competitors
+
+        competitors = fetch(key)
+        _store(key, competitors)
+        return competitors
+
+
+def cache_stats():
+    totals = CompetitorPriceCache.objects.aggregate(hits=Sum('hits'), misses=Sum('misses'))
+    hits, misses = totals['hits'] or 0, totals['misses'] or 0
+    lookups = hits + misses
+    return {
+        'entries': CompetitorPriceCache.objects.count(),
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / lookups, 3) if lookups else None,
+    }
+
+
+def purge_expired():
+    cutoff = timezone.now() - timedelta(
+        seconds=settings.MARKET_PRICE_CACHE_TTL + settings.MARKET_PRICE_CACHE_STALE
+    )
+    deleted, _ = CompetitorPriceCache.objects.filter(fetched_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,111 @@
+# ratings.py
+"""
+Denormalized review aggregates on Product.
+
+Only approved, top-level reviews (not seller replies) with a 1-5 star rating
+count. Saving or deleting a review applies a delta to its product in one
+UPDATE of F() expressions, so concurrent reviews never lose each other's
+counts and no request aggregates over ProductReview. Writes that bypass
+save() (queryset.update, bulk_create) are repaired by
+`manage.py rebuild_ratings`.
+
+A single review rarely changes what the catalog shows, so the catalog cache
+version is bumped only when the product's displayed rating (the average to
+one decimal) changes; counts in cached pages may lag by up to
+CATALOG_CACHE_TIMEOUT.
+"""
+from django.db.models import Count, F, FloatField, Q, Sum, Value
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.utils import timezone
+
+from .cache import bump_catalog_version_on_commit
+from .models import Product, ProductReview
+
+STARS = range(1, 6)
+DISPLAY_DECIMALS = 1
+
+
+def displayed_rating(rating_sum, rating_count):
+    return round(rating_sum / rating_count, DISPLAY_DECIMALS) if rating_count else 0.0
+
+
+def counted_rating(status, rating, reply_to_id):
+    """The star value a review contributes to its product, or None."""
+    if status == 'approved' and reply_to_id is None and rating in STARS:
+        return rating
+    return None
+
+
+def review_state(review):
+    return review.product_id, counted_rating(review.status, review.rating, review.reply_to_id)
+
+
+def apply_rating_change(product_id, removed=None, added=None):
+    """Moves one review's contribution: ``removed`` / ``added`` are star values or None."""
+    if removed == added:
+        return
+    count_delta = (added is not None) - (removed is not None)
+    sum_delta = (added or 0) - (removed or 0)
+
+    changes = {
+        'rating_count': F('rating_count') + count_delta,
+        'rating_sum': F('rating_sum') + sum_delta,
+        # SET expressions read the pre-update row, so apply the deltas here too
+        'rating_avg': Coalesce(
+            Cast(F('rating_sum') + sum_delta, FloatField()) / NullIf(F('rating_count') + count_delta, 0),
+            Value(0.0),
+        ),
+        'updated_at': timezone.now(),
+    }
+    if removed is not None:
+        changes[f'rating_{removed}'] = F(f'rating_{removed}') - 1
+    if added is not None:
+        changes[f'rating_{added}'] = F(f'rating_{added}') + 1
+    Product.objects.filter(pk=product_id).update(**changes)
+    after = Product.objects.filter(pk=product_id).values_list('rating_sum', 'rating_count').first()
+    if after is not None:
+        rating_sum, rating_count = after
+        if displayed_rating(rating_sum - sum_delta, rating_count - count_delta) != displayed_rating(rating_sum, rating_count):
+            bump_catalog_version_on_commit()
+
+
+def track_review_change(old_state, new_state):
+    """Applies the difference between a review's previous and current ``review_state``."""
+    if old_state == new_state:
+        return
+    old_product, old_rating = old_state
+    new_product, new_rating = new_state
+    if old_product == new_product:
+        apply_rating_change(new_product, removed=old_rating, added=new_rating)
+        return
+    if old_product is not None:
+        apply_rating_change(old_product, removed=old_rating)
+    apply_rating_change(new_product, added=new_rating)
+
+
+def rebuild_ratings(product_ids=None):
+    """Recomputes the aggregates from ProductReview. Returns the number of products updated."""
+    counted = ProductReview.objects.filter(status='approved', reply_to__isnull=True, rating__in=STARS)
+    if product_ids is not None:
+        counted = counted.filter(product_id__in=product_ids)
+    aggregates = {
+        'rating_count': Count('id'),
+        'rating_sum': Sum('rating'),
+        **{f'rating_{star}': Count('id', filter=Q(rating=star)) for star in STARS},
+    }
+    stats = {row.pop('product_id'): row for row in counted.values('product_id').annotate(**aggregates)}
+
+    products = Product.objects.all() if product_ids is None else Product.objects.filter(pk__in=product_ids)
+    fields = ['rating_count', 'rating_sum', 'rating_avg', *(f'rating_{star}' for star in STARS)]
+    changed = []
+    for product in products.only('id', *fields).iterator(chunk_size=2000):
+        row = stats.get(product.pk) or {field: 0 for field in aggregates}
+        row['rating_avg'] = row['rating_sum'] / row['rating_count'] if row['rating_count'] else 0.0
+        if any(getattr(product, field) != row[field] for field in fields):
+            for field in fields:
+                setattr(product, field, row[field])
+            changed.append(product)
+    Product.objects.bulk_update(changed, fields, batch_size=1000)
+    if changed:
+        bump_catalog_version_on_commit()
+    return len(changed)
@@ -0,0 +1,169 @@
+# search.py
+"""
+Full-text catalog search.
+
+The text index lives in the database so every write path (save, approve,
+reject, queryset.update, bulk_create) keeps it current without app code:
+
+- PostgreSQL: a generated ``search_vector`` tsvector column with a GIN index.
+- SQLite: an external-content FTS5 table kept in sync by triggers.
+
+Other backends fall back to a plain ``icontains`` scan.
+"""
+import re
+
+from django.db import connection as default_connection
+from django.db.models import Q
+
+from .models import Product
+
+FTS_CONFIG = 'english'
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _names(connection):
+    qn = connection.ops.quote_name
+    table = Product._meta.db_table
+    return {
+        'table': qn(table),
+        'fts': qn(f'{table}_fts'),
+        'index': qn('product_search_vector_idx'),
+        'trigger_prefix': f'{table}_fts',
+    }
+
+
+def install_search_index(connection=default_connection):
+    """
+    Creates the text index for the current backend. Safe to run repeatedly:
+    SQLite drops triggers whenever a migration rebuilds the product table, so
+    this also runs after every migrate.
+    """
+    n = _names(connection)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f"""
+                ALTER TABLE {n['table']} ADD COLUMN IF NOT EXISTS search_vector tsvector
+                GENERATED ALWAYS AS (
+                    setweight(to_tsvector('{FTS_CONFIG}', coalesce(name, '')), 'A') ||
+                    setweight(to_tsvector('{FTS_CONFIG}', coalesce(description, '')), 'B')
+                ) STORED
+            """)
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {n['index']} ON {n['table']} USING gin (search_vector)"
+            )
+
+        elif connection.vendor == 'sqlite':
+            cursor.execute(
+                "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE %s",
+                [n['trigger_prefix'] + '_%'],
+            )
+            triggers_present = cursor.fetchone()[0] == 3
+
+            cursor.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {n['fts']} USING fts5(
+                    name, description,
+                    content={n['table']}, content_rowid='id',
+                    tokenize='porter unicode61'
+                )
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {n['trigger_prefix']}_ai AFTER INSERT ON {n['table']} BEGIN
+                    INSERT INTO {n['fts']}(rowid, name, description)
+                    VALUES (new.id, new.name, new.description);
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {n['trigger_prefix']}_ad AFTER DELETE ON {n['table']} BEGIN
+                    INSERT INTO {n['fts']}({n['fts']}, rowid, name, description)
+                    VALUES ('delete', old.id, old.name, old.description);
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {n['trigger_prefix']}_au AFTER UPDATE OF name, description ON {n['table']} BEGIN
+                    INSERT INTO {n['fts']}({n['fts']}, rowid, name, description)
+                    VALUES ('delete', old.id, old.name, old.description);
+                    INSERT INTO {n['fts']}(rowid, name, description)
+                    VALUES (new.id, new.name, new.description);
+                END
+            """)
+            if not triggers_present:
+                # Rows written while the triggers were missing are not indexed yet
+                cursor.execute(f"INSERT INTO {n['fts']}({n['fts']}) VALUES ('rebuild')")
+
+
+def uninstall_search_index(connection=default_connection):
+    n = _names(connection)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f"DROP INDEX IF EXISTS {n['index']}")
+            cursor.execute(f"ALTER TABLE {n['table']} DROP COLUMN IF EXISTS search_vector")
+        elif connection.vendor == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {n['trigger_prefix']}_{suffix}")
+            cursor.execute(f"DROP TABLE IF EXISTS {n['fts']}")
+
+
+def _fts5_query(text):
+    """Turns free text into a safe FTS5 expression: every word must match, as a prefix."""
+    tokens = _TOKEN_RE.findall(text)
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+def search_products(text, limit, offset=0, connection=default_connection):
+    """
+    Returns ``[(product_id, rank), ...]`` for approved products matching
+    ``text``, best match first.
+    """
+    text = (text or '').strip()
+    if not text:
+        return []
+
+    n = _names(connection)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f"""
+                SELECT p.id, ts_rank_cd(p.search_vector, q) AS rank
+                FROM {n['table']} p, websearch_to_tsquery('{FTS_CONFIG}', %s) q
+                WHERE p.search_vector @@ q AND p.status = 'approved'
+                ORDER BY rank DESC, p.id DESC
+                LIMIT %s OFFSET %s
+            """, [text, limit, offset])
+            return [(row[0], float(row[1])) for row in cursor.fetchall()]
+
+        if connection.vendor == 'sqlite':
+            expression = _fts5_query(text)
+            if not expression:
+                return []
+            # bm25() is lower-is-better; name matches weigh more than description
+            cursor.execute(f"""
+                SELECT p.id, -bm25({n['fts']}, 10.0, 1.0) AS rank
+                FROM {n['fts']} f
+                JOIN {n['table']} p ON p.id = f.rowid
+                WHERE {n['fts']} MATCH %s AND p.status = 'approved'
+                ORDER BY rank DESC, p.id DESC
+                LIMIT %s OFFSET %s
+            """, [expression, limit, offset])
+            return [(row[0], float(row[1])) for row in cursor.fetchall()]
+
+    ids = (
+        Product.objects.filter(status='approved')
+        .filter(Q(name__icontains=text) | Q(description__icontains=text))
+        .order_by('-id')
+        .values_list('id', flat=True)[offset:offset + limit]
+    )
+    return [(pk, 0.0) for pk in ids]
+
+
+def repair_search_index(sender, using='default', **kwargs):
+    """
+    post_migrate hook: re-creates SQLite triggers that a table rebuild dropped.
+    Only acts once the search migration has created the FTS table.
+    """
+    from django.db import connections
+
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return
+    if f'{Product._meta.db_table}_fts' in connection.introspection.table_names():
+        install_search_index(connection)
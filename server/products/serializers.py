@@ -1,28 +1,76 @@
 # serializers.py
 from rest_framework import serializers
-from .models import Product,ModerationItem, ProductReview
+from .models import Product,ModerationItem, ProductReview, BackgroundJob, StockReservation, StockReservationLine
 from django.utils.timesince import timesince
+from .images import variant_urls
 
 class ProductSerializer(serializers.ModelSerializer):
     seller_name = serializers.ReadOnlyField(source='seller.username')
     seller_id = serializers.ReadOnlyField(source='seller.id')
     category = serializers.CharField(source='get_category_display', read_only=True)
+    img_variants = serializers.SerializerMethodField()
+    rating_histogram = serializers.SerializerMethodField()
 
     class Meta:
         model = Product
         fields = [
             'id', 'name', 'description', 'price', 'stock_quantity', 
             'status', 'internal_interest', 'external_interest', 
-            'demand_score', 'seller_name', 'created_at', 'img','seller_id',"category", 
+            'demand_score', 'seller_name', 'created_at', 'img', 'img_variants', 'seller_id',"category", 
+            'rating_avg', 'rating_count', 'rating_histogram', 'market_avg', 'demand_trend',
             
         ]   
+        read_only_fields = ['rating_avg', 'rating_count', 'market_avg', 'demand_trend']
 
+    def get_img_variants(self, obj):
+        return variant_urls(obj)
+
+    def get_rating_histogram(self, obj):
+        return {star: getattr(obj, f'rating_{star}') for star in range(1, 6)}
+
+
+
+class ProductIdsSerializer(serializers.Serializer):
+    """``{"ids": [...]}`` for bulk admin endpoints; numeric strings are coerced to ints."""
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False)
+
+    def __init__(self, *args, max_ids=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if max_ids is not None:
+            self.fields['ids'] = serializers.ListField(
+                child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=max_ids,
+            )
+
+
+class BackgroundJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = BackgroundJob
+        fields = ['id', 'kind', 'payload', 'status', 'result', 'error', 'attempts', 'created_at', 'started_at', 'finished_at']
+        read_only_fields = fields
+
+
+class StockReservationLineSerializer(serializers.ModelSerializer):
+    product_name = serializers.ReadOnlyField(source='product.name')
+
+    class Meta:
+        model = StockReservationLine
+        fields = ['product', 'product_name', 'quantity']
+
+
+class StockReservationSerializer(serializers.ModelSerializer):
+    lines = StockReservationLineSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = StockReservation
+        fields = ['id', 'status', 'created_at', 'expires_at', 'lines']
+        read_only_fields = fields
 
 
 class ModerationItemSerializer(serializers.ModelSerializer):
     class Meta:
         model = ModerationItem
         fields = '__all__'
+        read_only_fields = ['risk_rank', 'claimed_by', 'claimed_until', 'auto_approved']
 
 
 class ProductReviewSerializer(serializers.ModelSerializer):
@@ -38,26 +86,30 @@ class ProductReviewSerializer(serializers.ModelSerializer):
         model = ProductReview
         fields = ['id', 'customer', 'product', 'rating', 'content', 'date', 'sentiment', 'status', 'seller_reply']
 
-        def get_customer(self, obj):
-            return obj.user.username
-        
-        def get_product(self, obj):
-            return obj.product.name
-        
-        def get_date(self, obj):
-            return f"{timesince(obj.created_at)} ago"
-        
-        def get_sentiment(self, obj):
-            if obj.rating >= 4:
-                return "positive"
-            elif obj.rating <= 2:
-                return "negative"
-            else:
-                return "neutral"
-        def get_status(self, obj):
-            return obj.status
-        
-        def get_seller_reply(self, obj):
-            reply = obj.replies.first()
-            return reply.comment if reply else None
+    def get_customer(self, obj):
+        return obj.user.username
+    
+    def get_product(self, obj):
+        return obj.product.name
+    
+    def get_date(self, obj):
+        return f"{timesince(obj.created_at)} ago"
+    
+    def get_sentiment(self, obj):
+        if obj.rating >= 4:
+            return "positive"
+        elif obj.rating <= 2:
+            return "negative"
+        else:
+            return "neutral"
+    def get_status(self, obj):
+        return obj.status
+    
+    def get_seller_reply(self, obj):
+        # Feeds prefetch replies into seller_replies; fall back to a query for single reviews
+        replies = getattr(obj, 'seller_replies', None)
+        if replies is not None:
+            return replies[0].comment if replies else None
+        reply = obj.replies.filter(user_id=obj.product.seller_id).order_by('id').first()
+        return reply.comment if reply else None
         
\ No newline at end of file
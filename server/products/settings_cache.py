@@ -0,0 +1,63 @@
+# settings_cache.py
+"""
+Process-local cache for rarely changing settings rows.
+
+Each cached setting keeps its loaded value in process memory together with
+the version stamp it was loaded under. The current stamp lives in the shared
+cache backend; a write anywhere bumps it (after commit), and every process
+reloads on its next read. Reading therefore costs one cache-backend get and
+no database query.
+
+With a per-process cache backend (the locmem default) other workers cannot
+see the bump, so entries are also reloaded after SETTINGS_CACHE_TTL seconds
+at most.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+class CachedSetting:
+
+    def __init__(self, name, loader):
+        self.name = name
+        self.loader = loader
+        self.version_key = f'settings:version:{name}'
+        self._entry = None  # (version, loaded_at, value)
+        self._lock = threading.Lock()
+
+    def version(self):
+        version = cache.get(self.version_key)
+        if version is None:
+            # Seed from the clock so an evicted stamp never matches an old entry
+            cache.add(self.version_key, int(time.time() * 1000), timeout=None)
+            version = cache.get(self.version_key)
+        return version
+
+    def get(self):
+        version = self.version()
+        entry = self._entry
+        if entry is not None and entry[0] == version and time.monotonic() - entry[1] < settings.SETTINGS_CACHE_TTL:
+            return entry[2]
+        with self._lock:
+            entry = self._entry
+            if entry is not None and entry[0] == version and time.monotonic() - entry[1] < settings.SETTINGS_CACHE_TTL:
+                return entry[2]
+            value = self.loader()
+            self._entry = (version, time.monotonic(), value)
+            return value
+
+    def invalidate(self):
+        self._entry = None
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            # Stamp was evicted: a fresh seed is already newer than any loaded entry
+            self.version()
+
+    def invalidate_on_commit(self):
+        # Invalidating before commit would let another worker reload the old row
+        transaction.on_commit(self.invalidate)
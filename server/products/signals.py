@@ -1,28 +1,60 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_init, post_save, post_delete
 from django.dispatch import receiver
-from .models import ProductReview, StoreSettings
+from .models import Product, ProductReview, StoreSettings, store_settings_cache
+from .embeddings import (
+    embedding_state, index as embedding_index, needs_embedding_refresh, schedule_embedding_refresh,
+)
+from .cache import bump_catalog_version_on_commit
+from .ratings import review_state, track_review_change
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_catalog_cache(sender, instance, **kwargs):
+    # Covers create/edit/delete as well as admin approve and reject, which save()
+    bump_catalog_version_on_commit()
+
+
+@receiver(post_init, sender=Product)
+def remember_embedding_state(sender, instance, **kwargs):
+    instance._embedding_state = embedding_state(instance)
+
+
+@receiver(post_save, sender=Product)
+def update_product_embedding(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    # Stock, demand and rating writes leave the text alone; only text or status changes re-embed
+    if not raw and needs_embedding_refresh(instance._embedding_state, instance, created, update_fields):
+        schedule_embedding_refresh(instance)
+    instance._embedding_state = embedding_state(instance)
+
+
+@receiver(post_delete, sender=Product)
+def drop_product_embedding(sender, instance, **kwargs):
+    # The row itself is removed by the cascade; only the in-memory index needs it
+    embedding_index.remove([instance.pk])
+
+
+@receiver(post_init, sender=ProductReview)
+def remember_review_state(sender, instance, **kwargs):
+    # What this review contributed to its product's rating when loaded
+    instance._rating_state = review_state(instance) if instance.pk else (None, None)
+
 
 @receiver(post_save, sender=ProductReview)
-def process_auto_reply(sender, instance, created, **kwargs):
-    # Only trigger on newly created, top-level reviews
-    if created and instance.reply_to is None:
-        settings = StoreSettings.load()
-        
-        if settings.auto_reply_enabled:
-            # Determine template based on rating
-            if instance.rating >= 4:
-                reply_text = "Thank you so much for your kind words! We're thrilled to hear you love it."
-            elif instance.rating <= 2:
-                reply_text = "We're so sorry to hear this didn't meet your expectations. Please DM us so we can make it right."
-            else:
-                reply_text = "Thanks for the feedback! We'll pass this along to our product team immediately."
-            
-            # Create the reply review automatically
-            ProductReview.objects.create(
-                product=instance.product,
-                user=instance.product.seller,  # The seller creates the reply
-                rating=0, # Rating doesn't matter for a reply
-                comment=reply_text,
-                reply_to=instance, # Link it to the parent review
-                status='approved'
-            )
\ No newline at end of file
+def update_product_rating(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    new_state = review_state(instance)
+    track_review_change(instance._rating_state, new_state)
+    instance._rating_state = new_state
+
+
+@receiver(post_delete, sender=ProductReview)
+def remove_product_rating(sender, instance, **kwargs):
+    track_review_change(instance._rating_state, (instance.product_id, None))
+
+
+@receiver(post_save, sender=StoreSettings)
+@receiver(post_delete, sender=StoreSettings)
+def invalidate_store_settings(sender, **kwargs):
+    store_settings_cache.invalidate_on_commit()
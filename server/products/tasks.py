@@ -0,0 +1,31 @@
+# tasks.py
+"""Background job handlers, run by `manage.py run_jobs`."""
+from .embeddings import refresh_embeddings
+from .images import build_image_variants, index_image_hash
+from .jobs import register_handler
+from .models import Product
+from .utilty import run_product_analysis
+
+
+@register_handler('product_analysis')
+def product_analysis(payload):
+    product = Product.objects.get(pk=payload['product_id'])
+    return run_product_analysis(product)
+
+
+@register_handler('image_variants')
+def image_variants(payload):
+    product = Product.objects.get(pk=payload['product_id'])
+    if product.img.name != payload.get('source'):
+        # A newer upload replaced this one; its own job builds the variants
+        return {'skipped': 'image changed'}
+    index_image_hash(product)
+    variants = build_image_variants(product)
+    return {size: names for size, names in variants.items() if size != 'source'}
+
+
+@register_handler('refresh_embeddings')
+def refresh_embeddings_job(payload):
+    ids = payload['product_ids']
+    encoded, forgotten = refresh_embeddings(ids)
+    return {'checked': len(ids), 'encoded': encoded, 'forgotten': forgotten}
@@ -1,3 +1,618 @@
-from django.test import TestCase
+import asyncio
+import importlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from Profile.models import UserProfile
+
+from . import inventory, search, utilty, verdict_cache
+from .moderation import create_items, moderation_totals
+from .cache import get_catalog_version
+from .embeddings import VectorIndex
+from .model_registry import ModelRegistry, toxicity_version
+from .models import BackgroundJob, ModerationItem, ModerationStats, Product, ProductReview
+from .price_cache import normalize_query
+from .utilty import MarketIntelligenceService, _risk_confidence
+
+
+class ReviewFeedQueryTests(TestCase):
+    """The seller review feed costs the same number of queries however many reviews it shows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.seller = User.objects.create_user(username='seller', password='pw')
+        UserProfile.objects.update_or_create(user=cls.seller, defaults={'role': 'seller'})
+        cls.customers = [User.objects.create_user(username=f'customer{i}', password='pw') for i in range(3)]
+        cls.products = [Product.objects.create(seller=cls.seller, name=f'Product {i}', price=10) for i in range(3)]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.seller)
+
+    def add_reviews(self, count):
+        for i in range(count):
+            review = ProductReview.objects.create(
+                product=self.products[i % len(self.products)],
+                user=self.customers[i % len(self.customers)],
+                rating=i % 5 + 1,
+                comment=f'Review {i}',
+            )
+            ProductReview.objects.create(
+                product=review.product, user=self.seller, rating=0, comment='Thanks!', reply_to=review,
+            )
+
+    def get_feed(self):
+        # The two ETag aggregates, the page (with authors and products), and its replies
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/v2/reviews/')
+        self.assertEqual(response.status_code, 200)
+        return response.data['results']
+
+    def test_query_count_does_not_grow_with_reviews(self):
+        self.add_reviews(5)
+        self.assertEqual(len(self.get_feed()), 5)
+
+        self.add_reviews(5)
+        results = self.get_feed()
+        self.assertEqual(len(results), 10)
+        self.assertTrue(all(review['seller_reply'] for review in results))
+
+    def test_seller_reply_ignores_other_replies(self):
+        self.add_reviews(1)
+        review = ProductReview.objects.get(reply_to__isnull=True)
+        ProductReview.objects.filter(reply_to=review).delete()
+        ProductReview.objects.create(
+            product=review.product, user=self.customers[1], rating=0, comment='Same here', reply_to=review,
+        )
+        self.assertIsNone(self.get_feed()[0]['seller_reply'])
+
+        ProductReview.objects.create(
+            product=review.product, user=self.seller, rating=0, comment='Thanks!', reply_to=review,
+        )
+        self.assertEqual(self.get_feed()[0]['seller_reply'], 'Thanks!')
+
+
+TOXIC_LABELS = ['toxic', 'severe_toxic', 'obscene', 'threat', 'insult', 'identity_hate']
+
+
+class FakeTokenizer:
+
+    def __call__(self, texts, padding=True, truncation=True, return_tensors='np'):
+        width = max(len(text.split()) for text in texts)
+        mask = np.array([[1] * len(text.split()) + [0] * (width - len(text.split())) for text in texts])
+        return {'input_ids': mask * 7, 'attention_mask': mask}
+
+
+class FakeSession:
+    """Fixed logits per row: strongly 'toxic' for texts over three words, clean otherwise."""
+
+    def __init__(self, *args, **kwargs):
+        self.calls = []
+
+    def run(self, output_names, feeds):
+        self.calls.append(feeds)
+        rows = feeds['input_ids'].shape[0]
+        logits = np.full((rows, len(TOXIC_LABELS)), -6.0, dtype=np.float32)
+        logits[feeds['attention_mask'].sum(axis=1) > 3, 0] = 6.0
+        return [logits]
+
+
+class AdminProductListTests(TestCase):
+    """The admin approval tabs page through one status at a time."""
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.admin = User.objects.create_user(username='admin', password='pw', is_staff=True)
+        seller = User.objects.create_user(username='seller', password='pw')
+        for i, product_status in enumerate(['pending', 'approved', 'pending', 'rejected', 'pending']):
+            Product.objects.create(seller=seller, name=f'Product {i}', price=10, status=product_status)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_status_filter_pages_one_tab(self):
+        response = self.client.get('/api/v2/admin/products/?status=pending&page_size=2')
+        self.assertEqual(response.status_code, 200)
+        names = [p['name'] for p in response.data['results']]
+        self.assertEqual(len(names), 2)
+        self.assertIsNotNone(response.data['next'])
+
+        response = self.client.get(response.data['next'])
+        names += [p['name'] for p in response.data['results']]
+        self.assertIsNone(response.data['next'])
+        self.assertEqual(sorted(names), ['Product 0', 'Product 2', 'Product 4'])
+
+    def test_unknown_status_is_rejected(self):
+        response = self.client.get('/api/v2/admin/products/?status=archived')
+        self.assertEqual(response.status_code, 400)
+
+
+class OnnxToxicityClassifierTests(SimpleTestCase):
+    """The ONNX wrapper returns what the transformers pipeline does, which _risk_confidence consumes."""
+
+    def setUp(self):
+        self.model_dir = tempfile.mkdtemp()
+        open(os.path.join(self.model_dir, 'model-int8.onnx'), 'wb').close()
+        with open(os.path.join(self.model_dir, 'config.json'), 'w') as f:
+            json.dump({
+                'id2label': {str(i): label for i, label in enumerate(TOXIC_LABELS)},
+                'problem_type': 'multi_label_classification',
+            }, f)
+
+        fake_ort = types.SimpleNamespace(
+            SessionOptions=lambda: types.SimpleNamespace(),
+            GraphOptimizationLevel=types.SimpleNamespace(ORT_ENABLE_ALL=99),
+            InferenceSession=FakeSession,
+        )
+        fake_transformers = types.SimpleNamespace(
+            AutoTokenizer=types.SimpleNamespace(from_pretrained=lambda path: FakeTokenizer()),
+        )
+        patcher = mock.patch.dict(sys.modules, {'onnxruntime': fake_ort, 'transformers': fake_transformers})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        from .onnx_classifier import OnnxToxicityClassifier
+        self.classifier = OnnxToxicityClassifier(self.model_dir)
+
+    def test_one_ranked_label_list_per_text(self):
+        outputs = self.classifier(['nice', 'you are an idiot', 'ok then'], batch_size=2)
+
+        self.assertEqual(len(outputs), 3)
+        self.assertEqual(len(self.classifier.session.calls), 2)
+        for results in outputs:
+            self.assertEqual(sorted(r['label'] for r in results), sorted(TOXIC_LABELS))
+            scores = [r['score'] for r in results]
+            self.assertEqual(scores, sorted(scores, reverse=True))
+            self.assertTrue(all(isinstance(score, float) and 0 <= score <= 1 for score in scores))
+        self.assertEqual(outputs[1][0]['label'], 'toxic')
+
+    def test_single_text_matches_pipeline_call(self):
+        self.assertEqual(len(self.classifier('hello')), 1)
+
+    def test_risk_confidence_consumes_output(self):
+        clean, toxic = self.classifier(['fine', 'you are an idiot'])
+        self.assertEqual(_risk_confidence(clean), 0)
+        self.assertEqual(_risk_confidence(toxic), 40)  # sigmoid(6) under the 0.4 'toxic' weight, plus the near-zero rest
+
+    def test_missing_model_file(self):
+        os.remove(os.path.join(self.model_dir, 'model-int8.onnx'))
+        from .onnx_classifier import OnnxToxicityClassifier
+        with self.assertRaises(FileNotFoundError):
+            OnnxToxicityClassifier(self.model_dir)
+
+
+class FakeSearchService:
+    """Stands in for the Custom Search client: canned results per query, optional per-query delay."""
+
+    def __init__(self, prices, delays=None):
+        self.prices = prices
+        self.delays = delays or {}
+        self.queries = []
+
+    def cse(self):
+        return self
+
+    def list(self, q, cx):
+        query = q.removesuffix(' price')
+        self.queries.append(query)
+        return types.SimpleNamespace(execute=lambda num_retries=0: self._execute(query))
+
+    def _execute(self, query):
+        time.sleep(self.delays.get(query, 0))
+        return {'items': [
+            {'title': f'{query} deal', 'snippet': f'Now ${price:.2f}', 'link': f'https://www.{site.lower()}.com/item'}
+            for site, price in self.prices.get(query, [])
+        ]}
+
+
+class MarketDataTests(SimpleTestCase):
+    """gather_market_data against fake Vision and Custom Search services."""
+
+    def setUp(self):
+        self.search = FakeSearchService({
+            'acme phone': [('Amazon', 100.0), ('eBay', 90.0)],
+            'smartphone': [('Walmart', 120.0)],
+            'slow phone': [('Target', 80.0)],
+        }, delays={'slow phone': 2})
+        self.service = MarketIntelligenceService()
+        self.product = types.SimpleNamespace(name='Acme Phone', img='products/phone.jpg')
+        for target, replacement in (
+            ('get_search_service', lambda: self.search),
+            # Price caching has its own tests; every lookup goes to the fake service here
+            ('cached_prices', lambda query, fetch: fetch(normalize_query(query))),
+        ):
+            patcher = mock.patch.object(utilty, target, replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def vision_returns(self, label, delay=0):
+        def analyze(product):
+            time.sleep(delay)
+            return {'confidence': 0.9, 'label': label, 'web_entities': []}
+        return mock.patch.object(self.service, 'analyze_product_image', analyze)
+
+    def test_search_parses_competitor_prices(self):
+        self.assertEqual(self.service.search_competitor_prices('acme phone'), [
+            {'site': 'Amazon', 'price': 100.0, 'url': 'https://www.amazon.com/item'},
+            {'site': 'eBay', 'price': 90.0, 'url': 'https://www.ebay.com/item'},
+        ])
+        with self.assertRaises(ValueError):
+            self.service.search_competitor_prices('nothing')
+
+    def test_detected_label_prices_are_preferred(self):
+        with self.vision_returns('Smartphone'):
+            vision, competitors = self.service.gather_market_data(self.product, budget=2)
+        self.assertEqual(vision['label'], 'Smartphone')
+        self.assertEqual([c['price'] for c in competitors], [120.0])
+        self.assertCountEqual(self.search.queries, ['smartphone', 'acme phone'])
+
+    def test_unknown_label_uses_name_prices(self):
+        with self.vision_returns('Unknown'):
+            _, competitors = self.service.gather_market_data(self.product, budget=2)
+        self.assertEqual(self.search.queries, ['acme phone'])
+        self.assertEqual(len(competitors), 2)
+
+    def test_vision_and_name_search_overlap(self):
+        self.search.delays['acme phone'] = 0.5
+        started = time.monotonic()
+        with self.vision_returns('Unknown', delay=0.5):
+            _, competitors = self.service.gather_market_data(self.product, budget=3)
+        # Run one after the other they would take the sum of both delays
+        self.assertLess(time.monotonic() - started, 0.9)
+        self.assertEqual(len(competitors), 2)
+
+    def test_slow_label_search_falls_back_to_name_within_budget(self):
+        started = time.monotonic()
+        with self.vision_returns('Slow Phone'):
+            _, competitors = self.service.gather_market_data(self.product, budget=0.5)
+        self.assertLess(time.monotonic() - started, 1.5)
+        self.assertCountEqual(self.search.queries, ['slow phone', 'acme phone'])
+        self.assertEqual([c['price'] for c in competitors], [100.0, 90.0])
+
+    def test_slow_vision_is_abandoned_at_the_deadline(self):
+        started = time.monotonic()
+        with self.vision_returns('Smartphone', delay=2):
+            vision, competitors = self.service.gather_market_data(self.product, budget=0.3)
+        self.assertLess(time.monotonic() - started, 1.5)
+        self.assertEqual(vision['label'], 'Acme Phone')
+        self.assertEqual(len(competitors), 2)
+
+
+class ClientPoolTests(SimpleTestCase):
+
+    def in_thread(self, fn):
+        result = []
+        thread = threading.Thread(target=lambda: result.append(fn()))
+        thread.start()
+        thread.join()
+        return result[0]
+
+    def test_vision_client_is_shared_by_all_threads(self):
+        with mock.patch.object(utilty, '_vision_client', None), \
+                mock.patch.object(utilty.vision, 'ImageAnnotatorClient', side_effect=object) as factory:
+            clients = {id(self.in_thread(utilty.get_vision_client)) for _ in range(3)}
+            clients.add(id(utilty.get_vision_client()))
+        self.assertEqual(len(clients), 1)
+        self.assertEqual(factory.call_count, 1)
+
+    def test_search_service_is_built_once_per_thread(self):
+        with mock.patch.object(utilty, '_search_local', threading.local()), \
+                mock.patch.object(utilty, 'build', side_effect=lambda *args, **kwargs: object()) as build:
+            here = utilty.get_search_service()
+            self.assertIs(utilty.get_search_service(), here)
+            self.assertIsNot(self.in_thread(utilty.get_search_service), here)
+        self.assertEqual(build.call_count, 2)
+
+
+class ModerationCreateTests(TestCase):
+    """POST /moderation/ awaits the micro-batcher, so concurrent async requests share a batch."""
+
+    @classmethod
+    def setUpTestData(cls):
+        admin = get_user_model().objects.create_user(username='admin', password='pw', is_staff=True)
+        cls.auth = f'Bearer {AccessToken.for_user(admin)}'
+
+    def setUp(self):
+        self.batches = []
+
+        def score(texts):
+            self.batches.append(len(texts))
+            return [('High', 90, 'Remove Content')] * len(texts)
+
+        for name, value in (('fn', score), ('max_wait', 0.05)):
+            patcher = mock.patch.object(utilty.moderation_batcher, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def post(self, client, content):
+        return client.post(
+            '/api/v2/moderation/', {'content_type': 'Product Review', 'content': content},
+            content_type='application/json', headers={'Authorization': self.auth},
+        )
+
+    def test_sync_client(self):
+        response = self.post(self.client, 'spam')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['risk_level'], 'High')
+        self.assertEqual(self.batches, [1])
+
+    async def test_concurrent_requests_share_a_batch(self):
+        responses = await asyncio.gather(*(self.post(self.async_client, f'spam {i}') for i in range(6)))
+
+        self.assertEqual([r.status_code for r in responses], [201] * 6)
+        self.assertLess(len(self.batches), 6)
+        self.assertEqual(sum(self.batches), 6)
+        self.assertEqual(await ModerationItem.objects.acount(), 6)
+
+    def test_invalid_item(self):
+        response = self.client.post(
+            '/api/v2/moderation/', {'content': 'x'}, content_type='application/json', headers={'Authorization': self.auth},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.batches, [])
+
+
+class RecordingConnection:
+    """Enough of a DB connection to capture the SQL a DDL helper would run."""
+
+    def __init__(self, vendor):
+        self.vendor = vendor
+        self.ops = types.SimpleNamespace(quote_name=lambda name: f'"{name}"')
+        self.statements = []
+
+    def cursor(self):
+        connection = self
+
+        class Cursor:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, sql, params=None):
+                connection.statements.append(' '.join(sql.split()))
+
+            def fetchone(self):
+                return (0,)
+
+        return Cursor()
+
+
+class ModerationCounterTests(TestCase):
+    """Every creation path moves the dashboard counters, which always match a recount."""
+
+    def assertCountersMatchItems(self):
+        stats = ModerationStats.load()
+        self.assertEqual({field: getattr(stats, field) for field in moderation_totals()}, moderation_totals())
+
+    def item(self, recommendation, risk='Low'):
+        return ModerationItem(
+            content_type='Product Review', content=f'{risk} text', risk_level=risk, recommended_action=recommendation,
+        )
+
+    def test_only_items_actually_auto_approved_are_counted(self):
+        created = create_items([self.item('Approve'), self.item('Remove Content', risk='High')])
+        self.assertEqual([item.auto_approved for item in created], [True, False])
+        self.assertFalse(ModerationItem.objects.filter(is_resolved=False, auto_approved=True).exists())
+
+        with override_settings(MODERATION_AUTO_APPROVE=False):
+            create_items([self.item('Approve')])
+
+        stats = ModerationStats.load()
+        self.assertEqual((stats.auto_approved, stats.pending, stats.high_risk_pending), (1, 2, 1))
+        self.assertCountersMatchItems()
+
+    def test_seed_command_counts_its_items(self):
+        with mock.patch('sys.stdout'):
+            call_command('seed_products')
+            call_command('seed_products')
+        self.assertEqual(ModerationStats.load().total_items, 2)
+        self.assertCountersMatchItems()
+
+
+class VerdictCacheTests(TestCase):
+    """Verdicts are keyed by the commit the classifier loaded; reading the stats never writes them."""
+
+    def registry_with(self, loader):
+        registry = ModelRegistry()
+        registry.register(
+            'toxicity-classifier', loader, version=lambda classifier: toxicity_version('torch', classifier),
+        )
+        patcher = mock.patch.object(verdict_cache, 'registry', registry)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return registry
+
+    @override_settings(MODERATION_MODEL_REVISION='main')
+    def test_version_pins_the_loaded_commit(self):
+        commits = iter(['aaa111', 'bbb222'])
+
+        def load():
+            config = types.SimpleNamespace(_commit_hash=next(commits))
+            return types.SimpleNamespace(model=types.SimpleNamespace(config=config))
+
+        registry = self.registry_with(load)
+        self.assertEqual(verdict_cache.model_version(), f'unitary/toxic-bert@aaa111#{verdict_cache.SCORING_VERSION}')
+        self.assertTrue(registry.is_loaded('toxicity-classifier'))
+
+        # 'main' moving on shows up as a new key once a process loads the new weights
+        self.registry_with(load)
+        self.assertEqual(verdict_cache.model_version(), f'unitary/toxic-bert@bbb222#{verdict_cache.SCORING_VERSION}')
+
+    def test_unloadable_classifier_skips_the_cache(self):
+        def load():
+            raise OSError('offline')
+
+        self.registry_with(load)
+        with mock.patch('builtins.print'):
+            self.assertIsNone(verdict_cache.model_version())
+        self.assertEqual(verdict_cache.lookup(['abc']), {})
+        self.assertEqual(verdict_cache.purge_stale(), 0)
+
+    def test_stats_read_leaves_counts_for_the_flush_job(self):
+        cache.clear()
+        ModerationStats.load()
+        verdict_cache.record_lookups(hits=3, misses=1)
+
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.create_user(username='admin', password='pw', is_staff=True))
+        self.assertEqual(client.get('/api/v2/moderation/stats/').status_code, 200)
+        self.assertEqual(ModerationStats.load().verdict_cache_hits, 0)
+
+        call_command('flush_verdict_stats')
+        stats = ModerationStats.load()
+        self.assertEqual((stats.verdict_cache_hits, stats.verdict_cache_misses), (3, 1))
+
+
+class SearchIndexMigrationTests(SimpleTestCase):
+    """Migration 0006 carries its own copy of the search index DDL; it must match products.search."""
+
+    migration = importlib.import_module('products.migrations.0006_product_search_index')
+
+    def captured(self, vendor, run_migration, run_search):
+        from_migration, from_search = RecordingConnection(vendor), RecordingConnection(vendor)
+        run_migration(apps, types.SimpleNamespace(connection=from_migration))
+        run_search(from_search)
+        # search.install_search_index also probes for existing triggers first
+        return from_migration.statements, [sql for sql in from_search.statements if 'sqlite_master' not in sql]
+
+    def test_install_matches(self):
+        for vendor in ('postgresql', 'sqlite'):
+            with self.subTest(vendor=vendor):
+                migration_sql, search_sql = self.captured(
+                    vendor, self.migration.install, search.install_search_index,
+                )
+                self.assertTrue(migration_sql)
+                self.assertEqual(migration_sql, search_sql)
+
+    def test_uninstall_matches(self):
+        for vendor in ('postgresql', 'sqlite'):
+            with self.subTest(vendor=vendor):
+                migration_sql, search_sql = self.captured(
+                    vendor, self.migration.uninstall, search.uninstall_search_index,
+                )
+                self.assertTrue(migration_sql)
+                self.assertEqual(migration_sql, search_sql)
+
+
+class CatalogInvalidationTests(TestCase):
+    """Stock moves and reviews bump the catalog version only when the listing would change."""
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.seller = User.objects.create_user(username='seller', password='pw')
+        cls.customer = User.objects.create_user(username='customer', password='pw')
+
+    def setUp(self):
+        self.product = Product.objects.create(
+            seller=self.seller, name='Lamp', price=20, status='approved', stock_quantity=5,
+        )
+
+    def bumps(self, action):
+        before = get_catalog_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            result = action()
+        return result, get_catalog_version() != before
+
+    def test_stock_bumps_only_on_in_and_out_of_stock(self):
+        _, bumped = self.bumps(lambda: inventory.reserve([(self.product.pk, 2)]))
+        self.assertFalse(bumped)
+
+        last, bumped = self.bumps(lambda: inventory.reserve([(self.product.pk, 3)]))
+        self.assertTrue(bumped)  # sold out
+
+        _, bumped = self.bumps(lambda: inventory.release(last))
+        self.assertTrue(bumped)  # back in stock
+
+    def review(self, rating):
+        return ProductReview.objects.create(
+            product=self.product, user=self.customer, rating=rating, status='approved',
+        )
+
+    def test_reviews_bump_only_when_displayed_rating_changes(self):
+        self.assertTrue(self.bumps(lambda: self.review(4))[1])
+        self.assertFalse(self.bumps(lambda: self.review(4))[1])
+        self.assertTrue(self.bumps(lambda: self.review(1))[1])
+
+
+class VectorIndexTests(SimpleTestCase):
+
+    def test_removed_rows_are_compacted(self):
+        index = VectorIndex(dim=4)
+        index.COMPACT_MIN_ROWS = 4
+        axis = np.eye(4, dtype=np.float32)
+        index.upsert(list(range(1, 21)), axis[np.arange(20) % 4])
+
+        index.remove(range(1, 7))
+        self.assertEqual(index.size, 14)
+        self.assertEqual(sorted(index.rows), list(range(7, 21)))
+        hits = index.search(axis[0], k=20)
+        self.assertEqual(sorted(pk for pk, score in hits if score > 0.5), [9, 13, 17])
+
+        index.upsert([5], axis[:1])
+        self.assertEqual(index.size, 15)
+        self.assertEqual(sorted(pk for pk, score in index.search(axis[0], k=20) if score > 0.5), [5, 9, 13, 17])
+
+
+class EmbeddingRefreshTests(TestCase):
+    """Saving a product queues a re-embed only when what the embedding depends on changed."""
+
+    def setUp(self):
+        seller = get_user_model().objects.create_user(username='seller', password='pw')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.product = Product.objects.create(seller=seller, name='Lamp', price=20, status='approved')
+
+    def jobs(self):
+        return BackgroundJob.objects.filter(kind='refresh_embeddings').count()
+
+    def save(self, product, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            product.save(**kwargs)
+
+    def test_create_queues(self):
+        self.assertEqual(self.jobs(), 1)
+
+    def test_stock_and_demand_writes_do_not_queue(self):
+        self.product.stock_quantity = 3
+        self.save(self.product)
+        self.product.demand_score = 70
+        self.save(self.product, update_fields=['demand_score'])
+        self.assertEqual(self.jobs(), 1)
+
+    def test_text_and_status_changes_queue(self):
+        self.product.description = 'Brass desk lamp'
+        self.save(self.product)
+        self.product.status = 'rejected'
+        self.save(self.product)
+        self.assertEqual(self.jobs(), 3)
+
+    def test_partially_loaded_product(self):
+        product = Product.objects.only('id', 'price').get(pk=self.product.pk)
+        product.price = 25
+        self.save(product)
+        self.assertEqual(self.jobs(), 1)
+
+        # The old name was never loaded, so it cannot be compared; refresh to be safe
+        product.name = 'Desk lamp'
+        self.save(product)
+        self.assertEqual(self.jobs(), 2)
@@ -1,22 +1,41 @@
 from  django.urls import path 
-from .views import AdminapprovalView, AdminrejectView, ProductAnalysisView, ProductViewSet, ProductDetailView,ModerationListCreateView,ModerationResolveView,ModerationStatsView, ReviewViewSet, SellerRelatedProductViewSet, SettingsViewSet
+from .views import AdminapprovalView, AdminrejectView, BulkProductStatusView, ProductAnalysisView, BulkProductAnalysisView, BackgroundJobView, DuplicateProductsView, StockReservationView, StockReservationActionView, ProductViewSet, ProductImportView, ProductDetailView, GestproductView, ProductSearchView, ProductSemanticSearchView,ModerationListCreateView,ModerationBulkCreateView,ModerationQueueView,ModerationClaimView,ModerationResolveView,ModerationStatsView, ReviewViewSet, SellerRelatedProductViewSet, SettingsViewSet, ModelReadinessView
 
 
 
 urlpatterns = [
     path('products/', ProductViewSet.as_view(), name='product-list-create'),
+    path('products/import/', ProductImportView.as_view(), name='product-import'),
     path('products/seller/', SellerRelatedProductViewSet.as_view(), name='seller-product-list'),
+    path('products/catalog/', GestproductView.as_view(), name='product-catalog'),
+    path('products/search/', ProductSearchView.as_view(), name='product-search'),
+    path('products/semantic-search/', ProductSemanticSearchView.as_view(), name='product-semantic-search'),
     path('products/<int:pk>/', ProductDetailView.as_view(), name='product-update-delete'),
     path("admin/products/<int:pk>/approve/", AdminapprovalView.as_view(), name="admin-product-approve" ),
     path("admin/products/<int:pk>/reject/", AdminrejectView.as_view(), name="admin-product-reject" ),
+    path("admin/products/approve/", BulkProductStatusView.as_view(new_status='approved'), name="admin-product-approve-bulk"),
+    path("admin/products/reject/", BulkProductStatusView.as_view(new_status='rejected'), name="admin-product-reject-bulk"),
     path("admin/products/", AdminapprovalView.as_view(), name="admin-product-list" ),
     path("admin/products/<int:pk>/analyze/", ProductAnalysisView.as_view(), name="admin-product-analyze"),
+    path("admin/products/analyze/", BulkProductAnalysisView.as_view(), name="admin-product-analyze-bulk"),
+    path("admin/products/duplicates/", DuplicateProductsView.as_view(), name="admin-product-duplicates"),
+    path("admin/products/<int:pk>/duplicates/", DuplicateProductsView.as_view(), name="admin-product-duplicates-detail"),
+    path("admin/jobs/<int:pk>/", BackgroundJobView.as_view(), name="admin-job-detail"),
+    path("inventory/reservations/", StockReservationView.as_view(), name="stock-reservation-create"),
+    path("inventory/reservations/<int:pk>/", StockReservationView.as_view(), name="stock-reservation-detail"),
+    path("inventory/reservations/<int:pk>/commit/", StockReservationActionView.as_view(operation='commit'), name="stock-reservation-commit"),
+    path("inventory/reservations/<int:pk>/release/", StockReservationActionView.as_view(operation='release'), name="stock-reservation-release"),
     path("moderation/", ModerationListCreateView.as_view(), name="moderation-list"),
+    path("moderation/bulk/", ModerationBulkCreateView.as_view(), name="moderation-bulk-create"),
+    path("moderation/queue/", ModerationQueueView.as_view(), name="moderation-queue"),
+    path("moderation/queue/claim/", ModerationClaimView.as_view(operation='claim'), name="moderation-queue-claim"),
+    path("moderation/queue/release/", ModerationClaimView.as_view(operation='release'), name="moderation-queue-release"),
     path("moderation/<int:pk>/resolve/", ModerationResolveView.as_view(), name="moderation-resolve"),
     path("moderation/stats/", ModerationStatsView.as_view(), name="moderation-stats"),
     path("reviews/<int:id>/reply/", ReviewViewSet.as_view(), name="reviews-list-create"),
     path("settings/toggle_auto_reply/", SettingsViewSet.as_view(), name="settings-view-toggle"),
     path("reviews/", ReviewViewSet.as_view(), name="reviews-list"),
+    path("health/models/", ModelReadinessView.as_view(), name="model-readiness"),
     
 
 
@@ -1,113 +1,253 @@
 # services.py
 import os
 import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+import httplib2
 import numpy as np
-import torch
-from transformers import pipeline 
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
 from google.cloud import vision
 from googleapiclient.discovery import build
+from . import verdict_cache
+from .images import remember_vision_result, reusable_vision_result
+from .microbatch import MicroBatcher
+from .model_registry import registry
+from .price_cache import cached_prices, normalize_query
 
 GOOGLE_API_KEY = os.environ.get('GOOGLE_CLOUD_API_KEY', 'GOOGLE_CLOUD_API_KEY')
 SEARCH_ENGINE_ID = os.environ.get('SEARCH_ENGINE_ID', 'SEARCH_ENGINE_ID')
 
+# --- Process-wide client pool ---
+# The Vision gRPC client is thread-safe, so one instance serves the whole process.
+# googleapiclient services sit on httplib2, which is not, so each thread gets its own.
+_vision_client = None
+_vision_lock = threading.Lock()
+_search_local = threading.local()
+
+# Shared pool for running independent external calls side by side
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='market-intel')
+
+
+def get_vision_client():
+    global _vision_client
+    if _vision_client is None:
+        with _vision_lock:
+            if _vision_client is None:
+                # Requires GOOGLE_APPLICATION_CREDENTIALS env var set
+                _vision_client = vision.ImageAnnotatorClient()
+    return _vision_client
+
+
+def get_search_service():
+    service = getattr(_search_local, 'service', None)
+    if service is None:
+        http = httplib2.Http(timeout=settings.MARKET_SEARCH_TIMEOUT)
+        service = build("customsearch", "v1", developerKey=GOOGLE_API_KEY, http=http, cache_discovery=False)
+        _search_local.service = service
+    return service
+
+
+def _run_in_pool(func, *args):
+    try:
+        return func(*args)
+    finally:
+        # Pool threads outlive requests, so release their DB connections like a request would
+        close_old_connections()
+
+
+def _submit(func, *args):
+    return _executor.submit(_run_in_pool, func, *args)
+
+
+def _remaining(deadline):
+    return max(0.0, deadline - time.monotonic())
+
+
+def _mock_prices():
+    # Mock Data for reliability during demo
+    base_price = random.uniform(50, 200)
+    return [
+        {"site": "Amazon", "price": round(base_price * 1.05, 2), "url": "#"},
+        {"site": "eBay", "price": round(base_price * 0.9, 2), "url": "#"},
+        {"site": "Walmart", "price": round(base_price, 2), "url": "#"}
+    ]
+
+
 class MarketIntelligenceService:
     """
     Handles interactions with Google Vision (Lens), Custom Search, and internal ML models.
     """
 
-    def __init__(self):
-        # Initialize Google Custom Search
-        self.search_service = build("customsearch", "v1", developerKey=GOOGLE_API_KEY)
-        
-        # Initialize Google Vision (Requires GOOGLE_APPLICATION_CREDENTIALS env var set)
-        # os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = '/path/to/your/service-account.json'
-        self.vision_client = vision.ImageAnnotatorClient()
+    @property
+    def search_service(self):
+        return get_search_service()
 
-    def analyze_image(self, image_path):
+    @property
+    def vision_client(self):
+        return get_vision_client()
+
+    def detect_image(self, image_path):
         """
         Simulates 'Google Lens' behavior using Cloud Vision Web Detection.
         Returns: confidence score, best guess label, and similar image URLs.
+        Raises when the API call fails.
         """
+        with open(image_path, "rb") as image_file:
+            content = image_file.read()
+
+        image = vision.Image(content=content)
+        response = self.vision_client.web_detection(image=image, timeout=settings.MARKET_VISION_TIMEOUT)
+        annotations = response.web_detection
+
+        # Extract Best Guess Label
+        best_guess = "Unknown"
+        if annotations.best_guess_labels:
+            best_guess = annotations.best_guess_labels[0].label
+
+        # Calculate Visual Confidence (based on number of full matching images found)
+        match_count = len(annotations.full_matching_images)
+        confidence = min(0.5 + (match_count * 0.05), 0.99) # Cap at 99%, start at 50%
+
+        return {
+            "confidence": confidence,
+            "label": best_guess,
+            "web_entities": [entity.description for entity in annotations.web_entities[:3]]
+        }
+
+    def analyze_image(self, image_path):
         try:
-            with open(image_path, "rb") as image_file:
-                content = image_file.read()
-
-            image = vision.Image(content=content)
-            response = self.vision_client.web_detection(image=image)
-            annotations = response.web_detection
-
-            # Extract Best Guess Label
-            best_guess = "Unknown"
-            if annotations.best_guess_labels:
-                best_guess = annotations.best_guess_labels[0].label
-
-            # Calculate Visual Confidence (based on number of full matching images found)
-            match_count = len(annotations.full_matching_images)
-            confidence = min(0.5 + (match_count * 0.05), 0.99) # Cap at 99%, start at 50%
-
-            return {
-                "confidence": confidence,
-                "label": best_guess,
-                "web_entities": [entity.description for entity in annotations.web_entities[:3]]
-            }
+            return self.detect_image(image_path)
         except Exception as e:
             print(f"Vision API Error: {e}")
             # Fallback for development/testing if API fails
             return {"confidence": 0.85, "label": "Detected Product", "web_entities": []}
 
-    def fetch_competitor_prices(self, query):
+    def analyze_product_image(self, product):
+        """
+        Vision result for the product's image. Re-uses the stored result for
+        this upload or for a near-duplicate image (same stock photo on another
+        listing) before calling Cloud Vision; only real API results are stored.
+        """
+        reused = reusable_vision_result(product)
+        if reused is not None:
+            return reused
+        try:
+            result = self.detect_image(product.img.path)
+        except Exception as e:
+            print(f"Vision API Error: {e}")
+            return {"confidence": 0.85, "label": "Detected Product", "web_entities": []}
+        remember_vision_result(product, result)
+        return result
+
+    def search_competitor_prices(self, query):
         """
         Uses Google Custom Search to find prices for the product.
+        Raises when the search fails or finds no prices.
         """
         competitors = []
-        try:
-            # Search for the product name + "price"
-            res = self.search_service.cse().list(q=f"{query} price", cx=SEARCH_ENGINE_ID).execute()
-            
-            items = res.get("items", [])
-            sites = ["Amazon", "eBay", "Walmart", "Target", "BestBuy"]
-
-            for item in items[:5]: # Check top 5 results
-                snippet = item.get("snippet", "")
-                title = item.get("title", "")
-                link = item.get("link", "")
-                
-                # Simple heuristic to extract price (Regex would be better in production)
-                import re
-                price_match = re.search(r'\$(\d+\.\d{2})', snippet + title)
-                
-                if price_match:
-                    price = float(price_match.group(1))
-                    
-                    # Determine site name
-                    site_name = "Online Store"
-                    for s in sites:
-                        if s.lower() in link.lower():
-                            site_name = s
-                            break
-                    
-                    competitors.append({
-                        "site": site_name,
-                        "price": price,
-                        "url": link
-                    })
-            
-            # If API finds nothing, return mock data for demo purposes
-            if not competitors:
-                raise ValueError("No prices found")
+        # Search for the product name + "price"
+        res = self.search_service.cse().list(q=f"{query} price", cx=SEARCH_ENGINE_ID).execute(num_retries=0)
 
+        items = res.get("items", [])
+        sites = ["Amazon", "eBay", "Walmart", "Target", "BestBuy"]
+
+        for item in items[:5]: # Check top 5 results
+            snippet = item.get("snippet", "")
+            title = item.get("title", "")
+            link = item.get("link", "")
+
+            # Simple heuristic to extract price (Regex would be better in production)
+            price_match = re.search(r'\$(\d+\.\d{2})', snippet + title)
+
+            if price_match:
+                price = float(price_match.group(1))
+
+                # Determine site name
+                site_name = "Online Store"
+                for s in sites:
+                    if s.lower() in link.lower():
+                        site_name = s
+                        break
+
+                competitors.append({
+                    "site": site_name,
+                    "price": price,
+                    "url": link
+                })
+
+        if not competitors:
+            raise ValueError("No prices found")
+        return competitors
+
+    def fetch_competitor_prices(self, query):
+        """
+        Competitor prices for ``query``, served from the shared price cache
+        when possible (see products/price_cache.py).
+        """
+        try:
+            competitors = cached_prices(query, self.search_competitor_prices)
         except Exception as e:
             print(f"Search API Error: {e}")
-            # Mock Data for reliability during demo
-            base_price = random.uniform(50, 200)
-            competitors = [
-                {"site": "Amazon", "price": round(base_price * 1.05, 2), "url": "#"},
-                {"site": "eBay", "price": round(base_price * 0.9, 2), "url": "#"},
-                {"site": "Walmart", "price": round(base_price, 2), "url": "#"}
-            ]
+            competitors = _mock_prices()
 
         return competitors
 
+    def gather_market_data(self, product, budget=None):
+        """
+        Runs image recognition and the competitor price search concurrently
+        under one time budget. Returns (vision_data, competitors).
+
+        The price lookup for the product name starts alongside Vision, so the
+        request costs roughly the slower of the two rather than their sum; it
+        goes through the shared price cache, so repeat names never leave the
+        process. If Vision answers within the budget with a different usable
+        label, that search runs with the time left and its prices are
+        preferred; otherwise the name-based prices are used.
+        """
+        deadline = time.monotonic() + (budget or settings.MARKET_ANALYSIS_BUDGET)
+        default_vision = {"confidence": 0.85, "label": product.name, "web_entities": []}
+
+        vision_future = _submit(self.analyze_product_image, product) if product.img else None
+        name_future = _submit(cached_prices, product.name, self.search_competitor_prices)
+
+        vision_data = default_vision
+        if vision_future is not None:
+            try:
+                vision_data = vision_future.result(timeout=_remaining(deadline))
+            except FutureTimeout:
+                print("Image analysis skipped: deadline exceeded")
+            except Exception as e:
+                print(f"Image analysis skipped: {e}")
+
+        competitors = None
+        label = vision_data['label']
+        if label != "Unknown" and normalize_query(label) != normalize_query(product.name) and _remaining(deadline) > 0:
+            try:
+                competitors = _submit(cached_prices, label, self.search_competitor_prices).result(
+                    timeout=_remaining(deadline)
+                )
+            except FutureTimeout:
+                print(f"Price search for '{label}' skipped: deadline exceeded")
+            except Exception as e:
+                print(f"Price search for '{label}' failed: {e}")
+
+        if competitors is None:
+            try:
+                # Always give the name search a moment, even if the budget is spent
+                competitors = name_future.result(timeout=max(_remaining(deadline), 0.5))
+            except FutureTimeout:
+                print("Price search skipped: deadline exceeded")
+                competitors = []
+            except Exception as e:
+                print(f"Search API Error: {e}")
+                competitors = _mock_prices()
+
+        return vision_data, competitors
+
     def predict_demand(self, product_price, competitors, category):
         """
         Custom ML Logic.
@@ -171,13 +311,78 @@ class MarketIntelligenceService:
 
 
 
-# Load a pre-trained pipeline for toxicity/sentiment analysis
-# We use 'text-classification' which is efficient for detecting harmful content
-try:
-    classifier = pipeline("text-classification", model="unitary/toxic-bert", top_k=None)
-except Exception as e:
-    print(f"Warning: ML Model not loaded. Using fallback logic. Error: {e}")
-    classifier = None
+def run_product_analysis(product):
+    """
+    Full market analysis for one product: image recognition, competitor
+    prices and demand forecast. Saves the score on the product and returns
+    the payload the admin dashboard renders.
+    """
+    service = MarketIntelligenceService()
+
+    # 1 + 2. IMAGE RECOGNITION AND COMPETITOR PRICES (run concurrently)
+    vision_data, competitors = service.gather_market_data(product)
+
+    # 3. ML DEMAND FORECAST
+    ml_result = service.predict_demand(
+        product_price=float(product.price),
+        competitors=competitors,
+        category=vision_data['label']
+    )
+
+    response_data = {
+        "visualMatchConfidence": vision_data['confidence'],
+        "detectedCategory": vision_data['label'],
+        "marketAverage": ml_result['market_avg'],
+        "globalInterest": ml_result['trend'],
+        "interestGrowth": ml_result['growth'],
+        "competitorPrices": competitors,
+        "mlDemandForecast": ml_result['score'],
+        "demandTrend": ml_result['history']
+    }
+
+    # Save the computed score to the model immediately
+    product.demand_score = ml_result['score']
+    product.market_avg = ml_result['market_avg']
+    product.demand_trend = ml_result['trend']
+    product.external_interest = f"{ml_result['trend'].title()} ({ml_result['growth']}%)"
+    product.save()
+
+    return response_data
+
+
+def get_classifier():
+    """
+    The shared toxic-bert pipeline, loaded on first use by the model registry.
+    Returns None when the model cannot be loaded so callers use the fallback.
+    """
+    return registry.get_or_none('toxicity-classifier')
+
+def _decide(confidence):
+    """Maps a 0-100 risk confidence to (risk_level, confidence, recommendation)."""
+    if confidence > 80:
+        return "High", confidence, "Remove Content"
+    elif confidence > 40:
+        return "Medium", confidence, "Manual Review"
+    else:
+        return "Low", confidence, "Approve"
+
+
+def _risk_confidence(results):
+    """Turns one text's classifier output into a 0-100 risk confidence."""
+    scores = {res['label']: res['score'] for res in results}
+
+    # Calculate a "Risk Score" based on toxic labels
+    # Labels typically include: toxic, severe_toxic, obscene, threat, insult, identity_hate
+    risk_score = (
+        scores.get('toxic', 0) * 0.4 +
+        scores.get('severe_toxic', 0) * 0.8 +
+        scores.get('obscene', 0) * 0.3 +
+        scores.get('threat', 0) * 0.9 +
+        scores.get('identity_hate', 0) * 0.7
+    )
+    # Normalize to 0-100
+    return int(min(risk_score * 100, 99))
+
 
 def analyze_content_risk(text: str):
     """
@@ -185,35 +390,116 @@ def analyze_content_risk(text: str):
     - risk_level: 'High', 'Medium', 'Low'
     - confidence: 0-100 (int)
     - recommendation: Action string
+
+    Text already scored by the current model is answered from the verdict
+    cache without running the classifier.
     """
     if not text:
         return "Low", 0, "Approve"
 
+    key = verdict_cache.text_hash(text)
+    cached = verdict_cache.lookup([key])
+    verdict_cache.record_lookups(hits=len(cached), misses=1 - len(cached))
+    if cached:
+        return _decide(cached[key])
+
     # --- ML INFERENCE ---
+    classifier = get_classifier()
     if classifier:
-        results = classifier(text)[0]
-        # Sort results by score to find highest toxicity
-        scores = {res['label']: res['score'] for res in results}
-        
-        # Calculate a "Risk Score" based on toxic labels
-        # Labels typically include: toxic, severe_toxic, obscene, threat, insult, identity_hate
-        risk_score = (
-            scores.get('toxic', 0) * 0.4 +
-            scores.get('severe_toxic', 0) * 0.8 +
-            scores.get('obscene', 0) * 0.3 +
-            scores.get('threat', 0) * 0.9 +
-            scores.get('identity_hate', 0) * 0.7
-        )
-        # Normalize to 0-100
-        confidence = int(min(risk_score * 100, 99))
+        confidence = _risk_confidence(classifier(text)[0])
+        verdict_cache.store({key: (_decide(confidence)[0], confidence)})
     else:
         # Fallback if model fails (Simulated Logic)
         confidence = random.randint(10, 95)
 
     # --- DECISION LOGIC ---
-    if confidence > 80:
-        return "High", confidence, "Remove Content"
-    elif confidence > 40:
-        return "Medium", confidence, "Manual Review"
-    else:
-        return "Low", confidence, "Approve"
\ No newline at end of file
+    return _decide(confidence)
+
+
+def analyze_content_risk_batch(texts, batch_size=32):
+    """
+    Batched version of analyze_content_risk: returns one
+    (risk_level, confidence, recommendation) tuple per input text.
+
+    Copies of the same text (after normalization) are scored once, and texts
+    in the verdict cache are not scored at all. The rest are sorted by length
+    before batching so each padded batch wastes as little compute on padding
+    as possible.
+    """
+    verdicts = [None] * len(texts)
+    by_hash = {}  # text hash -> indexes of every copy
+    for i, text in enumerate(texts):
+        if text:
+            by_hash.setdefault(verdict_cache.text_hash(text), []).append(i)
+        else:
+            verdicts[i] = ("Low", 0, "Approve")
+
+    if not by_hash:
+        return verdicts
+
+    cached = verdict_cache.lookup(by_hash)
+    verdict_cache.record_lookups(hits=len(cached), misses=len(by_hash) - len(cached))
+    for key, confidence in cached.items():
+        for i in by_hash.pop(key):
+            verdicts[i] = _decide(confidence)
+    if not by_hash:
+        return verdicts
+
+    classifier = get_classifier()
+    if not classifier:
+        for indexes in by_hash.values():
+            verdict = _decide(random.randint(10, 95))
+            for i in indexes:
+                verdicts[i] = verdict
+        return verdicts
+
+    pending = sorted(by_hash, key=lambda key: len(texts[by_hash[key][0]]))
+    scored = {}
+    for start in range(0, len(pending), batch_size):
+        chunk = pending[start:start + batch_size]
+        outputs = classifier([texts[by_hash[key][0]] for key in chunk], batch_size=batch_size, truncation=True)
+        for key, results in zip(chunk, outputs):
+            verdict = _decide(_risk_confidence(results))
+            scored[key] = (verdict[0], verdict[1])
+            for i in by_hash[key]:
+                verdicts[i] = verdict
+    verdict_cache.store(scored)
+    return verdicts
+
+
+def _analyze_micro_batch(texts):
+    # Runs on the batcher's long-lived thread, which owns its own DB connection
+    close_old_connections()
+    try:
+        return analyze_content_risk_batch(texts, batch_size=settings.MODERATION_BATCH_SIZE)
+    finally:
+        close_old_connections()
+
+
+moderation_batcher = MicroBatcher(
+    _analyze_micro_batch,
+    max_items=settings.MODERATION_MICROBATCH_MAX_ITEMS,
+    max_wait=settings.MODERATION_MICROBATCH_WAIT_MS / 1000,
+    name='moderation',
+)
+
+
+def screen_content(text: str):
+    """
+    analyze_content_risk for request handlers: concurrent calls share one
+    batched forward pass through the moderation micro-batcher.
+    """
+    if not text:
+        return "Low", 0, "Approve"
+    if not settings.MODERATION_MICROBATCH:
+        return analyze_content_risk(text)
+    return moderation_batcher(text)
+
+
+async def ascreen_content(text: str):
+    """Async screen_content; waits for the batch without blocking the event loop."""
+    if not text:
+        return "Low", 0, "Approve"
+    if not settings.MODERATION_MICROBATCH:
+        return await sync_to_async(analyze_content_risk)(text)
+    return await moderation_batcher.acall(text)
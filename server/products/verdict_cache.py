@@ -0,0 +1,149 @@
+# verdict_cache.py
+"""
+Persistent cache for toxicity classifier verdicts.
+
+Spam campaigns post the same text over and over. Each verdict is stored
+under the sha256 of the normalized text (case, whitespace and Unicode form
+folded) together with the classifier's model version, so a repeat is one
+indexed lookup instead of a toxic-bert forward pass.
+
+The model version is part of the key and names the exact weights, pinned
+when the classifier loads (see model_registry.toxicity_version): switching
+models, a new commit on the configured revision, re-exporting the ONNX graph
+or changing how scores become a risk confidence makes every old entry
+unreachable, with no purge needed for correctness.
+`manage.py moderation_verdicts --purge` drops those orphaned rows.
+
+Hit/miss counts are kept in the cache backend and added to the
+ModerationStats row every STATS_FLUSH_EVERY lookups and by
+`manage.py flush_verdict_stats` (cron or --loop), so moderation requests do
+not all queue on one row lock and reading the stats never writes.
+
+Only real classifier output is stored; the random fallback used while the
+model is unavailable is never cached, and nothing is looked up then either.
+"""
+import hashlib
+import unicodedata
+
+from django.core.cache import cache
+from django.db.models import Count, F
+
+from .model_registry import registry
+from .models import ModerationStats, ModerationVerdict
+
+# Bump when _risk_confidence changes so verdicts scored the old way are not reused
+SCORING_VERSION = 1
+
+STATS_FLUSH_EVERY = 100
+_COUNTER_KEYS = {
+    'verdict_cache_hits': 'moderation:verdict_cache:hits',
+    'verdict_cache_misses': 'moderation:verdict_cache:misses',
+}
+_PENDING_KEY = 'moderation:verdict_cache:pending'
+_FLUSH_LOCK_KEY = 'moderation:verdict_cache:flushing'
+
+
+def model_version():
+    """None while the classifier cannot load, since only the loaded weights name the version."""
+    try:
+        return f"{registry.version('toxicity-classifier')}#{SCORING_VERSION}"
+    except Exception:
+        return None
+
+
+def normalize_text(text):
+    """'  Great   PRODUCT!! ' -> 'great product!!'"""
+    return ' '.join(unicodedata.normalize('NFKC', text).casefold().split())
+
+
+def text_hash(text):
+    return hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+def lookup(hashes, version=None):
+    """{text_hash: confidence} for the given hashes already scored under ``version``."""
+    version = version or model_version()
+    if version is None:
+        return {}
+    return dict(
+        ModerationVerdict.objects.filter(text_hash__in=set(hashes), model_version=version)
+        .values_list('text_hash', 'confidence')
+    )
+
+
+def store(verdicts, version=None):
+    """Saves ``{text_hash: (risk_level, confidence)}``; rows another worker wrote first are kept."""
+    version = version or model_version()
+    ModerationVerdict.objects.bulk_create(
+        [
+            ModerationVerdict(text_hash=key, model_version=version, risk_level=risk_level, confidence=confidence)
+            for key, (risk_level, confidence) in verdicts.items()
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def _incr(key, delta):
+    try:
+        return cache.incr(key, delta)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        return cache.incr(key, delta)
+
+
+def record_lookups(hits, misses):
+    for field, delta in (('verdict_cache_hits', hits), ('verdict_cache_misses', misses)):
+        if delta:
+            _incr(_COUNTER_KEYS[field], delta)
+    if hits + misses and _incr(_PENDING_KEY, hits + misses) >= STATS_FLUSH_EVERY:
+        flush_lookups()
+
+
+def flush_lookups():
+    """Moves the buffered hit/miss counts onto the ModerationStats row."""
+    if not cache.add(_FLUSH_LOCK_KEY, 1, timeout=30):
+        return  # another worker is flushing
+    try:
+        cache.set(_PENDING_KEY, 0, timeout=None)
+        deltas = {}
+        for field, key in _COUNTER_KEYS.items():
+            # Subtract only what was read, so lookups counted meanwhile stay buffered
+            delta = cache.get(key) or 0
+            if delta:
+                cache.decr(key, delta)
+                deltas[field] = F(field) + delta
+        if deltas:
+            # Best effort: before the stats row exists the lookups simply go uncounted
+            ModerationStats.objects.filter(pk=1).update(**deltas)
+    finally:
+        cache.delete(_FLUSH_LOCK_KEY)
+
+
+def hit_rate(stats):
+    lookups = stats.verdict_cache_hits + stats.verdict_cache_misses
+    return stats.verdict_cache_hits / lookups if lookups else None
+
+
+def cache_stats():
+    flush_lookups()
+    version = model_version()
+    per_version = dict(
+        ModerationVerdict.objects.values_list('model_version').annotate(n=Count('id')).values_list('model_version', 'n')
+    )
+    stats = ModerationStats.load()
+    return {
+        'model_version': version,
+        'entries': per_version.get(version, 0),
+        'stale_entries': sum(n for v, n in per_version.items() if v != version),
+        'hits': stats.verdict_cache_hits,
+        'misses': stats.verdict_cache_misses,
+        'hit_rate': hit_rate(stats),
+    }
+
+
+def purge_stale():
+    """Deletes verdicts from other model versions. Returns how many were removed."""
+    if model_version() is None:
+        return 0  # without the current version every row would look stale
+    deleted, _ = ModerationVerdict.objects.exclude(model_version=model_version()).delete()
+    return deleted
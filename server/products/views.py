@@ -1,42 +1,81 @@
 # views.py
+import csv
+
+from django.db.models import Prefetch
 from django.shortcuts import render
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated,AllowAny
 from rest_framework.views import APIView
-from .models import Product,ModerationItem,ProductReview, StoreSettings
-from .serializers import ProductSerializer,ModerationItemSerializer,ProductReviewSerializer
+from .models import Product,ModerationItem,ProductReview, StoreSettings, BackgroundJob, StockReservation
+from .serializers import ProductSerializer,ModerationItemSerializer,ProductReviewSerializer, BackgroundJobSerializer, ProductIdsSerializer, StockReservationSerializer
 from rest_framework import permissions
 from rest_framework.decorators import action
-from .utilty import MarketIntelligenceService,analyze_content_risk
+from .utilty import analyze_content_risk, run_product_analysis
 from Profile.permission import IsSeller,IsAdminorSeller,IsBuyer
+from .pagination import KeysetPagination
+from .search import search_products
+from .embeddings import semantic_search
+from .cache import cached_catalog_page
+from .mixins import AsyncPostMixin, ConditionalGetMixin
+from .model_registry import registry
+from .jobs import enqueue, enqueue_many
+from .inventory import InsufficientStock, ReservationError, commit, release, reserve
+from .bulk import filtered_products, set_products_status
+from .importer import ImportFormatError, detect_format, import_products
+from .images import MAX_DISTANCE, duplicate_groups, near_duplicates, schedule_image_variants
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class ProductViewSet(APIView):
     permission_classes = [IsSeller]
 
     def get(self, request):
-        products = Product.objects.filter(seller=request.user) 
-        serializer = ProductSerializer(products, many=True)
-        return Response(serializer.data)
+        products = Product.objects.filter(seller=request.user).select_related('seller')
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(products, request, view=self)
+        serializer = ProductSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         serializer = ProductSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save(seller=request.user) 
+            product = serializer.save(seller=request.user)
+            schedule_image_variants(product)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+class ProductImportView(APIView):
+    """
+    Bulk-creates the seller's products from an uploaded CSV or JSON Lines file
+    (multipart field 'file'; optional 'format' = csv | jsonl, else taken from
+    the file extension). Returns a per-row error report.
+    """
+    permission_classes = [IsSeller]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"detail": "Upload a CSV or JSONL file as 'file'."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            fmt = detect_format(upload.name, request.data.get('format'))
+            report = import_products(upload, fmt, request.user)
+        except (ImportFormatError, UnicodeDecodeError, csv.Error) as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report, status=status.HTTP_201_CREATED if report['created'] else status.HTTP_200_OK)
+
 class SellerRelatedProductViewSet(APIView):
     permission_classes = [IsSeller]
     def get(self, request):
-        products = Product.objects.filter(seller=request.user, status='approved') 
-        serializer = ProductSerializer(products, many=True)
-        return Response(serializer.data)
+        products = Product.objects.filter(seller=request.user, status='approved').select_related('seller')
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(products, request, view=self)
+        serializer = ProductSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
 
 
-class ProductDetailView(APIView):
+class ProductDetailView(ConditionalGetMixin, APIView):
     permission_classes = [IsAuthenticated]
 
     def get_object(self, pk, user):
@@ -49,8 +88,11 @@ class ProductDetailView(APIView):
         product = self.get_object(pk, request.user)
         if not product:
             return Response({"detail": "Product not found or access denied."}, status=status.HTTP_404_NOT_FOUND)
-        serializer = ProductSerializer(product)
-        return Response(serializer.data)
+        etag, last_modified = self.make_validators(request, [1], product.updated_at)
+        return self.conditional_response(
+            request, etag, last_modified,
+            lambda: Response(ProductSerializer(product).data),
+        )
 
     def put(self, request, pk):
         product = self.get_object(pk, request.user)
@@ -60,6 +102,8 @@ class ProductDetailView(APIView):
         serializer = ProductSerializer(product, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
+            if 'img' in request.FILES:
+                schedule_image_variants(product)
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -85,9 +129,17 @@ class AdminapprovalView(APIView):
                 return Response({"detail": "Product not found."}, status=status.HTTP_404_NOT_FOUND)
             
         def get (self, request):
-            products = Product.objects.all()
-            serializer = ProductSerializer(products, many=True)
-            return Response(serializer.data)
+            # Optional ?status=pending|approved|rejected, so each review tab pages on its own
+            products = Product.objects.select_related('seller')
+            product_status = request.query_params.get('status')
+            if product_status:
+                if product_status not in dict(Product.STATUS_CHOICES):
+                    return Response({"detail": "'status' must be pending, approved or rejected."}, status=status.HTTP_400_BAD_REQUEST)
+                products = products.filter(status=product_status)
+            paginator = KeysetPagination()
+            page = paginator.paginate_queryset(products, request, view=self)
+            serializer = ProductSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
             
 
 class AdminrejectView(APIView):
@@ -102,13 +154,150 @@ class AdminrejectView(APIView):
             return Response({"detail": "Product not found."}, status=status.HTTP_404_NOT_FOUND)
 
 
-class GestproductView(APIView):
+class BulkProductStatusView(APIView):
+    """
+    Approves or rejects many products in one UPDATE:
+    POST /admin/products/approve/ {"ids": [...]} or {"filter": {"status": "pending", ...}}
+    """
+    permission_classes = [permissions.IsAdminUser]
+    new_status = None
+    max_ids = 10000
+
+    def post(self, request):
+        ids, spec = request.data.get('ids'), request.data.get('filter')
+        if (ids is None) == (spec is None):
+            return Response({"detail": "Send either 'ids' or 'filter'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if ids is not None:
+            serializer = ProductIdsSerializer(data=request.data, max_ids=self.max_ids)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            ids = serializer.validated_data['ids']
+            queryset = Product.objects.filter(pk__in=ids)
+        else:
+            try:
+                queryset = filtered_products(spec)
+            except ValueError as e:
+                return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        result = set_products_status(queryset, self.new_status)
+        result['unchanged'] = result['matched'] - result['updated']
+        if ids is not None:
+            found = set(Product.objects.filter(pk__in=ids).values_list('pk', flat=True))
+            result['not_found'] = sorted(set(ids) - found)
+        return Response(result, status=status.HTTP_200_OK)
+
+
+class GestproductView(ConditionalGetMixin, APIView):
+    """
+    Public catalog. Optional ?sort=rating (best rated first) and
+    ?min_rating=<0-5> both run on the indexed rating columns.
+    """
     permission_classes = [AllowAny]
+    orderings = {
+        'newest': ('-created_at', '-id'),
+        'rating': ('-rating_avg', '-rating_count', '-id'),
+    }
 
     def get(self, request):
-        products = Product.objects.filter(status='approved') 
-        serializer = ProductSerializer(products, many=True)
-        return Response(serializer.data)
+        ordering = self.orderings.get(request.query_params.get('sort', 'newest'))
+        if ordering is None:
+            return Response(
+                {"detail": f"'sort' must be one of: {', '.join(self.orderings)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            min_rating = float(request.query_params.get('min_rating', 0))
+        except ValueError:
+            return Response({"detail": "'min_rating' must be a number."}, status=status.HTTP_400_BAD_REQUEST)
+
+        def build():
+            products = Product.objects.filter(status='approved').select_related('seller')
+            if min_rating > 0:
+                products = products.filter(rating_avg__gte=min_rating)
+            # The catalog looks the same to every visitor, so the ETag is not per user
+            etag, last_modified = self.queryset_validators(request, products, per_user=False)
+            paginator = KeysetPagination(ordering=ordering)
+            page = paginator.paginate_queryset(products, request, view=self)
+            serializer = ProductSerializer(page, many=True)
+            return {
+                'data': paginator.get_paginated_response(serializer.data).data,
+                'etag': etag,
+                'last_modified': last_modified,
+            }
+
+        # Served straight from cache until any product write bumps the catalog version
+        page = cached_catalog_page(request, build)
+        return self.conditional_response(
+            request, page['etag'], page['last_modified'],
+            lambda: Response(page['data']),
+        )
+
+class ProductSearchView(APIView):
+    """
+    Ranked full-text search over approved products: GET /products/search/?q=
+    """
+    permission_classes = [AllowAny]
+    # Deep OFFSET pages get slower; nobody reads past this many pages of hits
+    max_page = 50
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"detail": "Query parameter 'q' is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        page_size = KeysetPagination().get_page_size(request)
+        try:
+            page = int(request.query_params.get('page', 1))
+        except ValueError:
+            page = 1
+        page = min(max(page, 1), self.max_page)
+
+        hits = search_products(query, limit=page_size + 1, offset=(page - 1) * page_size)
+        has_more = len(hits) > page_size and page < self.max_page
+        hits = hits[:page_size]
+
+        products = Product.objects.select_related('seller').in_bulk([pk for pk, _ in hits])
+        ranked = [(products[pk], rank) for pk, rank in hits if pk in products]
+        results = ProductSerializer([product for product, _ in ranked], many=True).data
+        for item, (_, rank) in zip(results, ranked):
+            item['rank'] = round(rank, 4)
+
+        url = request.build_absolute_uri()
+        return Response({
+            "query": query,
+            "page": page,
+            "next": replace_query_param(url, 'page', page + 1) if has_more else None,
+            "previous": (
+                (replace_query_param(url, 'page', page - 1) if page > 2 else remove_query_param(url, 'page'))
+                if page > 1 else None
+            ),
+            "results": results,
+        })
+
+
+class ProductSemanticSearchView(APIView):
+    """
+    Meaning-based search over approved products: GET /products/semantic-search/?q=&k=
+    """
+    permission_classes = [AllowAny]
+    max_k = 100
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"detail": "Query parameter 'q' is required."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            k = min(max(int(request.query_params.get('k', 10)), 1), self.max_k)
+        except ValueError:
+            k = 10
+
+        hits = semantic_search(query, k=k)
+        results = ProductSerializer([product for product, _ in hits], many=True).data
+        for item, (_, score) in zip(results, hits):
+            item['score'] = round(score, 4)
+        return Response({"query": query, "results": results})
+
 
 class ProductAnalysisView(APIView):
     permission_classes = [permissions.IsAdminUser]
@@ -116,42 +305,13 @@ class ProductAnalysisView(APIView):
     def post(self, request, pk):
         try:
             product = Product.objects.get(pk=pk)
-            
-            service = MarketIntelligenceService()
-
-            vision_data = {"confidence": 0.85, "label": product.name, "web_entities": []}
-            if product.img:
-                try:
-                    vision_data = service.analyze_image(product.img.path)
-                except Exception as e:
-                    print(f"Image analysis skipped: {e}")
-
-            search_query = vision_data['label'] if vision_data['label'] != "Unknown" else product.name
-            competitors = service.fetch_competitor_prices(search_query)
-
-            # 3. ML DEMAND FORECAST
-            ml_result = service.predict_demand(
-                product_price=float(product.price),
-                competitors=competitors,
-                category=vision_data['label']
-            )
 
-            response_data = {
-                "visualMatchConfidence": vision_data['confidence'],
-                "detectedCategory": vision_data['label'],
-                "marketAverage": ml_result['market_avg'],
-                "globalInterest": ml_result['trend'],
-                "interestGrowth": ml_result['growth'],
-                "competitorPrices": competitors,
-                "mlDemandForecast": ml_result['score'],
-                "demandTrend": ml_result['history']
-            }
-
-            # Optional: Save the computed score to the model immediately
-            product.demand_score = ml_result['score']
-            product.external_interest = f"{ml_result['trend'].title()} ({ml_result['growth']}%)"
-            product.save()
+            # Async mode: queue the job and let a `run_jobs` worker do the slow calls
+            if str(request.data.get('async', request.query_params.get('async', ''))).lower() in ('1', 'true'):
+                job = enqueue('product_analysis', {'product_id': product.pk}, user=request.user)
+                return Response(BackgroundJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
 
+            response_data = run_product_analysis(product)
             return Response(response_data, status=status.HTTP_200_OK)
 
         except Product.DoesNotExist:
@@ -159,93 +319,357 @@ class ProductAnalysisView(APIView):
         except Exception as e:
             print(f"Analysis Error: {e}")
             return Response({"detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class BulkProductAnalysisView(APIView):
+    """
+    Queues analysis for many products at once: POST /admin/products/analyze/ {"ids": [...]}
+    """
+    permission_classes = [permissions.IsAdminUser]
+    max_ids = 500
+
+    def post(self, request):
+        serializer = ProductIdsSerializer(data=request.data, max_ids=self.max_ids)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        ids = serializer.validated_data['ids']
+
+        found = list(Product.objects.filter(pk__in=ids).values_list('pk', flat=True))
+        jobs = enqueue_many('product_analysis', [{'product_id': pk} for pk in found], user=request.user)
+        return Response({
+            "jobs": BackgroundJobSerializer(jobs, many=True).data,
+            "not_found": sorted(set(ids) - set(found)),
+        }, status=status.HTTP_202_ACCEPTED)
+
+
+class StockReservationView(APIView):
+    """
+    Holds stock for a checkout:
+    POST /inventory/reservations/ {"items": [{"product": 1, "quantity": 2}, ...]}
+    Either every line is reserved or none is (409 names the short product).
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get_object(self, pk, user):
+        reservations = StockReservation.objects.prefetch_related('lines__product')
+        if not user.is_staff:
+            reservations = reservations.filter(user=user)
+        return reservations.filter(pk=pk).first()
+
+    def get(self, request, pk):
+        reservation = self.get_object(pk, request.user)
+        if reservation is None:
+            return Response({"detail": "Reservation not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(StockReservationSerializer(reservation).data)
+
+    def post(self, request):
+        items = request.data.get('items')
+        try:
+            lines = [(int(item['product']), int(item['quantity'])) for item in items]
+            reservation = reserve(lines, user=request.user)
+        except (TypeError, KeyError, ValueError):
+            return Response(
+                {"detail": "'items' must be a non-empty list of {product, quantity} with positive quantities."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except InsufficientStock as e:
+            return Response(
+                {"detail": str(e), "product": e.product_id, "requested": e.requested},
+                status=status.HTTP_409_CONFLICT,
+            )
+        reservation = self.get_object(reservation.pk, request.user)
+        return Response(StockReservationSerializer(reservation).data, status=status.HTTP_201_CREATED)
+
+
+class StockReservationActionView(StockReservationView):
+    """POST /inventory/reservations/<pk>/commit/ or /release/"""
+    http_method_names = ['post', 'options']
+    operation = None
+
+    def post(self, request, pk):
+        reservation = self.get_object(pk, request.user)
+        if reservation is None:
+            return Response({"detail": "Reservation not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        if self.operation == 'commit':
+            try:
+                commit(reservation)
+            except ReservationError as e:
+                return Response({"detail": str(e), "status": reservation.status}, status=status.HTTP_409_CONFLICT)
+        elif not release(reservation):
+            reservation.refresh_from_db(fields=['status'])
+            return Response(
+                {"detail": f"Reservation is {reservation.status}, not held.", "status": reservation.status},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response(StockReservationSerializer(reservation).data)
+
+
+class DuplicateProductsView(APIView):
+    """
+    Listings whose images are near duplicates (by perceptual hash).
+
+    GET /admin/products/duplicates/           -> groups of duplicate listings
+    GET /admin/products/<pk>/duplicates/      -> duplicates of one listing
+    Optional ?distance=0..3 (differing hash bits, default 3).
+    """
+    permission_classes = [permissions.IsAdminUser]
+    max_groups = 100
+
+    def get(self, request, pk=None):
+        try:
+            distance = int(request.query_params.get('distance', MAX_DISTANCE))
+        except ValueError:
+            distance = -1
+        if not 0 <= distance <= MAX_DISTANCE:
+            return Response({"detail": f"'distance' must be between 0 and {MAX_DISTANCE}."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if pk is not None:
+            try:
+                product = Product.objects.get(pk=pk)
+            except Product.DoesNotExist:
+                return Response({"detail": "Product not found."}, status=status.HTTP_404_NOT_FOUND)
+            if product.img_hash is None:
+                return Response({"detail": "Product image has not been indexed yet."}, status=status.HTTP_409_CONFLICT)
+            matches = near_duplicates(
+                product.img_hash, max_distance=distance,
+                queryset=Product.objects.exclude(pk=pk).select_related('seller'),
+            )
+            return Response([
+                {**ProductSerializer(match).data, "distance": d} for match, d in matches
+            ])
+
+        groups = duplicate_groups(max_distance=distance)
+        shown = groups[:self.max_groups]
+        products = Product.objects.select_related('seller').in_bulk([pk for ids in shown for pk in ids])
+        return Response({
+            "group_count": len(groups),
+            "groups": [
+                [ProductSerializer(products[pk]).data for pk in ids if pk in products]
+                for ids in shown
+            ],
+        })
+
+
+class BackgroundJobView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, pk):
+        try:
+            job = BackgroundJob.objects.get(pk=pk)
+        except BackgroundJob.DoesNotExist:
+            return Response({"detail": "Job not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(BackgroundJobSerializer(job).data)
         
 
 # views.py
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
-from .models import ModerationItem
+from .models import ModerationItem, ModerationStats
+from .moderation import accuracy, claim_next, create_items, priority_queue, release_claims, resolve_item
 from .serializers import ModerationItemSerializer
-from .utilty import analyze_content_risk
+from .verdict_cache import hit_rate
+from .utilty import analyze_content_risk_batch, ascreen_content
+from asgiref.sync import sync_to_async
+from django.conf import settings
+import time
 
-class ModerationListCreateView(APIView):
+class ModerationListCreateView(AsyncPostMixin, APIView):
     permission_classes = [permissions.IsAdminUser]
 
     def get(self, request):
-        # List all unresolved items
-        items = ModerationItem.objects.filter(is_resolved=False).order_by('-created_at')
-        serializer = ModerationItemSerializer(items, many=True)
-        return Response(serializer.data)
-
-    def post(self, request):
+        # List all unresolved items, newest first
+        items = ModerationItem.objects.filter(is_resolved=False)
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(items, request, view=self)
+        serializer = ModerationItemSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+    async def apost(self, request):
         # Create new item with AI Analysis
         serializer = ModerationItemSerializer(data=request.data)
-        if serializer.is_valid():
-            content = serializer.validated_data.get('content', '')
-            
-            # Run AI Logic
-            risk, conf, rec = analyze_content_risk(content)
-            
-            # Save
-            serializer.save(
-                risk_level=risk, 
-                ml_confidence=conf, 
-                recommended_action=rec
-            )
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        if not await sync_to_async(serializer.is_valid)():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        content = serializer.validated_data.get('content', '')
+
+        # Run AI Logic (pooled with concurrent requests into one forward pass)
+        verdict = await ascreen_content(content)
+
+        item = await sync_to_async(self.save_item)(serializer, verdict)
+        return Response(ModerationItemSerializer(item).data, status=status.HTTP_201_CREATED)
+
+    def save_item(self, serializer, verdict):
+        risk, conf, rec = verdict
+        [item] = create_items([ModerationItem(
+            **serializer.validated_data,
+            risk_level=risk, 
+            ml_confidence=conf, 
+            recommended_action=rec
+        )])
+        return item
+
+class ModerationBulkCreateView(APIView):
+    """
+    Screens many texts in one request: POST /moderation/bulk/
+    {"items": [{"content_type": ..., "content": ...}, ...], "batch_size": 32}
+    """
+    permission_classes = [permissions.IsAdminUser]
+    max_items = 1000
+
+    def post(self, request):
+        items = request.data.get('items')
+        if not isinstance(items, list) or not items:
+            return Response({"detail": "'items' must be a non-empty list."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > self.max_items:
+            return Response({"detail": f"At most {self.max_items} items per request."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            batch_size = max(1, int(request.data.get('batch_size', settings.MODERATION_BATCH_SIZE)))
+        except (TypeError, ValueError):
+            return Response({"detail": "'batch_size' must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = ModerationItemSerializer(data=items, many=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = serializer.validated_data
+        started = time.perf_counter()
+        verdicts = analyze_content_risk_batch([row.get('content', '') for row in rows], batch_size=batch_size)
+        elapsed = time.perf_counter() - started
+
+        created = create_items([
+            ModerationItem(**{**row, 'risk_level': risk, 'ml_confidence': conf, 'recommended_action': rec})
+            for row, (risk, conf, rec) in zip(rows, verdicts)
+        ])
+
+        return Response({
+            "created": len(created),
+            "batch_size": batch_size,
+            "inference_seconds": round(elapsed, 4),
+            "items_per_second": round(len(rows) / elapsed, 1) if elapsed else None,
+            "items": ModerationItemSerializer(created, many=True).data,
+        }, status=status.HTTP_201_CREATED)
+
+
+class ModerationQueueView(APIView):
+    """
+    Open items riskiest-first (risk level, then confidence, then age), for
+    moderators working through the backlog. Items other moderators have
+    claimed are hidden. Optional ?risk=High|Medium|Low.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        items = priority_queue(user=request.user)
+        risk = request.query_params.get('risk')
+        if risk:
+            if risk not in dict(ModerationItem.RISK_CHOICES):
+                return Response({"detail": "'risk' must be High, Medium or Low."}, status=status.HTTP_400_BAD_REQUEST)
+            items = items.filter(risk_level=risk)
+        paginator = KeysetPagination(ordering=ModerationItem.PRIORITY_ORDERING)
+        page = paginator.paginate_queryset(items, request, view=self)
+        serializer = ModerationItemSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+
+class ModerationClaimView(APIView):
+    """
+    POST /moderation/queue/claim/   {"count": 10}    -> the next items, now held by you
+    POST /moderation/queue/release/ {"ids": [...]}   -> give your claims back (all if no ids)
+    """
+    permission_classes = [permissions.IsAdminUser]
+    operation = None
+    max_claim = 100
+
+    def post(self, request):
+        if self.operation == 'release':
+            ids = request.data.get('ids')
+            if ids is not None and not (isinstance(ids, list) and all(isinstance(i, int) for i in ids)):
+                return Response({"detail": "'ids' must be a list of item ids."}, status=status.HTTP_400_BAD_REQUEST)
+            return Response({"released": release_claims(request.user, ids)})
+
+        try:
+            count = int(request.data.get('count', 10))
+        except (TypeError, ValueError):
+            return Response({"detail": "'count' must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= count <= self.max_claim:
+            return Response({"detail": f"'count' must be between 1 and {self.max_claim}."}, status=status.HTTP_400_BAD_REQUEST)
+
+        items = claim_next(request.user, count)
+        return Response({"claimed": len(items), "items": ModerationItemSerializer(items, many=True).data})
+
 
 class ModerationResolveView(APIView):
     permission_classes = [permissions.IsAdminUser]
 
     def post(self, request, pk):
+        action = request.data.get('action') or ''
+        if action not in ('', 'approve', 'remove'):
+            return Response({"detail": "'action' must be 'approve' or 'remove'."}, status=status.HTTP_400_BAD_REQUEST)
         try:
             item = ModerationItem.objects.get(pk=pk)
-            item.is_resolved = True
-            item.save()
-            return Response({
-                'status': 'resolved', 
-                'action_taken': request.data.get('action')
-            }, status=status.HTTP_200_OK)
         except ModerationItem.DoesNotExist:
             return Response(
                 {"detail": "Item not found."}, 
                 status=status.HTTP_404_NOT_FOUND
             )
+        resolve_item(item, action)
+        return Response({
+            'status': 'resolved', 
+            'action_taken': item.resolution or None
+        }, status=status.HTTP_200_OK)
 
 # 3. Get Dashboard Stats
 class ModerationStatsView(APIView):
     permission_classes = [permissions.IsAdminUser]
 
     def get(self, request):
-        total_pending = ModerationItem.objects.filter(is_resolved=False).count()
-        high_risk = ModerationItem.objects.filter(risk_level='High', is_resolved=False).count()
-        
+        # One-row read of the running counters, however long the history;
+        # buffered verdict-cache counts land via `manage.py flush_verdict_stats`
+        stats = ModerationStats.load()
+        model_accuracy = accuracy(stats)
+        cache_hit_rate = hit_rate(stats)
+
         return Response({
-            "pending_reviews": total_pending,
-            "high_risk_content": high_risk,
-            "auto_approved": 540,
-            "accuracy": "96%"
+            "pending_reviews": stats.pending,
+            "high_risk_content": stats.high_risk_pending,
+            "auto_approved": stats.auto_approved,
+            "accuracy": f"{model_accuracy:.0%}" if model_accuracy is not None else None,
+            "overridden": stats.overridden,
+            "verdict_cache_hit_rate": f"{cache_hit_rate:.0%}" if cache_hit_rate is not None else None,
         })
 
 
-class ReviewViewSet(APIView):
+class ReviewViewSet(ConditionalGetMixin, APIView):
     permission_classes = [IsSeller]
-    # Only fetch top-level reviews, ignore the replies themselves in the main feed
-    queryset = ProductReview.objects.filter(reply_to__isnull=True).order_by('-created_at')
     serializer_class = ProductReviewSerializer
 
+    def get_queryset(self, request):
+        # Only top-level reviews in the main feed; authors, products and the
+        # seller's own replies come in with them, so a page costs a fixed number of queries
+        return (
+            ProductReview.objects
+            .filter(product__seller=request.user, reply_to__isnull=True)
+            .select_related('user', 'product')
+            .prefetch_related(Prefetch(
+                'replies',
+                queryset=ProductReview.objects.filter(user=request.user).order_by('id'),
+                to_attr='seller_replies',
+            ))
+        )
+
     # POST /api/reviews/{id}/reply/
-    def post(self, request, pk=None):
-        parent_review = self.get_object()
+    def post(self, request, id=None):
+        parent_review = self.get_queryset(request).filter(pk=id).first()
+        if parent_review is None:
+            return Response({"error": "Review not found."}, status=status.HTTP_404_NOT_FOUND)
         reply_text = request.data.get('reply_text')
         
         if not reply_text:
             return Response({"error": "reply_text is required."}, status=status.HTTP_400_BAD_REQUEST)
         
         # Create a new review linked as a reply
-        ProductReview.objects.create(
+        reply = ProductReview.objects.create(
             product=parent_review.product,
             user=request.user, # The currently logged-in seller/admin
             rating=0,
@@ -253,20 +677,32 @@ class ReviewViewSet(APIView):
             reply_to=parent_review,
             status='approved'
         )
+        parent_review.seller_replies.append(reply)
         
         # Return the updated parent review so React updates instantly
         return Response(ProductReviewSerializer(parent_review).data)
 
-    def get(self,request, pk=None):
-        reviews = self.queryset.filter(product__seller=request.user)
-        serializer = self.serializer_class(reviews, many=True)
-        return Response(serializer.data)
+    def get(self,request, id=None):
+        reviews = self.get_queryset(request)
+        # Replies and product renames change the feed too, so both feed the validators
+        etag, last_modified = self.queryset_validators(
+            request,
+            ProductReview.objects.filter(product__seller=request.user),
+            Product.objects.filter(seller=request.user),
+        )
+
+        def build():
+            paginator = KeysetPagination()
+            page = paginator.paginate_queryset(reviews, request, view=self)
+            return paginator.get_paginated_response(self.serializer_class(page, many=True).data)
+
+        return self.conditional_response(request, etag, last_modified, build)
 
 class SettingsViewSet(APIView):
     permission_classes = [IsSeller]
     # GET /api/settings/
     def get(self, request):
-        settings = StoreSettings.load()
+        settings = StoreSettings.current()
         return Response({"autoReplyEnabled": settings.auto_reply_enabled})
 
     # POST /api/settings/toggle_auto_reply/
@@ -277,4 +713,19 @@ class SettingsViewSet(APIView):
         settings.auto_reply_enabled = enabled_state
         settings.save()
         
-        return Response({"autoReplyEnabled": settings.auto_reply_enabled})
\ No newline at end of file
+        return Response({"autoReplyEnabled": settings.auto_reply_enabled})
+
+
+class ModelReadinessView(APIView):
+    """
+    Readiness probe: 200 once every registered ML model is loaded in this
+    process, 503 before that. Also reports load time and memory per model.
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        ready = registry.ready()
+        return Response(
+            {"ready": ready, "models": registry.stats()},
+            status=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        )